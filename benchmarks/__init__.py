@@ -0,0 +1,11 @@
+"""
+Rendering benchmarks for ShellGUI_Core.
+
+Times Canvas.draw(), addborder(), Label.value(), closestFromPalette() and WriteShell() over a fixed grid of canvas
+sizes, component counts, overlap densities and border types. Shell output goes to an in-memory sink, so the terminal
+is not part of the measurement. Results are emitted as JSON: throughput, p50/p99 latencies and the peak bytes
+allocated per run (frame), measured with tracemalloc.
+
+Usage (from the repository root):
+    python -m benchmarks [--quick] [--filter NAME] [--output FILE]
+"""
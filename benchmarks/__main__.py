@@ -0,0 +1,36 @@
+"""
+Command-line entry point: python -m benchmarks
+"""
+
+#========================Imports========================
+
+# Used by: main()
+import argparse
+import json
+import sys
+
+from benchmarks.render import runall
+
+
+
+#========================Main========================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="ShellGUI rendering benchmarks")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke run")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--output", default="-", help="file to write the JSON results to (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = runall(quick=args.quick, namefilter=args.filter)
+    text = json.dumps(results, indent=2)
+
+    if args.output == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        with open(args.output, "w") as outfile:
+            outfile.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Benchmark cases for the rendering path of ShellGUI_Core.
+Every case is built from a fixed random seed, so that two runs measure the same frames.
+"""
+
+#========================Imports========================
+
+# Used by: measure() (in-memory output sink)
+import contextlib
+import io
+# Used by: runall() (run metadata)
+import platform
+import sys
+# Used by: the scene builders
+import random
+# Used by: measure()
+import time
+import tracemalloc
+
+from lib.Color import Color, ColorList, PaletteIndex, closestFromPalette
+from lib.ShellGUI_Forms import *
+
+
+
+#========================Parameters========================
+
+SEED = 1729
+
+CANVAS_SIZES = [(80, 24), (200, 60)]
+COMPONENT_COUNTS = [10, 200]
+# Sum of the components' areas, relative to the canvas area
+DENSITIES = [0.5, 2.0]
+BORDER_TYPES = {"none": BorderTypes.NoBorder, "thin": BorderTypes.ThinBorder}
+# Fraction of the labels whose text changes before each frame
+CHURNS = [0.0, 0.1]
+OUTPUT_MODES = [OutputModes.Full, OutputModes.Diff]
+
+ITERATIONS = 30
+QUICK_ITERATIONS = 5
+
+
+
+#========================Measurement========================
+
+def percentile(samples: list, fraction: float):
+    """
+    Returns:
+        The sample below which 'fraction' of the sorted samples lie (nearest-rank).
+    """
+
+    ordered = sorted(samples)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def measure(name: str, params: dict, operation, iterations: int):
+    """
+    Times an operation while shell output is redirected to an in-memory sink.
+
+    Args:
+        name: The name of the benchmark.
+        params: The parameters of the case, copied into the result.
+        operation: A function without arguments, run once per iteration.
+        iterations: The number of timed runs. As many runs are traced with tracemalloc afterwards.
+
+    Returns:
+        A dictionary with the throughput, the p50/p99 latencies and the peak allocation of one run, in bytes.
+        Note: tracemalloc tracks the size of live memory blocks; CPython keeps no count of the allocations a run makes,
+        so allocations are reported as the peak bytes allocated above the memory held before the run.
+    """
+
+    sink = io.StringIO()
+    timings = []
+    peaks = []
+
+    with contextlib.redirect_stdout(sink):
+        # Warm-up: first frames fill caches and allocate frame buffers.
+        for i in range(0, 2):
+            operation()
+        sink.seek(0)
+        sink.truncate()
+
+        for i in range(0, iterations):
+            start = time.perf_counter()
+            operation()
+            timings.append(time.perf_counter() - start)
+            sink.seek(0)
+            sink.truncate()
+
+        # Allocations are measured in separate runs: tracing slows every allocation down.
+        tracemalloc.start()
+        try:
+            for i in range(0, iterations):
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                operation()
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+                sink.seek(0)
+                sink.truncate()
+        finally:
+            tracemalloc.stop()
+
+    total = sum(timings)
+    return {"name": name,
+            "params": params,
+            "iterations": iterations,
+            "ops_per_sec": iterations / total if total > 0 else float("inf"),
+            "p50_ms": percentile(timings, 0.50) * 1000,
+            "p99_ms": percentile(timings, 0.99) * 1000,
+            "alloc_peak_bytes": sum(peaks) // len(peaks)}
+
+
+
+#========================Scenes========================
+
+def buildcanvas(size, count: int, density: float, bordername: str, outputmode, rng):
+    """
+    Builds a canvas holding 'count' labels, sized so that their areas add up to 'density' times the canvas area.
+
+    Returns:
+        a (canvas, labels) tuple
+    """
+
+    width, height = size
+    bordertype = BORDER_TYPES[bordername]
+    bordered = bordertype != BorderTypes.NoBorder
+    canvas = Canvas(width, height, bordertype, outputmode)
+
+    area = density * width * height / count
+    # A bordered label takes two more columns and rows than its text.
+    length = int(area / 3 - 2) if bordered else int(area)
+    length = min(max(length, 1), width)
+
+    labels = []
+    for i in range(0, count):
+        text = "".join([rng.choice("abcdefghij ") for j in range(0, length)])
+        label = Label((rng.randrange(0, width), rng.randrange(0, height)), text,
+                      showborder=bordered, bordertype=bordertype)
+        canvas.add(label)
+        labels.append(label)
+    return (canvas, labels)
+
+
+def drawoperation(canvas, labels: list, churn: float):
+    """
+    Returns:
+        A function drawing one frame of 'canvas', after changing the text of a 'churn' fraction of 'labels'.
+    """
+
+    changed = labels[0 : int(len(labels) * churn)]
+    counter = [0]
+
+    def operation():
+        counter[0] += 1
+        suffix = str(counter[0] % 10)
+        for label in changed:
+            label.Text = label.Text[0 : -1] + suffix
+        canvas.draw()
+
+    return operation
+
+
+
+#========================Benchmarks========================
+
+def benchcanvasdraw(iterations: int):
+    results = []
+    for size in CANVAS_SIZES:
+        for count in COMPONENT_COUNTS:
+            for density in DENSITIES:
+                for bordername in BORDER_TYPES.keys():
+                    for churn in CHURNS:
+                        for outputmode in OUTPUT_MODES:
+                            rng = random.Random(SEED)
+                            canvas, labels = buildcanvas(size, count, density, bordername, outputmode, rng)
+                            params = {"width": size[0], "height": size[1], "components": count, "density": density,
+                                      "border": bordername, "churn": churn, "outputmode": outputmode}
+                            results.append(measure("Canvas.draw", params,
+                                                   drawoperation(canvas, labels, churn), iterations))
+    return results
+
+
+def benchaddborder(iterations: int):
+    results = []
+    rng = random.Random(SEED)
+    for width, height in [(10, 1), (40, 10), (200, 60)]:
+        text = "\n".join(["".join([rng.choice("abc ") for i in range(0, width)]) for j in range(0, height)])
+        for bordername, bordertype in BORDER_TYPES.items():
+            params = {"width": width, "height": height, "border": bordername}
+            results.append(measure("addborder", params, lambda: addborder(text, bordertype), iterations * 10))
+    return results
+
+
+def benchlabelvalue(iterations: int):
+    results = []
+    for length in [10, 80]:
+        for bordername, bordertype in BORDER_TYPES.items():
+            for truncated in [False, True]:
+                label = Label((0, 0), "x" * length, showborder=bordertype != BorderTypes.NoBorder,
+                              bordertype=bordertype, length=length // 2 if truncated else -1)
+                params = {"length": length, "border": bordername, "truncated": truncated}
+                results.append(measure("Label.value", params, label.value, iterations * 10))
+    return results
+
+
+def benchclosestfrompalette(iterations: int):
+    rng = random.Random(SEED)
+    palette = [value for value in ColorList.__dict__.values() if type(value) is Color]
+    colors = [Color(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for i in range(0, 1000)]
+
+    def operation():
+        for color in colors:
+            closestFromPalette(color, palette)
+
+    return [measure("closestFromPalette", {"colors": len(colors), "palette": len(palette)}, operation, iterations)]
+
+
+def benchpaletteindex(iterations: int):
+    rng = random.Random(SEED)
+    palette = [Color(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for i in range(0, 256)]
+    colors = [Color(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for i in range(0, 1000)]
+    index = PaletteIndex(palette)
+
+    def operation():
+        for color in colors:
+            index.nearest(color)
+
+    return [measure("PaletteIndex.nearest", {"colors": len(colors), "palette": len(palette)}, operation, iterations)]
+
+
+def benchwriteshell(iterations: int):
+    results = []
+    for width, height in CANVAS_SIZES:
+        frame = "\n".join(["x" * width] * height)
+        for color in ["default", "green"]:
+            params = {"width": width, "height": height, "color": color}
+            results.append(measure("WriteShell", params, lambda: WriteShell(frame, Color=color), iterations * 10))
+    return results
+
+
+# Benchmark functions, by the name of the function they time
+BENCHMARKS = {"Canvas.draw": benchcanvasdraw,
+              "addborder": benchaddborder,
+              "Label.value": benchlabelvalue,
+              "closestFromPalette": benchclosestfrompalette,
+              "PaletteIndex.nearest": benchpaletteindex,
+              "WriteShell": benchwriteshell}
+
+
+def runall(quick: bool=False, namefilter: str=""):
+    """
+    Runs every benchmark.
+
+    Args:
+        quick: Whether to use fewer iterations.
+        namefilter: Only run the benchmarks whose name contains this string.
+
+    Returns:
+        A dictionary with the run's metadata and the list of results, ready to be serialized as JSON.
+    """
+
+    iterations = QUICK_ITERATIONS if quick else ITERATIONS
+    results = []
+    for name, benchmark in BENCHMARKS.items():
+        if namefilter in name:
+            results.extend(benchmark(iterations))
+
+    return {"meta": {"python": sys.version.split()[0],
+                     "implementation": platform.python_implementation(),
+                     "platform": platform.platform(),
+                     "seed": SEED,
+                     "iterations": iterations},
+            "results": results}
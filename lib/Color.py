@@ -6,7 +6,7 @@ if __name__ == "__main__":
     # MAJOR +1 represents an added function.
     __MAJOR = 1
     # MINOR +1 represents a change in existing function(s) within the current MAJOR.
-    __MINOR = 0
+    __MINOR = 5
 
     __info = """This file contains the module 'Color', used to integrate color systems into Python.
 To use this module in another project, include this file inside the project's directory."""
@@ -21,22 +21,77 @@ To use this module in another project, include this file inside the project's di
 
 #========================Imports========================
 
-# No dependency
+# Used by: PaletteIndex
+from array import array
+# Used by: Style (composited styles)
+import collections
+# Used by: ColorList.getName(); toAnsi(); toIdle()
+import functools
+# Used by: detectColorDepth()
+import os
+import sys
+
+# Optional: vectorized PaletteIndex queries over whole images or frames
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 
 #========================Color========================
 
 class Color:
+    """
+    An immutable RGBA color: r, g and b are integers from 0 to 255, a is an opacity from 0.0 to 1.0.
+    Out-of-range values are clamped. Colors are hashable, and constructing a color already in the intern table
+    returns the existing instance, so that equal colors are usually the same object.
+    """
+
+    __slots__ = ("r", "g", "b", "a", "_hash")
+
+    # Interned colors, by constructor arguments. Past MaxInterned entries, new colors are no longer interned.
+    _Interned = {}
+    MaxInterned = 65536
+
+    def __new__(cls, r: int, g: int, b: int, a: float = 1.0):
+        key = (r, g, b, a)
+        color = Color._Interned.get(key)
+        if color is not None:
+            return color
+
+        color = object.__new__(cls)
+        setattr = object.__setattr__
+        setattr(color, "r", 255 if r > 255 else 0 if r < 0 else int(r))
+        setattr(color, "g", 255 if g > 255 else 0 if g < 0 else int(g))
+        setattr(color, "b", 255 if b > 255 else 0 if b < 0 else int(b))
+        setattr(color, "a", 1.0 if a > 1.0 else 0.0 if a < 0 else float(a))
+        setattr(color, "_hash", hash((color.r, color.g, color.b, color.a)))
+
+        if len(Color._Interned) < Color.MaxInterned:
+            # Constructor arguments that clamp to an interned color share its instance.
+            Color._Interned[key] = Color._Interned.setdefault((color.r, color.g, color.b, color.a), color)
+            color = Color._Interned[key]
+        return color
 
-    def __init__(self, r: int, g: int, b: int, a: int = 1):
-        self.r = r
-        self.g = g
-        self.b = b
-        self.a = a
+    def __setattr__(self, name, value):
+        raise AttributeError("Color objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Color objects are immutable")
+
+    def __reduce__(self):
+        return (Color, (self.r, self.g, self.b, self.a))
 
     def __eq__(self, other):
-        return (self.r, self.g, self.b, self.a) == (other.r, other.g, other.b, other.a)
+        if self is other:
+            return True
+        if not isinstance(other, Color):
+            return NotImplemented
+        return self._hash == other._hash and (self.r, self.g, self.b, self.a) == (other.r, other.g, other.b, other.a)
+
+    def __hash__(self):
+        return self._hash
 
     def __repr__(self):
         return Color.tostring(self)
@@ -44,58 +99,6 @@ class Color:
     def __str__(self):
         return ColorList.getName(self)
 
-    @property
-    def r(self):
-        return self._r
-
-    @r.setter
-    def r(self, value):
-        if value > 255:
-            self._r = 255
-        elif value < 0:
-            self._r = 0
-        else:
-            self._r = int(value)
-
-    @property
-    def g(self):
-        return self._g
-
-    @g.setter
-    def g(self, value: int):
-        if value > 255:
-            self._g = 255
-        elif value < 0:
-            self._g = 0
-        else:
-            self._g = int(value)
-
-    @property
-    def b(self):
-        return self._b
-
-    @b.setter
-    def b(self, value):
-        if value > 255:
-            self._b = 255
-        elif value < 0:
-            self._b = 0
-        else:
-            self._b = int(value)
-
-    @property
-    def a(self):
-        return self._a
-
-    @a.setter
-    def a(self, value):
-        if value > 1.0:
-            self._a = 1.0
-        elif value < 0:
-            self._a = 0
-        else:
-            self._a = int(value)
-
     def toHex(self):
         """
         Converts this color into a human-readable hexadecimal color code.
@@ -114,7 +117,36 @@ class Color:
             a string representation of this color, including its alpha value, in hexadecimal format
         """
 
-        return '#%02x%02x%02x%02x' % (self.r, self.g, self.b, self.a * 256)
+        return '#%02x%02x%02x%02x' % (self.r, self.g, self.b, round(self.a * 255))
+
+    def toPacked(self):
+        """
+        Packs this color into a 32-bit integer, e.g. to store many colors in an array('L') or a NumPy uint32 array.
+
+        Returns:
+            0xRRGGBBAA, the alpha value being scaled to 0-255
+        """
+
+        return (self.r << 24) | (self.g << 16) | (self.b << 8) | round(self.a * 255)
+
+    @staticmethod
+    def fromPacked(value: int):
+        """
+        Unpacks a color packed by toPacked().
+
+        Returns:
+            a Color
+        """
+
+        return Color((value >> 24) & 0xFF, (value >> 16) & 0xFF, (value >> 8) & 0xFF, (value & 0xFF) / 255)
+
+    def withAlpha(self, a: float):
+        """
+        Returns:
+            this color with another alpha value
+        """
+
+        return Color(self.r, self.g, self.b, a)
 
     @staticmethod
     def tostring(color):
@@ -156,29 +188,173 @@ class ColorList:
     Beige = Color(245, 245, 220)
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def getName(color: Color):
-        colors = {key: value for key, value in ColorList.__dict__.items() if
-                  type(value) is Color}
-
-        closestColor = closestFromPalette(color, list(colors.values()))
-
-        col_name = Color.tostring(closestColor)
-        for name, col in colors.items():
-            if col == closestColor:
-                col_name_list = list(name)
-                col_name = col_name_list.pop(0).lower()
-                while col_name_list:
-                    letter = col_name_list.pop(0)
-                    if letter.isupper():
-                        col_name += " " + letter.lower()
-                    else:
-                        col_name += letter
+        names, index = ColorList._index()
+        closestColor = index.Palette[index.nearestindex(color.r, color.g, color.b, exact=True)]
+
+        name = names[id(closestColor)]
+        col_name_list = list(name)
+        col_name = col_name_list.pop(0).lower()
+        while col_name_list:
+            letter = col_name_list.pop(0)
+            if letter.isupper():
+                col_name += " " + letter.lower()
+            else:
+                col_name += letter
 
         if closestColor == color:
             return col_name
         else:
             return col_name + "-ish"
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _index():
+        """
+        Builds, once, the palette index of the colors listed in this class.
+
+        Returns:
+            a ({id(color): name}, PaletteIndex) tuple
+        """
+        colors = {key: value for key, value in ColorList.__dict__.items() if type(value) is Color}
+        return ({id(value): key for key, value in colors.items()}, PaletteIndex(list(colors.values())))
+
+
+
+#========================Palette index========================
+
+def colordistance(color1: Color, color2: Color):
+    """
+    Perceptual distance between two colors, using the 'redmean' weighting of RGB differences.
+    Alpha differences are weighted like a difference on the green channel.
+
+    Returns:
+        the squared distance, as a float
+    """
+
+    rmean = (color1.r + color2.r) / 2
+    dr = color1.r - color2.r
+    dg = color1.g - color2.g
+    db = color1.b - color2.b
+    da = (color1.a - color2.a) * 255
+    return (2 + rmean / 256) * dr * dr + 4 * dg * dg + (2 + (255 - rmean) / 256) * db * db + 4 * da * da
+
+
+class PaletteIndex:
+    """
+    Nearest-color lookup into a fixed palette, e.g. the 16 or 256 colors of a terminal.
+    The RGB cube is divided into 32x32x32 cells: the palette color nearest to the centre of a cell (see colordistance())
+    is searched once, then reused by every query falling into that cell. Cells are filled on first use, or all at
+    once with NumPy by batched queries. Alpha is ignored.
+    """
+
+    # Bits of each channel ignored by the lookup cube: cells span 8 values per channel
+    CellBits = 3
+
+    def __init__(self, palette: list):
+        """
+        Args:
+            palette: A list of Color. Queries return indices into this list.
+        """
+
+        self.Palette = list(palette)
+        # Palette index nearest to each cell of the cube, or -1 for cells not searched yet
+        self.__cube = array('i', [-1]) * (1 << (3 * (8 - PaletteIndex.CellBits)))
+        self.__filled = False
+
+        # Palette channels, for the searches
+        self.__channels = [(swatch.r, swatch.g, swatch.b) for swatch in self.Palette]
+
+
+    def nearest(self, color: Color):
+        """
+        Returns:
+            the palette color nearest to 'color'
+        """
+        return self.Palette[self.nearestindex(color.r, color.g, color.b)]
+
+
+    def nearestindex(self, r: int, g: int, b: int, exact: bool=False):
+        """
+        Args:
+            r, g, b: The color to look up.
+            exact: Whether to compare the color itself with every palette color, instead of using the lookup cube.
+
+        Returns:
+            the index of the nearest palette color
+        """
+
+        if exact:
+            return self.__search(r, g, b)
+        bits = PaletteIndex.CellBits
+        cell = ((r >> bits) << (16 - 2 * bits)) | ((g >> bits) << (8 - bits)) | (b >> bits)
+        index = self.__cube[cell]
+        if index < 0:
+            half = 1 << (bits - 1)
+            mask = ~((1 << bits) - 1)
+            index = self.__cube[cell] = self.__search((r & mask) + half, (g & mask) + half, (b & mask) + half)
+        return index
+
+
+    def nearestindices(self, pixels):
+        """
+        Looks up many colors at once, such as every cell of a frame.
+
+        Args:
+            pixels: A NumPy array of shape (..., 3) holding r, g, b values, or a sequence of (r, g, b) tuples.
+
+        Returns:
+            the indices of the nearest palette colors, as a NumPy integer array of shape (...) if 'pixels' is a NumPy
+            array, or as a list otherwise
+        """
+
+        if numpy is not None and isinstance(pixels, numpy.ndarray):
+            self.__fill()
+            bits = PaletteIndex.CellBits
+            channels = pixels.astype(numpy.int32) >> bits
+            cells = (channels[..., 0] << (16 - 2 * bits)) | (channels[..., 1] << (8 - bits)) | channels[..., 2]
+            return numpy.frombuffer(self.__cube, dtype=numpy.int32)[cells]
+        return [self.nearestindex(r, g, b) for r, g, b in pixels]
+
+
+    def __fill(self):
+        """
+        Searches every cell of the cube at once, with NumPy.
+        """
+
+        if self.__filled:
+            return
+        bits = PaletteIndex.CellBits
+        steps = numpy.arange(0, 256, 1 << bits, dtype=numpy.float64) + (1 << (bits - 1))
+        r, g, b = [axis.reshape(-1, 1) for axis in numpy.meshgrid(steps, steps, steps, indexing='ij')]
+        palette = numpy.array(self.__channels, dtype=numpy.float64)
+
+        rmean = (r + palette[:, 0]) / 2
+        distances = (2 + rmean / 256) * (r - palette[:, 0]) ** 2 + 4 * (g - palette[:, 1]) ** 2 + \
+                    (2 + (255 - rmean) / 256) * (b - palette[:, 2]) ** 2
+        self.__cube = array('i', numpy.argmin(distances, axis=1).astype(numpy.int32).tobytes())
+        self.__filled = True
+
+
+    def __search(self, r, g, b):
+        """
+        Returns the index of the palette color nearest to (r, g, b), comparing it with every palette color.
+        """
+
+        best = 0
+        bestdistance = None
+        for i, (pr, pg, pb) in enumerate(self.__channels):
+            rmean = (r + pr) / 2
+            dr = r - pr
+            dg = g - pg
+            db = b - pb
+            distance = (2 + rmean / 256) * dr * dr + 4 * dg * dg + (2 + (255 - rmean) / 256) * db * db
+            if bestdistance is None or distance < bestdistance:
+                best = i
+                bestdistance = distance
+        return best
+
 
 
 #========================Module Functions========================
@@ -195,14 +371,21 @@ IdlePalette = {'stdout': Color(0, 0, 255),
 
 
 def closestFromPalette(color: Color, palette: list):
-    workingPalette = palette.copy()
-    closest = workingPalette.pop()
-    threshold = 255*4
-    for swatch in workingPalette:
-        deltasum = abs((color.r - swatch.r) + (color.g - swatch.g) + (color.b - swatch.b) + (color.a * 255 - swatch.a * 255))
-        if deltasum < threshold:
+    """
+    Finds the palette color perceptually closest to a color (see colordistance()).
+    To look up many colors in the same palette, build a PaletteIndex once instead.
+
+    Returns:
+        the closest color of 'palette'
+    """
+
+    closest = palette[0]
+    threshold = colordistance(color, closest)
+    for swatch in palette:
+        distance = colordistance(color, swatch)
+        if distance < threshold:
             closest = swatch
-            threshold = deltasum
+            threshold = distance
     return closest
 
 
@@ -213,10 +396,332 @@ def toIdle(color: Color):
     Returns:
         a string for IDLE shell color printing
     """
+    return _idletag(color)
+
+
+@functools.lru_cache(maxsize=1024)
+def _idletag(color: Color):
     # Since color distribution in IDLE's palette is limited, there needs to be a bias towards less prevalent colors (e.g. green)
     biased = Color(int(color.r * 0.5), color.g, int(color.b * 0.75))
-    reversePalette = {x: y for y, x in IdlePalette.items()}
-    return reversePalette[closestFromPalette(biased, list(IdlePalette.values()))]
+    closest = closestFromPalette(biased, list(IdlePalette.values()))
+    for name, swatch in IdlePalette.items():
+        if swatch is closest:
+            return name
+
+
+
+#========================Terminal output========================
+
+class ColorDepths:
+    """
+    An 'enum' containing the color capabilities of terminals, from the least to the most capable.
+    """
+
+    # No color: escapes are never written
+    Mono = 0
+
+    # The 16 colors of SGR 30-37 and 90-97, whose actual values depend on the terminal's theme
+    Ansi16 = 1
+
+    # The xterm 256-color palette (SGR 38;5): 16 theme colors, a 6x6x6 color cube and 24 grays
+    Ansi256 = 2
+
+    # 24-bit colors (SGR 38;2)
+    TrueColor = 3
+
+
+# The usual (xterm) values of the 16 theme colors, in SGR order: 8 normal colors, then their bright variants
+Ansi16Palette = [Color(0, 0, 0), Color(205, 0, 0), Color(0, 205, 0), Color(205, 205, 0),
+                 Color(0, 0, 238), Color(205, 0, 205), Color(0, 205, 205), Color(229, 229, 229),
+                 Color(127, 127, 127), Color(255, 0, 0), Color(0, 255, 0), Color(255, 255, 0),
+                 Color(92, 92, 255), Color(255, 0, 255), Color(0, 255, 255), Color(255, 255, 255)]
+
+# The xterm 256-color palette
+Ansi256Palette = Ansi16Palette + \
+                 [Color(r, g, b) for r in (0, 95, 135, 175, 215, 255)
+                  for g in (0, 95, 135, 175, 215, 255) for b in (0, 95, 135, 175, 215, 255)] + \
+                 [Color(8 + 10 * i, 8 + 10 * i, 8 + 10 * i) for i in range(0, 24)]
+
+
+def detectColorDepth(stream=None, environ=None):
+    """
+    Guesses the color capability of the terminal behind a stream, from the conventional environment variables:
+    NO_COLOR, COLORTERM and TERM. Streams that are not terminals are given no color.
+
+    Args:
+        stream: The output stream. Default: sys.stdout
+        environ: The environment variables. Default: os.environ
+
+    Returns:
+        one of ColorDepths
+    """
+
+    stream = sys.stdout if stream is None else stream
+    environ = os.environ if environ is None else environ
+
+    if "NO_COLOR" in environ:
+        return ColorDepths.Mono
+    try:
+        if not stream.isatty():
+            return ColorDepths.Mono
+    except (AttributeError, ValueError):
+        return ColorDepths.Mono
+
+    colorterm = environ.get("COLORTERM", "").lower()
+    term = environ.get("TERM", "").lower()
+    if colorterm in ("truecolor", "24bit") or term.endswith("-direct"):
+        return ColorDepths.TrueColor
+    if "256" in term:
+        return ColorDepths.Ansi256
+    if term == "dumb":
+        return ColorDepths.Mono
+    if sys.platform == "win32":
+        # Windows Terminal and recent Windows 10 consoles support 24-bit colors; older consoles do not set WT_SESSION.
+        return ColorDepths.TrueColor if "WT_SESSION" in environ else ColorDepths.Ansi16
+    return ColorDepths.Ansi16
+
+
+def toAnsi(color: Color, depth: int=None, background: bool=False):
+    """
+    Converts a color to the SGR escape sequence selecting it, or its closest match in the palette of a color depth.
+    Sequences are cached, so that converting the same colors again costs a dictionary lookup.
+
+    Args:
+        color: The color to convert. Alpha is ignored.
+        depth: One of ColorDepths. Default: detectColorDepth() of sys.stdout
+        background: Whether to select the background color, instead of the foreground color.
+
+    Returns:
+        the escape sequence, or an empty string for ColorDepths.Mono
+    """
+
+    if depth is None:
+        depth = _defaultdepth()
+    return _ansi(color, depth, background)
+
+
+@functools.lru_cache(maxsize=1)
+def _defaultdepth():
+    return detectColorDepth()
+
+
+@functools.lru_cache(maxsize=4096)
+def _ansi(color: Color, depth: int, background: bool):
+    r, g, b = color.r, color.g, color.b
+    if depth >= ColorDepths.TrueColor:
+        return "\033[%d;2;%d;%d;%dm" % (48 if background else 38, r, g, b)
+    if depth == ColorDepths.Ansi256:
+        return "\033[%d;5;%dm" % (48 if background else 38, _palettes()[1].nearestindex(r, g, b))
+    if depth == ColorDepths.Ansi16:
+        index = _palettes()[0].nearestindex(r, g, b, exact=True)
+        return "\033[%dm" % ((40 if background else 30) + index if index < 8 else (100 if background else 90) + index - 8)
+    return ""
+
+
+class Style:
+    """
+    An immutable text style: foreground and background colors, bold, underline and reverse video.
+    Every distinct style is registered once and given an integer Id, which frame buffers store in each cell.
+    Id 0 is Style.Default, the shell's own style.
+    Styles created by compositeStyles() are only kept while recently used: past MaxComposited of them, the least
+    recently used one is evicted and its Id reused (see Evictions).
+    """
+
+    __slots__ = ("Foreground", "Background", "Bold", "Underline", "Reverse", "Id")
+
+    # Registered styles, by Id and by attributes. Ids are stored as unsigned 16-bit integers.
+    _Styles = []
+    _Registry = {}
+    MaxStyles = 65536
+
+    # Composited styles, by Id, least recently used first
+    _Composited = collections.OrderedDict()
+    MaxComposited = 4096
+    # Number of composited styles evicted so far. Cells holding the Id of an evicted style must be composited again.
+    Evictions = 0
+
+    def __new__(cls, foreground: Color = None, background: Color = None, bold: bool = False, underline: bool = False,
+                reverse: bool = False):
+        key = (foreground, background, bool(bold), bool(underline), bool(reverse))
+        style = Style._Registry.get(key)
+        if style is not None:
+            # A composited style created explicitly becomes permanent: it is no longer evicted.
+            Style._Composited.pop(style.Id, None)
+            return style
+        return Style._create(key, Style._nextid())
+
+    @staticmethod
+    def _nextid():
+        if len(Style._Styles) >= Style.MaxStyles:
+            raise OverflowError("Too many distinct styles: at most " + str(Style.MaxStyles) + " can be registered.")
+        return len(Style._Styles)
+
+    @staticmethod
+    def _create(key: tuple, styleid: int):
+        style = object.__new__(Style)
+        for name, value in zip(Style.__slots__, key + (styleid,)):
+            object.__setattr__(style, name, value)
+        if styleid == len(Style._Styles):
+            Style._Styles.append(style)
+        else:
+            Style._Styles[styleid] = style
+        Style._Registry[key] = style
+        return style
+
+    @staticmethod
+    def _composite(foreground: Color, background: Color, bold: bool, underline: bool, reverse: bool):
+        """
+        Looks up or registers a style created by compositing, marking it as recently used.
+        """
+
+        key = (foreground, background, bool(bold), bool(underline), bool(reverse))
+        style = Style._Registry.get(key)
+        if style is not None:
+            if style.Id in Style._Composited:
+                Style._Composited.move_to_end(style.Id)
+            return style
+
+        if len(Style._Composited) >= Style.MaxComposited:
+            styleid, evicted = Style._Composited.popitem(last=False)
+            del Style._Registry[(evicted.Foreground, evicted.Background, evicted.Bold, evicted.Underline,
+                                 evicted.Reverse)]
+            Style.Evictions += 1
+        else:
+            styleid = Style._nextid()
+        style = Style._create(key, styleid)
+        Style._Composited[styleid] = style
+        return style
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Style objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Style objects are immutable")
+
+    def __reduce__(self):
+        return (Style, (self.Foreground, self.Background, self.Bold, self.Underline, self.Reverse))
+
+    def __repr__(self):
+        return "Style(Foreground=" + repr(self.Foreground) + ", Background=" + repr(self.Background) + \
+               ", Bold=" + str(self.Bold) + ", Underline=" + str(self.Underline) + ", Reverse=" + str(self.Reverse) + ")"
+
+    @staticmethod
+    def fromId(styleid: int):
+        """
+        Returns:
+            the registered style with the given Id
+        """
+        return Style._Styles[styleid]
+
+    def sgr(self, depth: int = None):
+        """
+        Builds the SGR escape sequence switching the shell from any style to this one: a reset, followed by this
+        style's attributes and colors. Sequences are cached.
+
+        Args:
+            depth: One of ColorDepths. Default: detectColorDepth() of sys.stdout
+
+        Returns:
+            the escape sequence, or an empty string for ColorDepths.Mono
+        """
+
+        if depth is None:
+            depth = _defaultdepth()
+        return _sgr(self, depth)
+
+
+@functools.lru_cache(maxsize=4096)
+def _sgr(style: Style, depth: int):
+    if depth == ColorDepths.Mono:
+        return ""
+    parameters = ["0"]
+    if style.Bold:
+        parameters.append("1")
+    if style.Underline:
+        parameters.append("4")
+    if style.Reverse:
+        parameters.append("7")
+    # toAnsi() escapes, stripped of their "\033[" prefix and "m" suffix
+    if style.Foreground is not None:
+        parameters.append(toAnsi(style.Foreground, depth)[2:-1])
+    if style.Background is not None:
+        parameters.append(toAnsi(style.Background, depth, background=True)[2:-1])
+    return "\033[" + ";".join(parameters) + "m"
+
+
+# Style Id 0
+Style.Default = Style()
+
+# The color assumed behind the shell's default background, when a translucent color is blended over it
+DefaultBackdrop = Color(0, 0, 0)
+
+
+def blendColors(under: Color, over: Color):
+    """
+    Composites a color over another one ('over' operator), weighting 'over' by its alpha value.
+
+    Returns:
+        the blended color
+    """
+
+    a = over.a
+    if a >= 1.0:
+        return over
+    if a <= 0.0:
+        return under
+    return Color(round(over.r * a + under.r * (1 - a)), round(over.g * a + under.g * (1 - a)),
+                 round(over.b * a + under.b * (1 - a)), a + under.a * (1 - a))
+
+
+def compositeStyles(underid: int, overid: int, seethrough: bool = False, backdrop: Color = None):
+    """
+    Composites the style of a cell drawn over another cell. Translucent background colors of the upper style are
+    blended over the lower cell's background, and translucent foreground colors over the resulting background.
+    Resulting styles are registered as composited styles, whose Ids may be reused once they are no longer recently
+    used (see Style.MaxComposited and Style.Evictions): they should not be kept across frames.
+
+    Args:
+        underid: The style Id of the lower cell.
+        overid: The style Id of the upper cell.
+        seethrough: Whether the lower cell's character shows through the upper cell (a transparent cell), in which
+            case the lower cell keeps its foreground color and attributes.
+        backdrop: The color assumed behind the shell's default background. Default: DefaultBackdrop
+
+    Returns:
+        the Id of the composited style
+    """
+
+    if backdrop is None:
+        backdrop = DefaultBackdrop
+    under = Style.fromId(underid)
+    over = Style.fromId(overid)
+    top = under if seethrough else over
+
+    background = under.Background
+    if over.Background is not None:
+        background = blendColors(backdrop if background is None else background, over.Background)
+    foreground = top.Foreground
+    if foreground is not None and foreground.a < 1.0:
+        foreground = blendColors(backdrop if background is None else background, foreground)
+    return Style._composite(foreground, background, top.Bold, top.Underline, top.Reverse).Id
+
+
+def isTranslucent(style: Style):
+    """
+    Returns:
+        Whether drawing with 'style' needs compositeStyles(): one of its colors is not fully opaque
+    """
+    return (style.Foreground is not None and style.Foreground.a < 1.0) or \
+           (style.Background is not None and style.Background.a < 1.0)
+
+
+@functools.lru_cache(maxsize=1)
+def _palettes():
+    """
+    Returns:
+        the (Ansi16Palette, Ansi256Palette) palette indexes, built on first use
+    """
+    return (PaletteIndex(Ansi16Palette), PaletteIndex(Ansi256Palette))
 
 
 
@@ -248,4 +753,90 @@ def toIdle(color: Color):
             -CombinationCharacters dictionary for special keyboard functions that cannot be represented as a single
              Unicode character
             -static tostring(key1: bytes, key2: bytes)
-"""
\ No newline at end of file
+"""
+
+# 1.1
+"""
+    Nearest-color lookup
+
+    Additions
+    ---------
+        -colordistance(color1, color2): 'redmean' perceptual distance
+        -class PaletteIndex: nearest-color lookup through a 32x32x32 cube of precomputed cells
+            -nearest(self, color), nearestindex(self, r, g, b, exact=False)
+            -nearestindices(self, pixels): batched lookup, vectorized with NumPy arrays
+
+    Changes
+    -------
+        -ColorList.getName() uses a palette index built once, and caches its results
+
+    Bug Fixes
+    ---------
+        -closestFromPalette() summed signed channel differences, so that differences could cancel out
+        -closestFromPalette() started from a threshold of 255*4, missing a closer palette color when every distance
+         was larger
+"""
+
+# 1.2
+"""
+    Terminal color output
+
+    Additions
+    ---------
+        -class ColorDepths
+        -Ansi16Palette, Ansi256Palette
+        -detectColorDepth(stream=None, environ=None)
+        -toAnsi(color: Color, depth: int=None, background: bool=False): cached SGR escape of a color
+
+    Bug Fixes
+    ---------
+        -toIdle() failed on every call: its reverse palette used unhashable Color objects as keys
+"""
+
+# 1.3
+"""
+    Immutable colors
+
+    Additions
+    ---------
+        -Color.__hash__(self): colors can be used as dictionary keys and set members
+        -Color.toPacked(self), Color.fromPacked(value: int): 0xRRGGBBAA integers
+        -Color.withAlpha(self, a: float)
+        -Color._Interned, Color.MaxInterned: intern table of constructed colors
+
+    Changes
+    -------
+        -Color uses __slots__ and is immutable: r, g, b and a are plain attributes, clamped once by the constructor
+        -Color's default alpha is 1.0
+        -ColorList.getName(), toIdle() and toAnsi() cache their results by Color
+
+    Bug Fixes
+    ---------
+        -Color's alpha was truncated to an integer, so that every alpha below 1 became 0
+        -Color.toRgbaHex() wrote an alpha of 1 as '100'
+"""
+
+# 1.4
+"""
+    Text styles
+
+    Additions
+    ---------
+        -class Style: immutable foreground/background colors, bold, underline and reverse video, registered under an Id
+            -Style.Default (Id 0), Style.fromId(styleid: int)
+            -sgr(self, depth: int = None): cached SGR escape switching the shell to the style
+"""
+
+# 1.5
+"""
+    Alpha compositing
+
+    Additions
+    ---------
+        -blendColors(under: Color, over: Color)
+        -compositeStyles(underid, overid, seethrough=False, backdrop=None): style of a cell drawn over another cell,
+         with translucent colors blended
+            -Composited styles are evicted, least recently used first, past Style.MaxComposited; Style.Evictions
+             counts them
+        -isTranslucent(style: Style), DefaultBackdrop
+"""
@@ -7,7 +7,7 @@ if __name__ == "__main__":
     # MAJOR +1 represents an added function.
     __MAJOR = 2
     # MINOR +1 represents a change in existing function(s) within the current MAJOR.
-    __MINOR = 0
+    __MINOR = 5
 
     __info = """This file contains the module 'EventSystem', used to integrate event-driven functions.
 To use this module in another project, include this file inside the project's directory."""
@@ -22,13 +22,79 @@ To use this module in another project, include this file inside the project's di
 
 #========================Imports========================
 
-# no import
+# Used by: schedulecoroutine()
+import asyncio
+import inspect
+# Used by: EventDispatcher
+import collections
+import concurrent.futures
+import threading
+# Used by: EventListener (weak subscriptions); livesubscribers()
+import weakref
+# Used by: __path__
+import os
+
+# This module shares its name with the EventSystem directory holding the events built on it (KeyPress, FocusLost, ...).
+# Python imports the module and ignores the directory, so the module is given the directory as its package search
+# path: "from lib.EventSystem.KeyPress import ..." then resolves through it.
+__path__ = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "EventSystem")]
 
 
 
 #========================Common Functions========================
 
-# no function
+# Tasks started by schedulecoroutine(), referenced until done so that they are not garbage collected mid-run.
+_pendingtasks = set()
+
+# Every event listener alive, for livesubscribers()
+_listeners = weakref.WeakSet()
+
+
+def livesubscribers():
+    """
+    Counts the subscribers of every event listener alive, by listener type.
+    Useful to find screens that are kept alive by their event subscriptions.
+
+    Returns:
+        a dictionary of {listener type name: number of live subscribers}
+    """
+
+    counts = {}
+    for listener in list(_listeners):
+        name = type(listener).__name__
+        counts[name] = counts.get(name, 0) + len(listener)
+    return counts
+
+
+def schedulecoroutine(coroutine):
+    """
+    Runs an awaitable returned by an async subscriber.
+    Inside a running asyncio event loop, the awaitable is scheduled as a task of that loop; otherwise, it is run to
+    completion before returning.
+
+    Args:
+        coroutine: The awaitable to run.
+
+    Returns:
+        the scheduled asyncio.Task, or the result of the awaitable if no event loop is running
+    """
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_awaitable(coroutine))
+
+    task = loop.create_task(_awaitable(coroutine))
+    _pendingtasks.add(task)
+    task.add_done_callback(_pendingtasks.discard)
+    return task
+
+
+async def _awaitable(awaitable):
+    """
+    Wraps any awaitable into a coroutine, as required by asyncio.run() and create_task().
+    """
+    return await awaitable
 
 
 
@@ -43,29 +109,66 @@ class EventArgs:
         self.kwargs = kwargs
 
 
+    def update(self):
+        """
+        Replaces the values of these args, when they are reused by their listener (see EventListener.ReuseArgs).
+        EventArgs carrying values override it, with the same parameters as their __init__ but **kwargs.
+        """
+        pass
+
+
 
 class EventListener:
     """
     Base class for implementing new event listeners.
     Event listener classes should be underscored (hidden).
     Listeners serve as an intermediary to an event handler and subscribed methods, implementing a custom EventArgs.
+    Subscribing and unsubscribing take constant time; notify() iterates over a tuple of the subscribers, which is only
+    rebuilt after the subscribers changed.
+    Subscribers may be held through weak references (see subscribe() and Weak), so that subscribing an object's method
+    does not keep the object alive. Weak subscribers are unsubscribed automatically once their object is collected.
     """
 
     def __init__(self, *subscribers):
-        # Subscribers (function delegates) to this event listener are stored here.
-        self.Subscribers = []
+        # Subscribers (function delegates) to this event listener are stored here, in an ordered dict of
+        # {key: (subscriber, weak)}. A subscriber is its own key; a weak subscriber is held through a weakref.WeakMethod
+        # or weakref.ref, under the key returned by __weakkey().
+        self.__subscribers = {}
+        # Tuple of (subscriber, weak) pairs, in subscription order, or None when it needs to be rebuilt
+        self.__snapshot = ()
+
+        # Whether 'listener += subscriber' subscribes through a weak reference
+        self.Weak = False
+
+        # Thread pool running the subscribers, or None to run them on the thread raising the event. See EventDispatcher
+        self.Dispatcher = None
+
+        self.__reuseargs = False
+        # EventArgs object reused by specialized listeners when ReuseArgs is set
+        self._reusedargs = None
 
         for method in subscribers:
             self += method
 
+        _listeners.add(self)
+
+
+    def __contains__(self, subscriber):
+        return subscriber in self.__subscribers or self.__weakkey(subscriber) in self.__subscribers
+
 
     def __iadd__(self, subscriber):
-        if subscriber not in self.Subscribers:
-            self.Subscribers.append(subscriber)
+        self.subscribe(subscriber, self.Weak)
+        return self
+
+
+    def __isub__(self, subscriber):
+        self.unsubscribe(subscriber)
+        return self
 
 
     def __len__(self):
-        return len(self.Subscribers)
+        return len(self.__subscribers)
 
 
     def __repr__(self):
@@ -75,13 +178,153 @@ class EventListener:
         return s
 
 
+    @property
+    def ReuseArgs(self):
+        """
+        Whether specialized listeners may pass the same EventArgs object to every notification, updating its values,
+        instead of allocating a new one. Subscribers must then not keep the args they receive.
+        Always False while a Dispatcher is set, since subscribers then run after notify() returned.
+        """
+        return self.__reuseargs and self.Dispatcher is None
+    @ReuseArgs.setter
+    def ReuseArgs(self, value: bool):
+        self.__reuseargs = bool(value)
+
+
+    @property
+    def Subscribers(self):
+        """
+        Returns:
+            a tuple of the live subscribers, in subscription order
+        """
+        subscribers = []
+        for subscriber, weak in self.__dispatchtable():
+            if weak:
+                subscriber = subscriber()
+                if subscriber is None:
+                    continue
+            subscribers.append(subscriber)
+        return tuple(subscribers)
+
+
     def notify(self, sender, args: EventArgs):
         """
         Notifies all subscribers when an event occurs.
+        Subscribers may be coroutine functions ('async def'): their coroutines are scheduled with schedulecoroutine().
+        Specialized listeners should return before building their EventArgs when the listener has no subscriber.
+        With a Dispatcher, subscribers are queued to run on its thread pool, and notify() returns immediately.
+        """
+
+        if self.Dispatcher is not None:
+            self.Dispatcher.submit(self, self.__dispatchtable(), sender, args)
+            return
+
+        for subscriber, weak in self.__dispatchtable():
+            if weak:
+                subscriber = subscriber()
+                if subscriber is None:
+                    continue
+            result = subscriber(sender, args)
+            if inspect.isawaitable(result):
+                schedulecoroutine(result)
+
+
+    def subscribe(self, subscriber, weak: bool=False):
         """
+        Subscribes a function delegate to this listener. Does nothing if it is already subscribed.
 
-        for subscriber in self.Subscribers:
-            subscriber(sender, args)
+        Args:
+            subscriber: The function delegate, called as subscriber(sender, args).
+            weak: Whether to hold the subscriber through a weak reference. A weakly subscribed bound method does not
+                keep its object alive; a weakly subscribed function (e.g. a lambda) is unsubscribed as soon as nothing
+                else references it.
+
+        Raises:
+            TypeError: 'weak' is True and 'subscriber' cannot be weakly referenced (e.g. a method descriptor such as
+                str.upper).
+        """
+
+        if subscriber in self:
+            return
+        if weak:
+            key = self.__weakkey(subscriber)
+            prune = lambda reference: self.__prune(key)
+            try:
+                if inspect.ismethod(subscriber):
+                    reference = weakref.WeakMethod(subscriber, prune)
+                else:
+                    reference = weakref.ref(subscriber, prune)
+            except TypeError:
+                raise TypeError("Argument 'subscriber' cannot be weakly referenced.") from None
+            self.__subscribers[key] = (reference, True)
+        else:
+            self.__subscribers[subscriber] = (subscriber, False)
+        self.__snapshot = None
+
+
+    def unsubscribe(self, subscriber):
+        """
+        Unsubscribes a function delegate, whether it was subscribed weakly or not. Does nothing if it is not subscribed.
+        """
+
+        if subscriber in self.__subscribers:
+            del self.__subscribers[subscriber]
+        else:
+            key = self.__weakkey(subscriber)
+            if key not in self.__subscribers:
+                return
+            del self.__subscribers[key]
+        self.__snapshot = None
+
+
+    def _args(self, factory, *values):
+        """
+        Returns the EventArgs to notify, for specialized listeners: a new factory(*values), or, with ReuseArgs, the args
+        object reused for every notification, updated with args.update(*values).
+
+        Args:
+            factory: The EventArgs class of the listener.
+            values: The values of the event, as passed to factory() and EventArgs.update().
+        """
+
+        if not self.ReuseArgs:
+            return factory(*values)
+        if self._reusedargs is None:
+            self._reusedargs = factory(*values)
+        else:
+            self._reusedargs.update(*values)
+        return self._reusedargs
+
+
+    def __dispatchtable(self):
+        """
+        Returns the tuple of (subscriber, weak) pairs iterated by notify(), rebuilding it if the subscribers changed.
+        """
+        if self.__snapshot is None:
+            self.__snapshot = tuple(self.__subscribers.values())
+        return self.__snapshot
+
+
+    def __prune(self, key):
+        """
+        Called when the object of a weak subscriber is collected: removes the subscriber.
+        """
+        if key in self.__subscribers:
+            del self.__subscribers[key]
+            self.__snapshot = None
+
+
+    @staticmethod
+    def __weakkey(subscriber):
+        """
+        Returns:
+            the key of 'subscriber' when subscribed weakly: the identity of its object and its function for a bound
+            method, its own identity otherwise. Unlike a weak reference, the key never hashes the object, which may be
+            unhashable (e.g. a Component defines __eq__ but no __hash__).
+        """
+        if inspect.ismethod(subscriber):
+            return (id(subscriber.__self__), subscriber.__func__)
+        return (id(subscriber), None)
 
 
 
@@ -95,11 +338,186 @@ class EventHandler:
         self.Listener = listener
 
 
+    def setdispatcher(self, dispatcher):
+        """
+        Runs the subscribers of this handler's listener on a thread pool, or back on the thread raising the events if
+        'dispatcher' is None.
+
+        Args:
+            dispatcher: An EventDispatcher, or None.
+        """
+        self.Listener.Dispatcher = dispatcher
+
+
     def updatelistener(self, **kwargs):
         self.Listener.notify(self, EventArgs(**kwargs))
 
 
 
+#========================Background dispatch: EventDispatcher========================
+
+class EventDispatcher:
+    """
+    Runs the subscribers of event listeners on a bounded thread pool, so that slow subscribers do not block the thread
+    raising the events (see EventListener.Dispatcher and EventHandler.setdispatcher()).
+
+    Ordering: the events of one listener are delivered one after the other, in the order they were raised, and the
+    subscribers of an event are called in subscription order. Events of different listeners run concurrently.
+    Backpressure: at most 'maxpending' events wait or run at once; raising more events blocks the raising thread until
+    one completes, or drops the event if 'blocking' is False. Events raised by subscribers, on the worker threads, are
+    always queued without waiting: a worker waiting for a slot held by events only workers can deliver would deadlock.
+    Errors: exceptions raised by subscribers are captured in Errors and passed to OnError, without stopping the other
+    subscribers. Exceptions raised by OnError itself are captured in Errors as well.
+    """
+
+    def __init__(self, maxworkers: int=4, maxpending: int=256, blocking: bool=True):
+        """
+        Args:
+            maxworkers: The number of worker threads.
+            maxpending: The maximum number of events waiting or running at once.
+            blocking: Whether raising an event waits for room when 'maxpending' events are pending, instead of
+                dropping the event.
+        """
+
+        self.Blocking = blocking
+        # (listener, subscriber, exception) tuples of the last errors raised by subscribers, or by OnError
+        self.Errors = collections.deque(maxlen=100)
+        # Function called as OnError(listener, subscriber, exception) on a worker thread, or None
+        self.OnError = None
+        # Number of events dropped because 'maxpending' events were pending
+        self.Dropped = 0
+
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=maxworkers,
+                                                                thread_name_prefix="EventDispatcher")
+        self.__slots = threading.BoundedSemaphore(maxpending)
+        self.__lock = threading.Condition()
+        # Queue of pending events, by listener. A listener has a queue only while a worker drains it.
+        self.__queues = {}
+        self.__pending = 0
+        # Marks the worker threads of this dispatcher
+        self.__local = threading.local()
+
+
+    @property
+    def pending(self):
+        """
+        Returns:
+            the number of events waiting or running
+        """
+        return self.__pending
+
+
+    def shutdown(self, wait: bool=True):
+        """
+        Stops the worker threads once every pending event was delivered.
+
+        Args:
+            wait: Whether to wait for the pending events to be delivered before returning.
+        """
+        self.__executor.shutdown(wait=wait)
+
+
+    def submit(self, listener, subscribers: tuple, sender, args):
+        """
+        Queues an event, to be delivered to 'subscribers' after the previous events of 'listener'.
+
+        Args:
+            listener: The listener raising the event.
+            subscribers: A tuple of (subscriber, weak) pairs, as stored by the listener.
+            sender, args: The arguments passed to every subscriber.
+
+        Returns:
+            True if the event was queued, False if it was dropped
+        """
+
+        # Events raised from a worker thread do not take a slot.
+        slotted = not getattr(self.__local, "worker", False)
+        if slotted and not self.__slots.acquire(blocking=self.Blocking):
+            self.Dropped += 1
+            return False
+
+        with self.__lock:
+            self.__pending += 1
+            queue = self.__queues.get(listener)
+            start = queue is None
+            if start:
+                queue = self.__queues[listener] = collections.deque()
+            queue.append((subscribers, sender, args, slotted))
+        if start:
+            try:
+                self.__executor.submit(self.__drain, listener, queue)
+            except BaseException:
+                # The executor was shut down: give back the slot and the pending count taken by this event.
+                with self.__lock:
+                    del self.__queues[listener]
+                    self.__pending -= 1
+                    self.__lock.notify_all()
+                if slotted:
+                    self.__slots.release()
+                raise
+        return True
+
+
+    def wait(self, timeout: float=None):
+        """
+        Waits until every pending event was delivered.
+
+        Returns:
+            True if no event is pending, False if 'timeout' seconds elapsed first
+        """
+        with self.__lock:
+            return self.__lock.wait_for(lambda: self.__pending == 0, timeout)
+
+
+    def __drain(self, listener, queue):
+        """
+        Worker: delivers the events of a listener, in order, until its queue is empty.
+        """
+
+        self.__local.worker = True
+        while True:
+            with self.__lock:
+                if not queue:
+                    del self.__queues[listener]
+                    return
+                subscribers, sender, args, slotted = queue.popleft()
+
+            try:
+                for subscriber, weak in subscribers:
+                    if weak:
+                        subscriber = subscriber()
+                        if subscriber is None:
+                            continue
+                    try:
+                        result = subscriber(sender, args)
+                        if inspect.isawaitable(result):
+                            schedulecoroutine(result)
+                    except BaseException as e:
+                        self.__error(listener, subscriber, e)
+            finally:
+                if slotted:
+                    self.__slots.release()
+                with self.__lock:
+                    self.__pending -= 1
+                    self.__lock.notify_all()
+
+
+    def __error(self, listener, subscriber, exception):
+        """
+        Captures an exception raised by a subscriber in Errors, and passes it to OnError. An exception raised by OnError
+        is captured too, as raised by OnError: a worker must never leave its queue with events left in it.
+        """
+
+        self.Errors.append((listener, subscriber, exception))
+        if self.OnError is not None:
+            onerror = self.OnError
+            try:
+                onerror(listener, subscriber, exception)
+            except BaseException as e:
+                self.Errors.append((listener, onerror, e))
+
+
+
 #========================Version History========================
 
 # 1.0
@@ -171,3 +589,81 @@ class EventHandler:
     ---------
         -Minor typo fixes.
 """
+
+# 2.1
+"""
+    Bug Fixes
+    ---------
+        -lib.EventSystem.KeyPress and the other events could not be imported: the module hid the EventSystem directory
+"""
+
+# 2.2
+"""
+    Additions
+    ---------
+        -Async subscribers: EventListener.notify() schedules the coroutines returned by subscribers
+        -schedulecoroutine(coroutine)
+
+    Bug Fixes
+    ---------
+        -EventListener.__iadd__() returned None, so 'listener += subscriber' replaced the listener with None
+"""
+
+# 2.3
+"""
+    Listener dispatch performance
+
+    Additions
+    ---------
+        -EventListener.__isub__(): 'listener -= subscriber' unsubscribes in constant time
+        -EventListener.__contains__()
+        -EventListener.ReuseArgs: lets specialized listeners reuse one EventArgs object for every notification
+            -EventListener._args(self, factory, *values) builds or reuses the args of specialized listeners, and
+             EventArgs.update(self) replaces the values of reused args
+
+    Changes
+    -------
+        -EventListener stores its subscribers in an ordered dict: subscribing no longer scans every subscriber
+        -EventListener.Subscribers is a read-only tuple. notify() iterates over a tuple of the subscribers cached until
+         they change
+        -Specialized listeners (FocusLost, OnFocus, KeyPress, PreFrame, PostFrame, Paste) do not build their
+         EventArgs when they have no subscriber
+"""
+
+# 2.4
+"""
+    Weak subscriptions
+
+    Additions
+    ---------
+        -EventListener.subscribe(subscriber, weak: bool=False) and EventListener.unsubscribe(subscriber)
+        -EventListener.Weak: makes 'listener += subscriber' subscribe weakly
+            -Weak subscribers are held through weakref.WeakMethod (bound methods) or weakref.ref, and are removed as soon
+             as their object is collected
+            -Objects that cannot be hashed, such as Components, can subscribe their methods, weakly or not
+        -livesubscribers(): number of live subscribers of every listener alive, by listener type
+"""
+
+# 2.5
+"""
+    Background dispatch
+
+    Additions
+    ---------
+        -class EventDispatcher: runs subscribers on a bounded thread pool, in order for each listener, with
+         backpressure and error capture
+            -submit(self, listener, subscribers, sender, args), wait(self, timeout=None), shutdown(self, wait=True)
+            -Errors, OnError, Dropped, pending
+        -EventListener.Dispatcher; EventHandler.setdispatcher(dispatcher)
+
+    Changes
+    -------
+        -EventListener.ReuseArgs is a property, always False while a Dispatcher is set
+
+    Bug Fixes
+    ---------
+        -EventDispatcher.submit() leaked its slot and pending count when the executor was shut down
+        -Events raised by subscribers on a worker thread could wait for a slot forever; they are now queued at once
+        -An exception raised by OnError, or a BaseException raised by a subscriber, stopped the worker: the later events
+         of the listener were never delivered and wait() never returned
+"""
@@ -59,7 +59,9 @@ class FocusLostEventListener(EventListener):
             sender:
         """
 
-        EventListener.notify(self, sender, FocusLostEventArgs())
+        if len(self) == 0:
+            return
+        EventListener.notify(self, sender, self._args(FocusLostEventArgs))
 
 
 
@@ -99,4 +101,4 @@ class FocusLostEventHandler(EventHandler):
             -CombinationCharacters dictionary for special keyboard functions that cannot be represented as a single
              Unicode character
             -static tostring(key1: bytes, key2: bytes)
-"""
\ No newline at end of file
+"""
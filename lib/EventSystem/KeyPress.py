@@ -7,7 +7,7 @@ if __name__ == "__main__":
     # MAJOR +1 represents an added function.
     __MAJOR = 1
     # MINOR +1 represents a change in existing function(s) within the current MAJOR.
-    __MINOR = 0
+    __MINOR = 7
 
     __info = """This file contains the module 'KeyEvent', used to integrate key press events.
 To use this module in another project, include this file inside the project's directory."""
@@ -22,17 +22,46 @@ To use this module in another project, include this file inside the project's di
 
 #========================Imports========================
 
-# Used by:
+# Used by: KeyPressEventHandler
+import atexit
+import collections
 import os
+import select
+import sys
+# Used by: EscapeSequenceParser; KeyPressEventHandler (Windows)
+import time
 
 from lib.Utils import *
 from lib.EventSystem import *
+from lib.EventSystem.Paste import PasteEventListener
 
 
 
 #========================Common Functions========================
 
-# no function
+def coalescekeys(keys):
+    """
+    Merges runs of the same navigation or function key, such as the bursts sent by a held arrow key, into a single key
+    with a repeat count. Only combination keys (key2 other than KeyCodes.Null) are merged: characters, even repeated,
+    are text and stay one key each.
+
+    Args:
+        keys: A sequence of (key, key2) tuples, in the order they were pressed.
+
+    Returns:
+        a list of (key, key2, repeat) tuples
+    """
+
+    coalesced = []
+    previous = None
+    for keycodes in keys:
+        if keycodes == previous and keycodes[1] != KeyCodes.Null:
+            key, key2, repeat = coalesced[-1]
+            coalesced[-1] = (key, key2, repeat + 1)
+        else:
+            coalesced.append((keycodes[0], keycodes[1], 1))
+            previous = keycodes
+    return coalesced
 
 
 
@@ -40,10 +69,22 @@ from lib.EventSystem import *
 
 class KeyPressEventArgs(EventArgs):
 
-    def __init__(self, key, key2=b'\x00', **kwargs):
+    def __init__(self, key, key2=b'\x00', repeat: int=1, **kwargs):
         EventArgs.__init__(self, **kwargs)
+        self.update(key, key2, repeat)
+
+
+    def update(self, key, key2=b'\x00', repeat: int=1):
+        """
+        Replaces the key of these args, when they are reused by KeyPressEventListener (see EventListener.ReuseArgs).
+        """
+
         self.Key = key
         self.Key2 = key2
+        # Number of consecutive presses of this key merged into this event (see KeyPressEventHandler.Coalesce)
+        self.Repeat = repeat
+        # Set by a subscriber to stop a routed key press from bubbling up to the component's parents
+        self.Handled = False
         if key2 == b'\x00':
             self.isSpecialKey = False
         else:
@@ -51,13 +92,30 @@ class KeyPressEventArgs(EventArgs):
 
 
 
+class KeyPressBatchEventArgs(EventArgs):
+
+    def __init__(self, keys: list, **kwargs):
+        EventArgs.__init__(self, **kwargs)
+        # KeyPressEventArgs of every key read at once, in the order they were pressed
+        self.Keys = keys
+
+
+    def __iter__(self):
+        return iter(self.Keys)
+
+
+    def __len__(self):
+        return len(self.Keys)
+
+
+
 class KeyPressEventListener(EventListener):
 
     def __init__(self, *subscribers):
         EventListener.__init__(self, *subscribers)
 
 
-    def notify(self, sender, key, key2=b'\x00'):
+    def notify(self, sender, key, key2=b'\x00', repeat: int=1):
         """
         Notifies all subscribers about a key press.
 
@@ -65,9 +123,34 @@ class KeyPressEventListener(EventListener):
             sender:
             key:
             key2:
+            repeat: The number of consecutive presses of the key.
+        """
+
+        if len(self) == 0:
+            return
+        EventListener.notify(self, sender, self._args(KeyPressEventArgs, key, key2, repeat))
+
+
+
+class KeyPressBatchEventListener(EventListener):
+
+    def __init__(self, *subscribers):
+        EventListener.__init__(self, *subscribers)
+
+
+    def notify(self, sender, keys):
         """
+        Notifies all subscribers about the keys pressed since the last read, in a single event.
 
-        EventListener.notify(self, sender, KeyPressEventArgs(key, key2))
+        Args:
+            sender:
+            keys: A sequence of (key, key2, repeat) tuples.
+        """
+
+        if len(self) == 0:
+            return
+        EventListener.notify(self, sender, KeyPressBatchEventArgs([KeyPressEventArgs(key, key2, repeat)
+                                                                   for key, key2, repeat in keys]))
 
 
 
@@ -75,24 +158,123 @@ class KeyPressEventHandler(EventHandler):
 
     def __init__(self, *subscribers):
 
+        # Decoder of the escape sequences sent by POSIX shells for function keys. See EscapeSequenceParser
+        self.Parser = EscapeSequenceParser()
+        # Subscribers notified once per read with every key read, instead of once per key
+        self.BatchListener = KeyPressBatchEventListener()
+        # Whether consecutive presses of the same navigation or function key read at once are merged into one event,
+        # with a repeat count. Subscribers must then honour KeyPressEventArgs.Repeat. See coalescekeys()
+        self.Coalesce = False
+        # Subscribers notified with the whole text of a paste, when BracketedPaste is set
+        self.PasteListener = PasteEventListener()
+        # Whether open() switches the shell to bracketed paste mode, for pastes to be notified to PasteListener
+        # instead of key by key. Not supported by Windows consoles.
+        self.BracketedPaste = False
+        self.__bracketedpaste = False
+
         if os.name == 'nt':
             self._getch = KeyPressEventHandler.__WindowsKeyPress()
         else:       # fallback method. Most likely os.name == 'posix'
-            self._getch = KeyPressEventHandler.__UnixKeyPress()
+            self._getch = KeyPressEventHandler.__UnixKeyPress(self.Parser)
 
         EventHandler.__init__(self, KeyPressEventListener(*subscribers))
 
 
+    def close(self):
+        """
+        Restores the shell's input mode, if reading keys had switched it to raw mode.
+        """
+        if os.name != 'nt':
+            self._getch.close()
+            if self.__bracketedpaste:
+                WriteShell("\033[?2004l", end="", flush=True)
+                self.__bracketedpaste = False
+
+
+    def feed(self, data: bytes):
+        """
+        Updates methods and functions subscribed to this event handler with keys that were already read from the
+        shell's input, e.g. by an asyncio reader. Escape sequences are decoded by the handler's Parser; call
+        flush() once Parser.remaining() elapsed if a sequence is left incomplete.
+
+        Args:
+            data: The bytes read from the shell's input.
+        """
+
+        self._dispatch(self.Parser.feed(data))
+
+
+    def fileno(self):
+        """
+        Returns:
+            the file descriptor keys are read from
+        """
+        return sys.stdin.fileno()
+
+
+    def flush(self):
+        """
+        Updates subscribers with the keys of an incomplete escape sequence (e.g. a lone 'Esc' key press), if no more
+        bytes arrived during the Parser's timeout.
+        """
+
+        self._dispatch(self.Parser.flush())
+
+
+    def open(self):
+        """
+        Switches a POSIX shell's input to raw mode until close() is called, instead of switching it for each read.
+        Reading keys opens the handler automatically.
+        """
+        if os.name != 'nt':
+            self._getch.open()
+            if self.BracketedPaste and not self.__bracketedpaste and sys.stdout.isatty():
+                WriteShell("\033[?2004h", end="", flush=True)
+                self.__bracketedpaste = True
+
+
     def readkey(self, decode=False):
         """
         Updates methods and functions subscribed to this event handler.
         Any subscriber must implement the exact parameters: subscriber(sender, args: KeyPressEventArgs)
             where parameter 'args' contains the string character mapped from the pressed key.
 
+        Text pasted while BracketedPaste is set is notified as readkeys() does: to PasteListener, or as plain key presses
+        without paste subscribers.
+
         Args:
             decode: Whether to decode the key code into the corresponding character.
         """
 
+        key, key2 = self.readkeycodes()
+
+        if key is None:
+            # Pasted text, which is neither a key code nor decodable by KeyCodes.tostring()
+            self._dispatchpaste(key2)
+            return
+
+        # Option to decode the key. Bad idea if wanting to detect function keys such as 'Esc'.
+        if decode:
+            # Updates the _KeyPressEventListener
+            self.Listener.notify(self, KeyCodes.tostring(key, key2))
+        elif key2 == b'\x00':
+            # A key which can be represented as a single Unicode character
+            self.Listener.notify(self, key)
+        else:
+            # A special function key that is represented as a combination of two Unicode characters
+            self.Listener.notify(self, key, key2)
+
+
+    def readkeycodes(self):
+        """
+        Waits for a key press, without notifying subscribers.
+        Can be called from a worker thread, the subscribers then being notified by the caller's thread.
+
+        Returns:
+            a (key, key2) tuple of key codes, key2 being KeyCodes.Null unless the key is a combination key,
+            or a (None, data) tuple with the bytes of a paste when BracketedPaste is set on a POSIX shell
+        """
+
         if os.name == 'nt':
             # _getch() in Windows returns a set of two user inputs in latin1 encoding
             keycodes = []
@@ -105,59 +287,176 @@ class KeyPressEventHandler(EventHandler):
                     keycodes.insert(1, KeyCodes.Null)
                     break
                 i+=1
+            return (keycodes[0], keycodes[1])
+        else:
+            return self._getch()
 
-            # Option to decode the key. Bad idea if wanting to detect function keys such as 'Esc'.
-            if decode:
-                # Updates the _KeyPressEventListener
-                self.Listener.notify(self, KeyCodes.tostring(keycodes[0], keycodes[1]))
-            elif keycodes[1] == b'\x00':
-                # A key which can be represented as a single Unicode character
-                self.Listener.notify(self, keycodes[0])
-            else:
-                # A special function key that is represented as a combination of two Unicode characters
-                self.Listener.notify(self, keycodes[0], keycodes[1])
+
+    def readkeys(self, timeout=None):
+        """
+        Waits for key presses, then updates subscribers with every key available, read at once.
+        Subscribers of BatchListener are notified once, with every key read.
+
+        Args:
+            timeout: The maximum time, in seconds, to wait for a key press. None waits indefinitely.
+
+        Returns:
+            the number of keys notified
+
+        Raises:
+            EOFError: The shell's input was closed.
+        """
+
+        if os.name == 'nt':
+            keys = []
+            if self._getch.wait(timeout):
+                keys.append(self.readkeycodes())
+                while self._getch.available():
+                    keys.append(self.readkeycodes())
         else:
-            keycode = self._getch()
+            keys = self._getch.read(timeout)
 
-            # Option to decode the key. Bad idea if wanting to detect function keys such as 'Esc'.
-            if decode:
-                keycode = keycode.decode('latin1')
+        self._dispatch(keys)
+        return len(keys)
 
-            # Updates the _KeyPressEventListener
-            self.Listener.notify(self, keycode)
+
+    def setdispatcher(self, dispatcher):
+        """
+        Runs the subscribers of every listener of this handler (Listener, BatchListener and PasteListener) on a thread
+        pool, so that slow subscribers do not delay reading keys. See EventSystem.EventDispatcher
+
+        Args:
+            dispatcher: An EventDispatcher, or None to run subscribers on the thread reading keys.
+        """
+        EventHandler.setdispatcher(self, dispatcher)
+        self.BatchListener.Dispatcher = dispatcher
+        self.PasteListener.Dispatcher = dispatcher
+
+
+    def _dispatch(self, keys):
+        """
+        Notifies the keys read at once to both listeners, merging repeated keys if Coalesce is set.
+        Pasted text is notified to PasteListener, between the keys pressed before and after it.
+
+        Args:
+            keys: A list of (key, key2) tuples, or (None, data) for pasted text.
+        """
+
+        if not keys:
+            return
+        for i in range(0, len(keys)):
+            if keys[i][0] is None:
+                self._dispatch(keys[0:i])
+                self._dispatchpaste(keys[i][1])
+                self._dispatch(keys[i + 1:])
+                return
+
+        if self.Coalesce:
+            keys = coalescekeys(keys)
+        else:
+            keys = [(key, key2, 1) for key, key2 in keys]
+
+        if len(self.BatchListener) > 0:
+            self.BatchListener.notify(self, keys)
+        if len(self.Listener) > 0:
+            for key, key2, repeat in keys:
+                self.Listener.notify(self, key, key2, repeat)
+
+
+    def _dispatchpaste(self, data: bytes):
+        """
+        Notifies pasted text to PasteListener, or, without paste subscribers, as plain key presses.
+        """
+
+        if len(self.PasteListener) == 0:
+            self._dispatch([(data[i:i + 1], KeyCodes.Null) for i in range(0, len(data))])
+            return
+        # Shells send line breaks as carriage returns.
+        text = data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+        self.PasteListener.notify(self, text)
 
 
     class __UnixKeyPress:
         """
+        Reads keys from a POSIX shell. The shell's input stays in raw mode from the first read until close() is
+        called, and each read drains every available byte with a single os.read() call.
         Credits:
             http://code.activestate.com/recipes/134892/
         """
 
-        def __init__(self):
+        # Maximum number of bytes drained by one read
+        ReadSize = 65536
+
+        def __init__(self, parser):
             try:
-                import tty, sys
+                import termios, tty
             except ImportError as e:
                 WriteShell("An error occurred while importing module '", e.name,
                            "' for KeyPressEventHandler initialization. Does this system lack the required module?",
                            sep='', stderr=True, Color='error', flush=True)
 
+            self.Parser = parser
+            # Decoded keys not returned yet by __call__()
+            self.__keys = collections.deque()
+            self.__fd = None
+            # Shell attributes to restore on close(), or None if the input is not a tty
+            self.__ttyattributes = None
 
-        def __call__(self):
-            try:
-                import sys, tty, termios
-                stdin_file  = sys.stdin.fileno()
-                tty_attr = termios.tcgetattr(stdin_file)
-
-                tty.setraw(sys.stdin.fileno())
-                ch = sys.stdin.read(1)
-            except ImportError as impE:
-                WriteShell("An error occurred while importing module '", impE.name,
-                           "' when calling KeyPressEventHandler. Does this system lack the required modules?",
-                           sep='', stderr=True, Color='error', flush=True)
-            finally:
-                termios.tesetattr(stdin_file, termios.TCSADRAIN, tty_attr)
 
-            return ch
+        def __call__(self):
+            while not self.__keys:
+                self.__keys.extend(self.read())
+            return self.__keys.popleft()
+
+
+        def close(self):
+            if self.__ttyattributes is not None:
+                import termios
+                termios.tcsetattr(self.__fd, termios.TCSADRAIN, self.__ttyattributes)
+                self.__ttyattributes = None
+                # Registered by open(): reopening registers it again.
+                atexit.unregister(self.close)
+            self.__fd = None
+
+
+        def open(self):
+            if self.__fd is not None:
+                return
+            import termios, tty
+            self.__fd = sys.stdin.fileno()
+            if os.isatty(self.__fd):
+                self.__ttyattributes = termios.tcgetattr(self.__fd)
+                tty.setraw(self.__fd, termios.TCSADRAIN)
+                # Keep output processing, so that '\n' still returns the cursor to the start of the line.
+                attributes = termios.tcgetattr(self.__fd)
+                attributes[1] |= termios.OPOST
+                termios.tcsetattr(self.__fd, termios.TCSADRAIN, attributes)
+                atexit.register(self.close)
+
+
+        def read(self, timeout=None):
+            """
+            Returns:
+                the list of (key, key2) tuples decoded from the bytes available within 'timeout' seconds
+            """
+
+            self.open()
+            if self.__keys:
+                keys = list(self.__keys)
+                self.__keys.clear()
+                return keys
+
+            # An incomplete escape sequence is completed by the next bytes, or flushed once its timeout elapsed.
+            remaining = self.Parser.remaining()
+            if remaining is not None and (timeout is None or remaining < timeout):
+                timeout = remaining
+
+            if select.select([self.__fd], [], [], timeout)[0]:
+                data = os.read(self.__fd, self.ReadSize)
+                if not data:
+                    raise EOFError("The shell's input was closed.")
+                return self.Parser.feed(data)
+            return self.Parser.flush()
 
 
 
@@ -184,6 +483,22 @@ class KeyPressEventHandler(EventHandler):
                            "' when calling KeyPressEventHandler. Does this system lack the required module?",
                            sep='', stderr=True, Color='error', flush=True)
 
+        def available(self):
+            import msvcrt
+            return msvcrt.kbhit()
+
+        def wait(self, timeout=None):
+            """
+            Returns:
+                whether a key press is available within 'timeout' seconds (None waits indefinitely)
+            """
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self.available():
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.005)
+            return True
+
 
 
 class KeyCodes:
@@ -201,6 +516,7 @@ class KeyCodes:
     Enter = b'\n'               # Ctrl + Enter/Return or Ctrl + J
     Return = b'\r'              # Enter/Return or Ctrl + M
     Tab = b'\t'                 # Tab or Ctrl + I
+    ShiftTab = b'\x0f'          # Second key code of Shift + Tab, after Null
 
     CtrlZ = b'\x1a'             # Undo
     CtrlX = b'\x18'             # Cut
@@ -354,7 +670,8 @@ class KeyCodes:
                              (FunctionPrefix, Q) : 'PageDown',
                              (FunctionPrefix, G) : 'Home',
                              (FunctionPrefix, O) : 'End',
-                             (Null, CtrlC) : 'Ctrl+2'}
+                             (Null, CtrlC) : 'Ctrl+2',
+                             (Null, ShiftTab) : 'Shift+Tab'}
 
     @staticmethod
     def tostring(key1: bytes, key2: bytes=b'\x00'):
@@ -377,6 +694,375 @@ class KeyCodes:
 
 
 
+#========================Escape sequences========================
+
+class EscapeSequenceParser:
+    """
+    Incremental decoder for the bytes read from a POSIX shell's input.
+    The ANSI escape sequences sent for function keys (CSI: 'ESC [', SS3: 'ESC O') are decoded into the key codes
+    returned by Windows shells (see KeyCodes.CombinationCharacters); any other byte is a key of its own.
+    Bytes can be fed in chunks of any size: a sequence split between two reads is completed by the next one.
+    Text pasted in bracketed paste mode ('ESC [ 200 ~' ... 'ESC [ 201 ~') is decoded as a single (None, data) tuple.
+    """
+
+    # Parser states
+    Ground = 0
+    Escape = 1
+    CSI = 2
+    SS3 = 3
+    Paste = 4
+
+    # Markers surrounding pasted text, when the shell is in bracketed paste mode
+    PasteStart = b'200'
+    PasteEnd = b'\x1b[201~'
+
+    # Longest sequence parameters kept while waiting for a final byte. Longer sequences are discarded.
+    MaxSequenceLength = 32
+
+    # Keys by final byte of CSI sequences (modifier parameters, e.g. 'ESC [ 1 ; 5 A', are ignored)
+    CSIKeys = {ord('A'): (KeyCodes.FunctionPrefix, KeyCodes.H),      # ArrowUp
+               ord('B'): (KeyCodes.FunctionPrefix, KeyCodes.P),      # ArrowDown
+               ord('C'): (KeyCodes.FunctionPrefix, KeyCodes.M),      # ArrowRight
+               ord('D'): (KeyCodes.FunctionPrefix, KeyCodes.K),      # ArrowLeft
+               ord('H'): (KeyCodes.FunctionPrefix, KeyCodes.G),      # Home
+               ord('F'): (KeyCodes.FunctionPrefix, KeyCodes.O),      # End
+               ord('Z'): (KeyCodes.Null, KeyCodes.ShiftTab)}         # Shift+Tab
+
+    # Keys by first parameter of CSI sequences ending with '~'
+    CSITildeKeys = {b'1': (KeyCodes.FunctionPrefix, KeyCodes.G),     # Home
+                    b'2': (KeyCodes.FunctionPrefix, KeyCodes.R),     # Insert
+                    b'3': (KeyCodes.FunctionPrefix, KeyCodes.S),     # Del
+                    b'4': (KeyCodes.FunctionPrefix, KeyCodes.O),     # End
+                    b'5': (KeyCodes.FunctionPrefix, KeyCodes.I),     # PageUp
+                    b'6': (KeyCodes.FunctionPrefix, KeyCodes.Q),     # PageDown
+                    b'7': (KeyCodes.FunctionPrefix, KeyCodes.G),     # Home (rxvt)
+                    b'8': (KeyCodes.FunctionPrefix, KeyCodes.O),     # End (rxvt)
+                    b'11': (KeyCodes.Null, KeyCodes.Semicolon),      # F1
+                    b'12': (KeyCodes.Null, KeyCodes.LeftAngleBracket),
+                    b'13': (KeyCodes.Null, KeyCodes.Equal),
+                    b'14': (KeyCodes.Null, KeyCodes.RightAngleBracket),
+                    b'15': (KeyCodes.Null, KeyCodes.QuestionMark),   # F5
+                    b'17': (KeyCodes.Null, KeyCodes.CommercialAt),
+                    b'18': (KeyCodes.Null, KeyCodes.A),
+                    b'19': (KeyCodes.Null, KeyCodes.B),
+                    b'20': (KeyCodes.Null, KeyCodes.C),
+                    b'21': (KeyCodes.Null, KeyCodes.D),              # F10
+                    b'23': (KeyCodes.FunctionPrefix, b'\x85'),       # F11
+                    b'24': (KeyCodes.FunctionPrefix, b'\x86')}       # F12
+
+    # Keys by final byte of SS3 sequences
+    SS3Keys = {ord('A'): (KeyCodes.FunctionPrefix, KeyCodes.H),
+               ord('B'): (KeyCodes.FunctionPrefix, KeyCodes.P),
+               ord('C'): (KeyCodes.FunctionPrefix, KeyCodes.M),
+               ord('D'): (KeyCodes.FunctionPrefix, KeyCodes.K),
+               ord('H'): (KeyCodes.FunctionPrefix, KeyCodes.G),
+               ord('F'): (KeyCodes.FunctionPrefix, KeyCodes.O),
+               ord('P'): (KeyCodes.Null, KeyCodes.Semicolon),        # F1
+               ord('Q'): (KeyCodes.Null, KeyCodes.LeftAngleBracket),
+               ord('R'): (KeyCodes.Null, KeyCodes.Equal),
+               ord('S'): (KeyCodes.Null, KeyCodes.RightAngleBracket)}
+
+    def __init__(self, timeout: float=0.05, clock=time.monotonic):
+        """
+        Args:
+            timeout: The time, in seconds, to wait for the rest of an escape sequence. Once elapsed, a lone 'ESC' byte
+                is decoded as the 'Esc' key.
+            clock: A function returning the current time, in seconds.
+        """
+
+        self.Timeout = timeout
+        self.__clock = clock
+
+        self.__state = EscapeSequenceParser.Ground
+        # Parameter bytes of the current CSI sequence
+        self.__sequence = bytearray()
+        # Time the last byte of the current incomplete sequence was fed
+        self.__since = 0.0
+        # Text received since the start of a bracketed paste
+        self.__paste = bytearray()
+
+
+    @property
+    def pending(self):
+        """
+        Returns:
+            whether an incomplete escape sequence is waiting for more bytes
+        """
+        return self.__state != EscapeSequenceParser.Ground
+
+
+    def feed(self, data: bytes):
+        """
+        Decodes bytes read from the shell's input.
+
+        Returns:
+            a list of (key, key2) tuples, key2 being KeyCodes.Null unless the key is a combination key,
+            or (None, data) for pasted text
+        """
+
+        keys = []
+        i = 0
+        while i < len(data):
+            state = self.__state
+
+            if state == EscapeSequenceParser.Paste:
+                # Pasted bytes are copied as a whole, up to the end marker, which may be split between two reads.
+                searchfrom = max(len(self.__paste) - len(EscapeSequenceParser.PasteEnd) + 1, 0)
+                self.__paste += data[i:] if i > 0 else data
+                end = self.__paste.find(EscapeSequenceParser.PasteEnd, searchfrom)
+                if end < 0:
+                    break
+                rest = bytes(self.__paste[end + len(EscapeSequenceParser.PasteEnd):])
+                keys.append((None, bytes(self.__paste[0:end])))
+                self.__paste = bytearray()
+                self.__state = EscapeSequenceParser.Ground
+                # The bytes following the paste are decoded from the start.
+                data = rest
+                i = 0
+                continue
+
+            if state == EscapeSequenceParser.Ground:
+                # Plain bytes are sliced up to the next 'ESC' byte, without going through the state machine.
+                end = data.find(b'\x1b', i)
+                if end < 0:
+                    end = len(data)
+                keys.extend([(data[j:j + 1], KeyCodes.Null) for j in range(i, end)])
+                if end < len(data):
+                    self.__state = EscapeSequenceParser.Escape
+                i = end + 1
+                continue
+
+            byte = data[i]
+            i += 1
+            if state == EscapeSequenceParser.Escape:
+                if byte == 0x5B:        # '['
+                    self.__state = EscapeSequenceParser.CSI
+                    self.__sequence = bytearray()
+                elif byte == 0x4F:      # 'O'
+                    self.__state = EscapeSequenceParser.SS3
+                else:
+                    # 'Esc' followed by another key (e.g. Alt+key): the byte is decoded again as a plain byte.
+                    keys.append((KeyCodes.Escape, KeyCodes.Null))
+                    self.__state = EscapeSequenceParser.Ground
+                    i -= 1
+            elif state == EscapeSequenceParser.SS3:
+                if byte in EscapeSequenceParser.SS3Keys:
+                    keys.append(EscapeSequenceParser.SS3Keys[byte])
+                self.__state = EscapeSequenceParser.Ground
+            elif 0x40 <= byte <= 0x7E:
+                # Final byte of a CSI sequence
+                if byte == 0x7E and self.__sequence == EscapeSequenceParser.PasteStart:
+                    self.__state = EscapeSequenceParser.Paste
+                    self.__paste = bytearray()
+                    continue
+                key = self._decodecsi(bytes(self.__sequence), byte)
+                if key is not None:
+                    keys.append(key)
+                self.__state = EscapeSequenceParser.Ground
+            elif len(self.__sequence) < EscapeSequenceParser.MaxSequenceLength:
+                self.__sequence.append(byte)
+            else:
+                # Malformed or unsupported sequence: discarded
+                self.__state = EscapeSequenceParser.Ground
+
+        if self.pending:
+            self.__since = self.__clock()
+        return keys
+
+
+    def flush(self, force: bool=False):
+        """
+        Gives up on an incomplete escape sequence once the timeout elapsed since its last byte.
+        Its bytes are decoded as the 'Esc' key followed by plain keys.
+        An unterminated paste is only given up when forced, and is returned as pasted text.
+
+        Args:
+            force: Whether to give up without waiting for the timeout.
+
+        Returns:
+            a list of (key, key2) tuples, empty if no sequence was given up
+        """
+
+        if not self.pending or (not force and self.__clock() - self.__since < self.Timeout):
+            return []
+        if self.__state == EscapeSequenceParser.Paste:
+            if not force:
+                return []
+            paste = bytes(self.__paste)
+            self.__paste = bytearray()
+            self.__state = EscapeSequenceParser.Ground
+            return [(None, paste)]
+
+        if self.__state == EscapeSequenceParser.CSI:
+            rest = b'[' + bytes(self.__sequence)
+        elif self.__state == EscapeSequenceParser.SS3:
+            rest = b'O'
+        else:
+            rest = b''
+        self.__state = EscapeSequenceParser.Ground
+        return [(KeyCodes.Escape, KeyCodes.Null)] + [(rest[j:j + 1], KeyCodes.Null) for j in range(0, len(rest))]
+
+
+    def remaining(self):
+        """
+        Returns:
+            the time, in seconds, before an incomplete escape sequence can be flushed, or None if there is none
+            (pasted text waits for its end marker)
+        """
+        if not self.pending or self.__state == EscapeSequenceParser.Paste:
+            return None
+        return max(self.Timeout - (self.__clock() - self.__since), 0.0)
+
+
+    def _decodecsi(self, parameters: bytes, final: int):
+        """
+        Returns:
+            the (key, key2) tuple of a complete CSI sequence, or None if the sequence is not a known key
+        """
+        if final == 0x7E:       # '~'
+            return EscapeSequenceParser.CSITildeKeys.get(parameters.split(b';')[0])
+        return EscapeSequenceParser.CSIKeys.get(final)
+
+
+
+#========================Key bindings========================
+
+class KeyBindings:
+    """
+    Key bindings, stored in a prefix trie of (key, key2) tuples.
+    A binding is a chord of one or more key presses; matching a key press against every binding takes a single trie
+    step, so that resolving a chord takes time proportional to its length, whatever the number of bindings.
+    A chord that is a prefix of a longer chord shadows it: the shorter chord completes first.
+    """
+
+    # Results of match()
+    NoMatch = 0
+    Partial = 1
+    Complete = 2
+
+    def __init__(self):
+        # Trie nodes are dicts of {(key, key2): child node}. The action bound to a node is stored under the key None.
+        self.__root = {}
+        # Node reached by the keys pressed so far in the current chord
+        self.__node = self.__root
+        # Keys pressed so far in the current chord
+        self.__pending = []
+
+
+    @property
+    def pending(self):
+        """
+        Returns:
+            a tuple of the (key, key2) tuples pressed so far in an incomplete chord
+        """
+        return tuple(self.__pending)
+
+
+    def bind(self, chord, action):
+        """
+        Binds an action to a chord, replacing any action already bound to it.
+
+        Args:
+            chord: A key code, a (key, key2) tuple, or a list of them for a multi-key chord.
+            action: A function delegate, called as action(sender, args: KeyPressEventArgs) by the key router.
+        """
+
+        node = self.__root
+        for keycodes in KeyBindings.__normalize(chord):
+            node = node.setdefault(keycodes, {})
+        node[None] = action
+
+
+    def lookup(self, chord):
+        """
+        Returns:
+            the action bound to 'chord', or None if there is none
+        """
+
+        node = self.__root
+        for keycodes in KeyBindings.__normalize(chord):
+            node = node.get(keycodes)
+            if node is None:
+                return None
+        return node.get(None)
+
+
+    def match(self, key, key2=b'\x00'):
+        """
+        Advances the current chord with a key press.
+        If the key press cannot continue the current chord, the chord is abandoned and the key press is matched as the
+        first key of a new chord.
+
+        Returns:
+            a (result, action) tuple:
+                (KeyBindings.Complete, action) if the key press completes a chord,
+                (KeyBindings.Partial, None) if it is part of an incomplete chord,
+                (KeyBindings.NoMatch, None) if it starts no chord
+        """
+
+        keycodes = (key, key2)
+        node = self.__node.get(keycodes)
+        if node is None and self.__node is not self.__root:
+            self.reset()
+            node = self.__root.get(keycodes)
+        if node is None:
+            return (KeyBindings.NoMatch, None)
+
+        if None in node:
+            self.reset()
+            return (KeyBindings.Complete, node[None])
+        self.__node = node
+        self.__pending.append(keycodes)
+        return (KeyBindings.Partial, None)
+
+
+    def reset(self):
+        """
+        Abandons the current chord.
+        """
+        self.__node = self.__root
+        self.__pending = []
+
+
+    def unbind(self, chord):
+        """
+        Removes the action bound to a chord, and the trie nodes left without any binding.
+        Does nothing if no action is bound to 'chord'.
+        """
+
+        path = [self.__root]
+        keys = KeyBindings.__normalize(chord)
+        for keycodes in keys:
+            node = path[-1].get(keycodes)
+            if node is None:
+                return
+            path.append(node)
+        if None not in path[-1]:
+            return
+
+        del path[-1][None]
+        for i in range(len(keys), 0, -1):
+            if path[i]:
+                break
+            del path[i - 1][keys[i - 1]]
+        self.reset()
+
+
+    @staticmethod
+    def __normalize(chord):
+        """
+        Returns:
+            the list of (key, key2) tuples of a chord
+        """
+
+        if isinstance(chord, bytes):
+            return [(chord, KeyCodes.Null)]
+        if isinstance(chord, tuple) and len(chord) == 2 and all(isinstance(keycode, bytes) for keycode in chord):
+            return [chord]
+        return [(keycodes, KeyCodes.Null) if isinstance(keycodes, bytes) else tuple(keycodes) for keycodes in chord]
+
+
+
 #========================Version History========================
 
 # 1.0
@@ -406,4 +1092,99 @@ class KeyCodes:
             -CombinationCharacters dictionary for special keyboard functions that cannot be represented as a single
              Unicode character
             -static tostring(key1: bytes, key2: bytes)
-"""
\ No newline at end of file
+"""
+
+# 1.1
+"""
+    Buffered POSIX key reader
+
+    Additions
+    ---------
+        -class EscapeSequenceParser: incremental decoder of CSI/SS3 escape sequences into KeyCodes combination keys,
+         with a timeout for lone 'Esc' key presses
+        -KeyPressEventHandler.Parser
+        -KeyPressEventHandler.readkeys(timeout=None): notifies every key available after a single read
+        -KeyPressEventHandler.open(), close(), fileno(), flush()
+
+    Changes
+    -------
+        -On POSIX shells, the input stays in raw mode until KeyPressEventHandler.close(), instead of switching modes
+         for every key, and every read drains the available bytes with one os.read() call
+        -KeyPressEventHandler.feed() decodes escape sequences
+
+    Bug Fixes
+    ---------
+        -Reading a key on POSIX shells failed on the 'termios.tesetattr' typo, and returned str instead of bytes
+        -Arrow and function keys were returned as several unrelated keys on POSIX shells
+        -Every open() registered close() to run at exit again; close() now unregisters it
+"""
+
+# 1.2
+"""
+    Batched key press events
+
+    Additions
+    ---------
+        -class KeyPressBatchEventArgs implements EventArgs: the KeyPressEventArgs of every key read at once
+        -class KeyPressBatchEventListener implements EventListener
+        -KeyPressEventHandler.BatchListener: notified once per read by readkeys(), feed() and flush()
+        -KeyPressEventHandler.Coalesce: merges consecutive presses of the same navigation or function key into one
+         event
+        -KeyPressEventArgs.Repeat: the number of presses merged into the event
+        -coalescekeys(keys)
+"""
+
+# 1.3
+"""
+    Bracketed paste
+
+    Additions
+    ---------
+        -KeyPressEventHandler.BracketedPaste: switches POSIX shells to bracketed paste mode on open()
+        -KeyPressEventHandler.PasteListener: notified once per paste with the whole text (see EventSystem/Paste.py)
+        -EscapeSequenceParser decodes bracketed pastes as a single (None, data) tuple
+
+    Bug Fixes
+    ---------
+        -readkey() notified pastes as key presses with Key=None, and raised KeyError when 'decode' was set; pastes are
+         now notified as readkeys() does
+"""
+
+# 1.4
+"""
+    Additions
+    ---------
+        -KeyPressEventArgs.update(key, key2, repeat), used when KeyPressEventListener reuses its args
+         (see EventListener.ReuseArgs)
+
+    Changes
+    -------
+        -KeyPressEventListener and KeyPressBatchEventListener do not build their args without subscribers
+"""
+
+# 1.5
+"""
+    Key routing
+
+    Additions
+    ---------
+        -class KeyBindings: prefix trie of key chords, matched one key press at a time
+            -bind(self, chord, action), unbind(self, chord), lookup(self, chord)
+            -match(self, key, key2), reset(self), pending
+        -KeyPressEventArgs.Handled: stops a key press routed by ShellGUI's GUI from bubbling up
+"""
+
+# 1.6
+"""
+    Additions
+    ---------
+        -KeyCodes.ShiftTab and the 'Shift+Tab' combination key, decoded from 'ESC [ Z' on POSIX shells
+"""
+
+# 1.7
+"""
+    Additions
+    ---------
+        -KeyPressEventHandler.setdispatcher(dispatcher): runs the subscribers of every listener of the handler on an
+         EventSystem.EventDispatcher thread pool
+"""
@@ -0,0 +1,116 @@
+"""
+.NET-style event system in Python
+The aim of this module is to create an event system using only Python's base installation (e.g. no Anaconda, PyPy, etc.)
+"""
+
+if __name__ == "__main__":
+    # MAJOR +1 represents an added function.
+    __MAJOR = 1
+    # MINOR +1 represents a change in existing function(s) within the current MAJOR.
+    __MINOR = 2
+
+    __info = """This file contains the module 'Paste', used to integrate text pasted into the shell (bracketed paste).
+To use this module in another project, include this file inside the project's directory."""
+
+    print("========================================================")
+    print("Paste.py version ", __MAJOR, ".", __MINOR, sep='', end='\n\n')
+    print(__info)
+    print("========================================================\n")
+    input("Press enter to continue...")
+
+
+
+#========================Imports========================
+
+from lib.EventSystem import *
+
+
+
+#========================Common Functions========================
+
+# no function
+
+
+
+#========================PasteEvent classes: PasteEventArgs, PasteEventListener, PasteEventHandler========================
+
+class PasteEventArgs(EventArgs):
+
+    def __init__(self, text: str, **kwargs):
+        EventArgs.__init__(self, **kwargs)
+        self.update(text)
+
+
+    def update(self, text: str):
+        """
+        Replaces the text of these args, when they are reused by PasteEventListener (see EventListener.ReuseArgs).
+        """
+
+        # The whole pasted text, with line breaks normalized to '\n'
+        self.Text = text
+        # Set by a subscriber to stop a routed paste from bubbling up to the component's parents
+        self.Handled = False
+
+
+
+class PasteEventListener(EventListener):
+
+    def __init__(self, *subscribers):
+        EventListener.__init__(self, *subscribers)
+
+
+    def notify(self, sender, text: str):
+        """
+        Notifies all subscribers about text pasted into the shell, in a single event.
+
+        Args:
+            sender:
+            text: The pasted text.
+        """
+
+        if len(self) == 0:
+            return
+        EventListener.notify(self, sender, self._args(PasteEventArgs, text))
+
+
+
+class PasteEventHandler(EventHandler):
+
+    def __init__(self, *subscribers):
+
+        EventHandler.__init__(self, PasteEventListener(*subscribers))
+
+
+
+#========================Version History========================
+
+# 1.0
+"""
+    Initial Release
+    Event system for receiving text pasted into the shell as a whole, rather than one key press per character.
+    Raised by KeyPress.KeyPressEventHandler when bracketed paste is enabled.
+
+    Additions
+    ---------
+        -class PasteEventArgs implements EventArgs
+            -__init__(self, text: str, **kwargs)
+        -class PasteEventListener implements EventListener
+            -__init__(self, *subscribers)
+            -notify(self, sender, text: str)
+        -class PasteEventHandler implements EventHandler
+            -__init__(self, *subscribers)
+"""
+
+# 1.1
+"""
+    Additions
+    ---------
+        -PasteEventArgs.Handled: stops a paste routed by ShellGUI's GUI from bubbling up
+"""
+
+# 1.2
+"""
+    Additions
+    ---------
+        -PasteEventArgs.update(self, text: str), used when PasteEventListener reuses its args
+"""
@@ -0,0 +1,106 @@
+"""
+.NET-style event system in Python
+The aim of this module is to create an event system using only Python's base installation (e.g. no Anaconda, PyPy, etc.)
+"""
+
+if __name__ == "__main__":
+    # MAJOR +1 represents an added function.
+    __MAJOR = 1
+    # MINOR +1 represents a change in existing function(s) within the current MAJOR.
+    __MINOR = 1
+
+    __info = """This file contains the module 'PostFrame', used to integrate events raised after a ShellGUI canvas has drawn a frame.
+To use this module in another project, include this file inside the project's directory."""
+
+    print("========================================================")
+    print("PostFrame.py version ", __MAJOR, ".", __MINOR, sep='', end='\n\n')
+    print(__info)
+    print("========================================================\n")
+    input("Press enter to continue...")
+
+
+
+#========================Imports========================
+
+from lib.EventSystem import *
+
+
+
+#========================Common Functions========================
+
+# no function
+
+
+
+#========================PostFrameEvent classes: PostFrameEventArgs, PostFrameEventListener, PostFrameEventHandler========================
+
+class PostFrameEventArgs(EventArgs):
+
+    def __init__(self, stats=None, **kwargs):
+        EventArgs.__init__(self, **kwargs)
+        self.update(stats)
+
+
+    def update(self, stats=None):
+        """
+        Replaces the values of these args, when they are reused by PostFrameEventListener (see EventListener.ReuseArgs).
+        """
+
+        # The canvas's RenderStats (see ShellGUI_Core.py)
+        self.Stats = stats
+
+
+
+class PostFrameEventListener(EventListener):
+
+    def __init__(self, *subscribers):
+        EventListener.__init__(self, *subscribers)
+
+
+    def notify(self, sender, stats=None):
+        """
+        Notifies all subscribers about a frame that has been drawn.
+
+        Args:
+            sender: The canvas drawing the frame.
+            stats: The canvas's RenderStats.
+        """
+
+        if len(self) == 0:
+            return
+        EventListener.notify(self, sender, self._args(PostFrameEventArgs, stats))
+
+
+
+class PostFrameEventHandler(EventHandler):
+
+    def __init__(self, *subscribers):
+
+        EventHandler.__init__(self, PostFrameEventListener(*subscribers))
+
+
+
+#========================Version History========================
+
+# 1.0
+"""
+    Initial Release
+    Event system for instrumenting ShellGUI canvases, raised after a ShellGUI canvas has drawn a frame.
+
+    Additions
+    ---------
+        -class PostFrameEventArgs implements EventArgs
+            -__init__(self, stats=None, **kwargs)
+        -class PostFrameEventListener implements EventListener
+            -__init__(self, *subscribers)
+            -notify(self, sender, stats=None)
+        -class PostFrameEventHandler implements EventHandler
+            -__init__(self, *subscribers)
+"""
+
+# 1.1
+"""
+    Additions
+    ---------
+        -PostFrameEventArgs.update(self, stats=None), used when PostFrameEventListener reuses its args
+"""
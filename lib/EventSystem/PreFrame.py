@@ -0,0 +1,106 @@
+"""
+.NET-style event system in Python
+The aim of this module is to create an event system using only Python's base installation (e.g. no Anaconda, PyPy, etc.)
+"""
+
+if __name__ == "__main__":
+    # MAJOR +1 represents an added function.
+    __MAJOR = 1
+    # MINOR +1 represents a change in existing function(s) within the current MAJOR.
+    __MINOR = 1
+
+    __info = """This file contains the module 'PreFrame', used to integrate events raised before a ShellGUI canvas draws a frame.
+To use this module in another project, include this file inside the project's directory."""
+
+    print("========================================================")
+    print("PreFrame.py version ", __MAJOR, ".", __MINOR, sep='', end='\n\n')
+    print(__info)
+    print("========================================================\n")
+    input("Press enter to continue...")
+
+
+
+#========================Imports========================
+
+from lib.EventSystem import *
+
+
+
+#========================Common Functions========================
+
+# no function
+
+
+
+#========================PreFrameEvent classes: PreFrameEventArgs, PreFrameEventListener, PreFrameEventHandler========================
+
+class PreFrameEventArgs(EventArgs):
+
+    def __init__(self, stats=None, **kwargs):
+        EventArgs.__init__(self, **kwargs)
+        self.update(stats)
+
+
+    def update(self, stats=None):
+        """
+        Replaces the values of these args, when they are reused by PreFrameEventListener (see EventListener.ReuseArgs).
+        """
+
+        # The canvas's RenderStats (see ShellGUI_Core.py)
+        self.Stats = stats
+
+
+
+class PreFrameEventListener(EventListener):
+
+    def __init__(self, *subscribers):
+        EventListener.__init__(self, *subscribers)
+
+
+    def notify(self, sender, stats=None):
+        """
+        Notifies all subscribers about a frame about to be drawn.
+
+        Args:
+            sender: The canvas drawing the frame.
+            stats: The canvas's RenderStats.
+        """
+
+        if len(self) == 0:
+            return
+        EventListener.notify(self, sender, self._args(PreFrameEventArgs, stats))
+
+
+
+class PreFrameEventHandler(EventHandler):
+
+    def __init__(self, *subscribers):
+
+        EventHandler.__init__(self, PreFrameEventListener(*subscribers))
+
+
+
+#========================Version History========================
+
+# 1.0
+"""
+    Initial Release
+    Event system for instrumenting ShellGUI canvases, raised before a ShellGUI canvas draws a frame.
+
+    Additions
+    ---------
+        -class PreFrameEventArgs implements EventArgs
+            -__init__(self, stats=None, **kwargs)
+        -class PreFrameEventListener implements EventListener
+            -__init__(self, *subscribers)
+            -notify(self, sender, stats=None)
+        -class PreFrameEventHandler implements EventHandler
+            -__init__(self, *subscribers)
+"""
+
+# 1.1
+"""
+    Additions
+    ---------
+        -PreFrameEventArgs.update(self, stats=None), used when PreFrameEventListener reuses its args
+"""
@@ -0,0 +1,685 @@
+"""
+Cell-grid frame buffer used by ShellGUI's rendering engine.
+A frame is stored as flat, preallocated arrays of code points and style ids instead of strings,
+so that components can be blitted in place without rebuilding every line of the frame.
+"""
+
+if __name__ == "__main__":
+    # MAJOR +1 represents an added function.
+    __MAJOR = 1
+    # MINOR +1 represents a change in existing function(s) within the current MAJOR.
+    __MINOR = 4
+
+    __info = """This file contains the module 'FrameBuffer', used by ShellGUI_Core to compose frames.
+To use this module in another project, include this file inside the project's directory."""
+
+    print("========================================================")
+    print("FrameBuffer.py version ", __MAJOR, ".", __MINOR, sep='', end='\n\n')
+    print(__info)
+    print("========================================================\n")
+    input("Press enter to continue...")
+
+
+
+#========================Imports========================
+
+# Used by: FrameBuffer
+from array import array
+# Used by: FrameBuffer (byte order of the code point arrays)
+import sys
+
+# Used by: styledrow(), tostyledstring(); blit() (compositing)
+from lib.Color import Style, compositeStyles, isTranslucent
+
+# Used by: NumpyFrameBuffer. Optional: createframebuffer() falls back to FrameBuffer without NumPy.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+#========================Constants========================
+
+# Array typecode holding one unsigned 32-bit code point per cell.
+CELLTYPE = 'I' if array('I').itemsize == 4 else 'L'
+# Array typecode holding one style id per cell.
+STYLETYPE = 'H'
+# Codec converting between strings and the raw bytes of a CELLTYPE array.
+CELLCODEC = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+
+#========================Common Functions========================
+
+def tocells(text: str):
+    """
+    Converts a string into an array of code points, without going through a list of characters.
+
+    Args:
+        text: The string to convert.
+
+    Returns:
+        An array of code points (of typecode CELLTYPE), one per character of 'text'.
+    """
+
+    cells = array(CELLTYPE)
+    cells.frombytes(text.encode(CELLCODEC))
+    return cells
+
+
+def fromcells(cells):
+    """
+    Converts an array of code points back into a string.
+
+    Args:
+        cells: An array of code points of typecode CELLTYPE.
+
+    Returns:
+        The string spelled by 'cells'.
+    """
+
+    return cells.tobytes().decode(CELLCODEC)
+
+
+
+#========================FrameBuffer class========================
+
+class FrameBuffer:
+    """
+    A rectangular grid of character cells.
+    Cell (x, y) is stored at index y * Width + x of both the 'Cells' and 'Styles' arrays.
+    The arrays are allocated once and overwritten in place by clear(), fillrect() and blit().
+    """
+
+    def __init__(self, width: int, height: int, fill: str=" ", style: int=0):
+        self.Fill = str(fill)
+        self.Style = int(style)
+        self.resize(width, height)
+
+
+    def __repr__(self):
+        return self.tostring()
+
+
+    def resize(self, width: int, height: int):
+        """
+        (Re)allocates the buffer for the given dimensions. Every cell is reset to the blank cell.
+
+        Args:
+            width: The width of the buffer, in characters.
+            height: The height of the buffer, in characters.
+        """
+
+        self.Width = max(int(width), 0)
+        self.Height = max(int(height), 0)
+
+        size = self.Width * self.Height
+        # Blank templates used to reset the buffer with a single memory copy.
+        self.__blankcells = array(CELLTYPE, [ord(self.Fill)]) * size
+        self.__blankstyles = array(STYLETYPE, [self.Style]) * size
+
+        self.Cells = array(CELLTYPE, self.__blankcells)
+        self.Styles = array(STYLETYPE, self.__blankstyles)
+
+
+    def clear(self):
+        """
+        Resets every cell of the buffer to the blank cell.
+        """
+
+        self.Cells[:] = self.__blankcells
+        self.Styles[:] = self.__blankstyles
+
+
+    def clip(self, x: int, y: int, width: int, height: int):
+        """
+        Intersects a rectangle with the buffer area.
+
+        Args:
+            x, y: The top-left corner of the rectangle.
+            width, height: The dimensions of the rectangle.
+
+        Returns:
+            The clipped rectangle as a (x, y, width, height) tuple, or None if it lies outside of the buffer.
+        """
+
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + width, self.Width)
+        y1 = min(y + height, self.Height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+
+    def fillrect(self, x: int, y: int, width: int, height: int, fill: str=None, style: int=None):
+        """
+        Fills a rectangular region with a single character and style.
+
+        Args:
+            x, y: The top-left corner of the region.
+            width, height: The dimensions of the region.
+            fill: The character to fill with. Defaults to the buffer's blank character.
+            style: The style id to fill with. Defaults to the buffer's blank style.
+        """
+
+        rect = self.clip(x, y, width, height)
+        if rect is None:
+            return
+        x, y, width, height = rect
+
+        rowcells = array(CELLTYPE, [ord(self.Fill if fill is None else fill)]) * width
+        rowstyles = array(STYLETYPE, [self.Style if style is None else style]) * width
+        for row in range(y, y + height):
+            start = row * self.Width + x
+            self.Cells[start : start + width] = rowcells
+            self.Styles[start : start + width] = rowstyles
+
+
+    def blit(self, lines, x: int, y: int, style: int=0, clip=None, transparent: bool=False):
+        """
+        Copies lines of text into the buffer, with their top-left corner at (x, y).
+        Only the cells covered by each line are overwritten; whatever lies to the right of a line is kept.
+
+        Args:
+            lines: A list of strings, one per row.
+            x, y: The position of the first character of the first line inside the buffer.
+            style: The style id given to every written cell.
+            clip: An optional (x, y, width, height) rectangle outside of which nothing is written.
+            transparent: Whether blank (space) characters let the cells underneath show through.
+                If 'style' has translucent colors (see Color.isTranslucent()), or with 'transparent', the style of
+                every covered cell is composited over the style underneath (see Color.compositeStyles()).
+        """
+
+        if clip is None:
+            cx0, cy0, cx1, cy1 = 0, 0, self.Width, self.Height
+        else:
+            cx0 = max(clip[0], 0)
+            cy0 = max(clip[1], 0)
+            cx1 = min(clip[0] + clip[2], self.Width)
+            cy1 = min(clip[1] + clip[3], self.Height)
+
+        first = max(cy0 - y, 0)
+        last = min(cy1 - y, len(lines))
+        if transparent or isTranslucent(Style.fromId(style)):
+            self.__composite(lines, x, y, style, (cx0, cy0, cx1, cy1), first, last, transparent)
+            return
+        # Style ids of a full clipped row; each line copies the part it needs.
+        stylerow = array(STYLETYPE, [style]) * max(cx1 - cx0, 0)
+
+        for lineindex in range(first, last):
+            line = lines[lineindex]
+            # Horizontal clipping of the line, in line coordinates.
+            start = max(cx0 - x, 0)
+            end = min(cx1 - x, len(line))
+            if start >= end:
+                continue
+
+            offset = (y + lineindex) * self.Width + x
+            self.Cells[offset + start : offset + end] = tocells(line[start:end])
+            self.Styles[offset + start : offset + end] = stylerow[0 : end - start]
+
+
+    def __composite(self, lines, x: int, y: int, style: int, bounds, first: int, last: int, transparent: bool):
+        """
+        blit() for transparent cells and translucent styles: every covered cell gets the style composited over the
+        cell's current style, and transparent blank cells keep their character.
+
+        Args:
+            bounds: The clipping rectangle, as (x0, y0, x1, y1).
+            first, last: The range of lines inside the clipping rectangle.
+        """
+
+        cx0, cy0, cx1, cy1 = bounds
+        cells = self.Cells
+        styles = self.Styles
+        blank = ord(" ")
+        # Composited style ids, by (style id underneath, see-through)
+        composited = {}
+
+        for lineindex in range(first, last):
+            line = lines[lineindex]
+            start = max(cx0 - x, 0)
+            end = min(cx1 - x, len(line))
+            if start >= end:
+                continue
+
+            offset = (y + lineindex) * self.Width + x
+            linecells = tocells(line[start:end])
+            for i in range(0, end - start):
+                index = offset + start + i
+                seethrough = transparent and linecells[i] == blank
+                key = (styles[index], seethrough)
+                if key not in composited:
+                    composited[key] = compositeStyles(key[0], style, seethrough)
+                styles[index] = composited[key]
+                if not seethrough:
+                    cells[index] = linecells[i]
+
+
+    def row(self, y: int, x: int=0, width: int=-1):
+        """
+        Reads a row (or part of a row) of the buffer.
+
+        Args:
+            y: The index of the row.
+            x: The column to start reading from.
+            width: The number of characters to read. -1 reads until the end of the row.
+
+        Returns:
+            The characters of the row, in string.
+        """
+
+        start = y * self.Width + x
+        end = y * self.Width + (self.Width if width < 0 else min(x + width, self.Width))
+        return fromcells(self.Cells[start : end])
+
+
+    def lines(self):
+        """
+        Returns:
+            A list with every row of the buffer, in string.
+        """
+
+        return [self.row(y) for y in range(0, self.Height)]
+
+
+    def tostring(self):
+        """
+        Returns:
+            The whole buffer as a single string, rows separated by newline characters.
+        """
+
+        return "\n".join(self.lines())
+
+
+    def styleruns(self, y: int, x: int=0, width: int=-1):
+        """
+        Run-length encodes the style ids of a row (or part of a row).
+
+        Args:
+            y: The index of the row.
+            x: The column to start reading from.
+            width: The number of cells to read. -1 reads until the end of the row.
+
+        Returns:
+            A list of (start, end, style id) tuples, in buffer columns, one per run of cells sharing a style.
+        """
+
+        start = y * self.Width + x
+        end = y * self.Width + (self.Width if width < 0 else min(x + width, self.Width))
+        styles = self.Styles[start : end]
+        if not styles:
+            return []
+        current = styles[0]
+        # Single-style rows, the most common ones, are detected without a Python loop.
+        if styles.count(current) == len(styles):
+            return [(x, x + len(styles), current)]
+
+        runs = []
+        runstart = 0
+        for i in range(1, len(styles)):
+            if styles[i] != current:
+                runs.append((x + runstart, x + i, current))
+                runstart = i
+                current = styles[i]
+        runs.append((x + runstart, x + len(styles), current))
+        return runs
+
+
+    def styledrow(self, y: int, x: int=0, width: int=-1, current: int=0, depth: int=None):
+        """
+        Reads a row (or part of a row) of the buffer, with an SGR escape wherever the style changes.
+
+        Args:
+            y, x, width: The cells to read. See row()
+            current: The style id the shell is currently using: no escape is written until the style differs.
+            depth: The color depth of the shell (one of Color.ColorDepths). Default: detected for sys.stdout
+
+        Returns:
+            A (text, style id) tuple: the characters and escapes of the row, and the style id in use after them.
+        """
+
+        out = []
+        text = self.row(y, x, width)
+        for start, end, styleid in self.styleruns(y, x, width):
+            if styleid != current:
+                out.append(Style.fromId(styleid).sgr(depth))
+                current = styleid
+            out.append(text[start - x : end - x])
+        return ("".join(out), current)
+
+
+    def stylerows(self):
+        """
+        Returns:
+            A list with the style ids of every row of the buffer, as sequences comparable with '=='.
+        """
+
+        return [self.Styles[y * self.Width : (y + 1) * self.Width] for y in range(0, self.Height)]
+
+
+    def isstyled(self):
+        """
+        Returns:
+            Whether any cell of the buffer uses a style other than Style.Default
+        """
+
+        return self.Styles.count(0) != len(self.Styles)
+
+
+    def tostyledstring(self, depth: int=None):
+        """
+        Returns:
+            The whole buffer as a single string, with SGR escapes where the style changes, ending with the default
+            style. See styledrow()
+        """
+
+        if not self.isstyled():
+            return self.tostring()
+        out = []
+        current = 0
+        for y in range(0, self.Height):
+            text, current = self.styledrow(y, current=current, depth=depth)
+            out.append(text)
+        return "\n".join(out) + ("" if current == 0 else Style.Default.sgr(depth))
+
+
+
+#========================NumpyFrameBuffer class========================
+
+class NumpyFrameBuffer:
+    """
+    A FrameBuffer backed by two-dimensional NumPy arrays of code points and style ids, indexed [y, x].
+    Blits, fills and clipping are slice assignments instead of Python loops.
+    Requires NumPy. Use createframebuffer() to fall back to FrameBuffer when NumPy is not installed.
+    """
+
+    def __init__(self, width: int, height: int, fill: str=" ", style: int=0):
+        if numpy is None:
+            raise ImportError("NumpyFrameBuffer requires module 'numpy'.", name='numpy')
+
+        self.Fill = str(fill)
+        self.Style = int(style)
+        self.resize(width, height)
+
+
+    def __repr__(self):
+        return self.tostring()
+
+
+    def resize(self, width: int, height: int):
+        """
+        (Re)allocates the buffer for the given dimensions. Every cell is reset to the blank cell.
+        """
+
+        self.Width = max(int(width), 0)
+        self.Height = max(int(height), 0)
+        shape = (self.Height, self.Width)
+
+        self.Cells = numpy.full(shape, ord(self.Fill), dtype=numpy.uint32)
+        self.Styles = numpy.full(shape, self.Style, dtype=numpy.uint16)
+
+
+    def clear(self):
+        """
+        Resets every cell of the buffer to the blank cell.
+        """
+
+        self.Cells.fill(ord(self.Fill))
+        self.Styles.fill(self.Style)
+
+
+    def clip(self, x: int, y: int, width: int, height: int):
+        """
+        Intersects a rectangle with the buffer area. See FrameBuffer.clip()
+        """
+        return FrameBuffer.clip(self, x, y, width, height)
+
+
+    def fillrect(self, x: int, y: int, width: int, height: int, fill: str=None, style: int=None):
+        """
+        Fills a rectangular region with a single character and style. See FrameBuffer.fillrect()
+        """
+
+        rect = self.clip(x, y, width, height)
+        if rect is None:
+            return
+        x, y, width, height = rect
+        region = (slice(y, y + height), slice(x, x + width))
+
+        self.Cells[region] = ord(self.Fill if fill is None else fill)
+        self.Styles[region] = self.Style if style is None else style
+
+
+    def blit(self, lines, x: int, y: int, style: int=0, clip=None, transparent: bool=False):
+        """
+        Copies lines of text into the buffer, with their top-left corner at (x, y). See FrameBuffer.blit()
+        The lines are converted into a single two-dimensional block, written with one masked slice assignment.
+        Composited styles are computed once per distinct style underneath, then scattered with one indexing pass.
+        """
+
+        if clip is None:
+            cx0, cy0, cx1, cy1 = 0, 0, self.Width, self.Height
+        else:
+            cx0 = max(clip[0], 0)
+            cy0 = max(clip[1], 0)
+            cx1 = min(clip[0] + clip[2], self.Width)
+            cy1 = min(clip[1] + clip[3], self.Height)
+        if not lines:
+            return
+
+        # Area covered by the lines, clipped
+        x0 = max(x, cx0)
+        y0 = max(y, cy0)
+        x1 = min(x + max([len(line) for line in lines]), cx1)
+        y1 = min(y + len(lines), cy1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        width = x1 - x0
+        height = y1 - y0
+
+        # Lines are padded to a rectangle; the mask leaves the cells past the end of each line untouched.
+        rows = [line[x0 - x : x1 - x] for line in lines[y0 - y : y1 - y]]
+        text = "".join([row.ljust(width) for row in rows])
+        block = numpy.frombuffer(text.encode(CELLCODEC), dtype=numpy.uint32).reshape((height, width))
+        mask = numpy.arange(width) < numpy.array([len(row) for row in rows])[:, None]
+        region = (slice(y0, y1), slice(x0, x1))
+
+        if transparent or isTranslucent(Style.fromId(style)):
+            seethrough = (block == ord(" ")) if transparent else numpy.zeros(block.shape, dtype=bool)
+            styles = self.Styles[region]
+            for flag, cellmask in ((False, mask & ~seethrough), (True, mask & seethrough)):
+                if not cellmask.any():
+                    continue
+                under, inverse = numpy.unique(styles[cellmask], return_inverse=True)
+                ids = numpy.array([compositeStyles(int(underid), style, flag) for underid in under], dtype=numpy.uint16)
+                styles[cellmask] = ids[inverse.reshape(-1)]
+            mask &= ~seethrough
+        else:
+            self.Styles[region][mask] = style
+
+        numpy.copyto(self.Cells[region], block, where=mask)
+
+
+    def row(self, y: int, x: int=0, width: int=-1):
+        """
+        Reads a row (or part of a row) of the buffer. See FrameBuffer.row()
+        """
+
+        end = self.Width if width < 0 else min(x + width, self.Width)
+        return self.Cells[y, x : end].tobytes().decode(CELLCODEC)
+
+
+    def lines(self):
+        """
+        Returns:
+            A list with every row of the buffer, in string.
+        """
+
+        text = self.Cells.tobytes().decode(CELLCODEC)
+        return [text[y * self.Width : (y + 1) * self.Width] for y in range(0, self.Height)]
+
+
+    def tostring(self):
+        """
+        Returns:
+            The whole buffer as a single string, rows separated by newline characters.
+        """
+
+        return "\n".join(self.lines())
+
+
+    def styleruns(self, y: int, x: int=0, width: int=-1):
+        """
+        Run-length encodes the style ids of a row (or part of a row). See FrameBuffer.styleruns()
+        """
+
+        end = self.Width if width < 0 else min(x + width, self.Width)
+        styles = self.Styles[y, x : end]
+        if len(styles) == 0:
+            return []
+        changes = (numpy.flatnonzero(styles[1:] != styles[:-1]) + 1).tolist()
+        starts = [0] + changes
+        ends = changes + [len(styles)]
+        ids = styles[starts].tolist()
+        return [(x + starts[i], x + ends[i], ids[i]) for i in range(0, len(starts))]
+
+
+    def styledrow(self, y: int, x: int=0, width: int=-1, current: int=0, depth: int=None):
+        """
+        Reads a row (or part of a row) of the buffer, with an SGR escape wherever the style changes.
+        See FrameBuffer.styledrow()
+        """
+        return FrameBuffer.styledrow(self, y, x, width, current, depth)
+
+
+    def stylerows(self):
+        """
+        Returns:
+            A list with the style ids of every row of the buffer, as lists.
+        """
+        return self.Styles.tolist()
+
+
+    def isstyled(self):
+        """
+        Returns:
+            Whether any cell of the buffer uses a style other than Style.Default
+        """
+        return bool(self.Styles.any())
+
+
+    def tostyledstring(self, depth: int=None):
+        """
+        Returns:
+            The whole buffer as a single string, with SGR escapes where the style changes. See FrameBuffer.tostyledstring()
+        """
+        return FrameBuffer.tostyledstring(self, depth)
+
+
+
+#========================Backends========================
+
+class FrameBufferBackends:
+    """
+    An 'enum' containing the frame buffer implementations a Canvas can compose its frames with.
+    """
+
+    # FrameBuffer: flat arrays of the 'array' module, no dependency
+    Python = "python"
+
+    # NumpyFrameBuffer: vectorized NumPy arrays, for large canvases
+    NumPy = "numpy"
+
+
+def createframebuffer(width: int, height: int, backend=FrameBufferBackends.Python):
+    """
+    Creates a frame buffer with the requested backend.
+    Falls back to the pure-Python FrameBuffer if the backend is not available on this system.
+
+    Args:
+        width, height: The dimensions of the buffer, in characters.
+        backend: One of FrameBufferBackends.
+
+    Returns:
+        a FrameBuffer or a NumpyFrameBuffer
+    """
+
+    if backend == FrameBufferBackends.NumPy and numpy is not None:
+        return NumpyFrameBuffer(width, height)
+    return FrameBuffer(width, height)
+
+
+
+#========================Version History========================
+
+# 1.0
+"""
+    Initial Release
+    Cell-grid frame buffer replacing the string-splicing composition of Canvas.draw().
+
+    Additions
+    ---------
+        -tocells(text: str), fromcells(cells)
+        -class FrameBuffer
+            -__init__(self, width: int, height: int, fill: str=" ", style: int=0)
+            -resize(self, width: int, height: int)
+            -clear(self)
+            -clip(self, x: int, y: int, width: int, height: int)
+            -fillrect(self, x: int, y: int, width: int, height: int, fill: str=None, style: int=None)
+            -blit(self, lines, x: int, y: int, style: int=0, clip=None)
+            -row(self, y: int, x: int=0, width: int=-1)
+            -lines(self)
+            -tostring(self)
+"""
+
+# 1.1
+"""
+    Optional NumPy backend
+
+    Additions
+    ---------
+        -class NumpyFrameBuffer, with the interface of FrameBuffer
+            -Foreground, Background and Attributes arrays alongside Cells and Styles
+            -blit() writes every line of a component with one masked slice assignment
+        -class FrameBufferBackends
+        -createframebuffer(width: int, height: int, backend=FrameBufferBackends.Python)
+"""
+
+# 1.2
+"""
+    Styled output
+
+    Additions
+    ---------
+        -styleruns(self, y: int, x: int=0, width: int=-1): run-length encoded style ids of a row
+        -styledrow(self, y: int, x: int=0, width: int=-1, current: int=0, depth: int=None): a row with an SGR escape
+         only where the style changes (see Color.Style)
+        -stylerows(self), isstyled(self), tostyledstring(self, depth: int=None)
+"""
+
+# 1.3
+"""
+    Alpha compositing
+
+    Changes
+    -------
+        -blit() 'transparent' parameter: blank characters let the cells underneath show through
+        -blit() composites translucent styles over the styles underneath (see Color.compositeStyles()); NumpyFrameBuffer
+         composites each distinct style underneath once, then scatters the results in one vectorized pass
+"""
+
+# 1.4
+"""
+    Changes
+    -------
+        -NumpyFrameBuffer no longer allocates Foreground, Background and Attributes arrays, which nothing read: cell
+         colors and attributes are carried by style ids (see Color.Style)
+        -NumPy is imported with try/except ImportError instead of Utils.ModuleAvailability()
+
+    Bug Fixes
+    ---------
+        -NumpyFrameBuffer.blit() skipped the null characters of the lines it copied, which FrameBuffer.blit() writes
+"""
@@ -25,15 +25,26 @@ To use this module in another project, include this file inside the project's di
 
 #========================Imports========================
 
+# Used by: GUI.runasync()
+import asyncio
+import os
+import sys
+# Used by: RenderStats
+from collections import deque
 # Used by: Canvas.draw()
 import time
 
 from lib.Utils import *
-from lib.Color import Color
+from lib.Color import Color, Style, detectColorDepth
+from lib.FrameBuffer import FrameBuffer, FrameBufferBackends, createframebuffer
+from lib.SpatialIndex import GridIndex, ZOrder
 
 from lib.EventSystem.FocusLost import FocusLostEventListener
 from lib.EventSystem.KeyPress import *
 from lib.EventSystem.OnFocus import OnFocusEventListener
+from lib.EventSystem.Paste import PasteEventArgs, PasteEventListener
+from lib.EventSystem.PostFrame import PostFrameEventListener
+from lib.EventSystem.PreFrame import PreFrameEventListener
 
 
 
@@ -69,6 +80,32 @@ class BorderTypes:
     BlockUnderline = ("", "", "", "", "", "", "▀", "")
 
 
+# Top and bottom border edges, by (border type, width). See borderedges()
+_borderedges = {}
+
+
+def borderedges(bordertype, width: int):
+    """
+    Returns the top and bottom edges of a border, corners included. Edges are built once per border type and width.
+
+    Args:
+        bordertype: One of BorderTypes.
+        width: The width of the bordered content, in characters.
+
+    Returns:
+        a (top, bottom) tuple of strings. An edge is an empty string if the border type has no such edge.
+    """
+
+    key = (bordertype, width)
+    if key not in _borderedges:
+        if len(_borderedges) >= 1024:
+            # Bounds the cache for components of ever-changing widths
+            _borderedges.clear()
+        _borderedges[key] = (bordertype[0] + bordertype[1] * width + bordertype[2],
+                             bordertype[5] + bordertype[6] * width + bordertype[7])
+    return _borderedges[key]
+
+
 def addborder(value: str, bordertype=BorderTypes.ThinBorder):
     """
     Adds a four-sided ASCII border around a component.
@@ -84,30 +121,89 @@ def addborder(value: str, bordertype=BorderTypes.ThinBorder):
     if value == "":
         value = " "
     buffer: list = str(value).splitlines(False)
-    width: int = len(LongestFromList(buffer))
+    width: int = max([len(line) for line in buffer])
 
-    # Insert side borders
-    for lineindex in range(0, len(buffer)):
-        linelength = len(buffer[lineindex])
-        if linelength < width:
-            # The line is not long enough. Add spaces after the line
-            buffer[lineindex] = buffer[lineindex] + " "*(width-linelength)
+    # Insert side borders, padding lines that are not long enough with spaces
+    left = bordertype[3]
+    right = bordertype[4]
+    buffer = [left + line.ljust(width) + right for line in buffer]
 
-        buffer[lineindex] = bordertype[3] + buffer[lineindex] + bordertype[4]
+    # Insert top-and-bottom borders with corner pieces, omitting empty horizontal borders
+    top, bottom = borderedges(bordertype, width)
+    if top:
+        buffer.insert(0, top)
+    if bottom:
+        buffer.append(bottom)
 
-    # Insert top-and-bottom borders with corner pieces
-    buffer = [bordertype[0] + bordertype[1] * width + bordertype[2]] + \
-        buffer + \
-        [bordertype[5] + bordertype[6] * width + bordertype[7]]
+    return "\n".join(buffer)
 
-    # Delete empty horizontal borders
-    if buffer[0] == "":
-        del buffer[0]
-    if buffer[-1] == "":
-        del buffer[-1]
 
+def borderinsets(bordertype=BorderTypes.ThinBorder):
+    """
+    Determines how much room a border takes around the content it surrounds.
 
-    return "\n".join(buffer)
+    Args:
+        bordertype: The border drawn around the content.
+
+    Returns:
+        A (left, top, right, bottom) tuple with the number of columns or rows taken by each side of the border.
+    """
+
+    return (len(bordertype[3]),
+            1 if bordertype[0] + bordertype[1] + bordertype[2] else 0,
+            len(bordertype[4]),
+            1 if bordertype[5] + bordertype[6] + bordertype[7] else 0)
+
+
+def cliprect(rect1, rect2):
+    """
+    Intersects two (x, y, width, height) rectangles.
+
+    Returns:
+        The intersection, or None if the rectangles do not overlap.
+    """
+
+    x0 = max(rect1[0], rect2[0])
+    y0 = max(rect1[1], rect2[1])
+    x1 = min(rect1[0] + rect1[2], rect2[0] + rect2[2])
+    y1 = min(rect1[1] + rect1[3], rect2[1] + rect2[3])
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def drawborder(framebuffer, x: int, y: int, width: int, height: int, bordertype=BorderTypes.ThinBorder, style: int=0):
+    """
+    Draws a border straight into a frame buffer, without building the bordered string. See addborder()
+
+    Args:
+        framebuffer: The FrameBuffer to draw into.
+        x, y: The top-left corner of the border.
+        width, height: The dimensions of the bordered content, borders excluded.
+        bordertype: One of BorderTypes.
+        style: The style id given to the border cells.
+    """
+
+    left, top, right, bottom = borderinsets(bordertype)
+    topedge, bottomedge = borderedges(bordertype, width)
+
+    if topedge:
+        framebuffer.blit([topedge], x, y, style)
+    if bordertype[3]:
+        framebuffer.fillrect(x, y + top, 1, height, bordertype[3], style)
+    if bordertype[4]:
+        framebuffer.fillrect(x + left + width, y + top, 1, height, bordertype[4], style)
+    if bottomedge:
+        framebuffer.blit([bottomedge], x, y + top + height, style)
+
+
+def rectsoverlap(rect1, rect2):
+    """
+    Checks whether two (x, y, width, height) rectangles share at least one cell.
+    """
+
+    return rect1[0] < rect2[0] + rect2[2] and rect2[0] < rect1[0] + rect1[2] and \
+        rect1[1] < rect2[1] + rect2[3] and rect2[1] < rect1[1] + rect1[3]
 
 
 
@@ -125,12 +221,125 @@ class SystemColors:
 
 #========================Canvas class========================
 
+class OutputModes:
+    """
+    An 'enum' containing the ways a Canvas can write its frames to the shell.
+    """
+
+    # Every frame is written in full, followed by a newline.
+    Full = "full"
+
+    # The first frame is written in full at the canvas's Origin; later frames only rewrite damaged regions,
+    # using ANSI cursor-positioning escapes. Requires a shell with ANSI support.
+    Incremental = "incremental"
+
+    # Every frame is composed in full, then compared cell by cell with the previously written frame; only the changed
+    # runs are written, using ANSI cursor-positioning escapes. See Utils.FrameDiffWriter
+    Diff = "diff"
+
+
+class RenderStats:
+    """
+    Measurements of the frames drawn by a Canvas. Per-frame values describe the last frame drawn; times are in seconds.
+    """
+
+    def __init__(self, window: int=0):
+        # Time spent in draw(), excluding the 'delay' parameter
+        self.FrameTime = 0.0
+        # Time spent laying out and writing components into the frame buffer, value() calls included
+        self.ComposeTime = 0.0
+        # Time spent drawing the canvas border. Only spent when the canvas is resized or its border changed.
+        self.BorderTime = 0.0
+        # Time spent writing the frame to the shell
+        self.OutputTime = 0.0
+        # Time spent rendering each component that changed since the previous frame, by z-pos
+        self.ValueTimes = {}
+        self.BytesEmitted = 0
+        # Number of components written into the frame buffer, and of components skipped because they were hidden,
+        # out of the canvas area, or outside of every damaged region
+        self.ComponentsDrawn = 0
+        self.ComponentsCulled = 0
+
+        # Totals since the creation of these statistics
+        self.Frames = 0
+        self.TotalBytes = 0
+
+        # Rolling window of the last frame times, or None if disabled
+        self.FrameTimes = None
+        self.setwindow(window)
+
+
+    def asdict(self):
+        """
+        Returns:
+            a dictionary of the last frame's measurements and of the totals, ready to be exported
+        """
+        return {"frame_time": self.FrameTime,
+                "compose_time": self.ComposeTime,
+                "border_time": self.BorderTime,
+                "output_time": self.OutputTime,
+                "value_time": sum(self.ValueTimes.values()),
+                "bytes_emitted": self.BytesEmitted,
+                "components_drawn": self.ComponentsDrawn,
+                "components_culled": self.ComponentsCulled,
+                "frames": self.Frames,
+                "total_bytes": self.TotalBytes}
+
+
+    def averageframetime(self):
+        """
+        Returns:
+            the mean of the frame times inside the rolling window, or 0.0 if the window is disabled or empty
+        """
+        if not self.FrameTimes:
+            return 0.0
+        return sum(self.FrameTimes) / len(self.FrameTimes)
+
+
+    def reset(self):
+        """
+        Clears the per-frame measurements, before a new frame is drawn.
+        """
+        self.FrameTime = 0.0
+        self.ComposeTime = 0.0
+        self.BorderTime = 0.0
+        self.OutputTime = 0.0
+        self.ValueTimes = {}
+        self.BytesEmitted = 0
+        self.ComponentsDrawn = 0
+        self.ComponentsCulled = 0
+
+
+    def setwindow(self, window: int):
+        """
+        Enables the rolling window of frame times, keeping the last 'window' frames, or disables it if 'window' is 0.
+        """
+        if window > 0:
+            self.FrameTimes = deque(self.FrameTimes or (), maxlen=int(window))
+        else:
+            self.FrameTimes = None
+
+
+    def _endframe(self, frametime: float):
+        """
+        Records the total time of the frame just drawn. Called by Canvas.draw().
+        """
+        self.FrameTime = frametime
+        self.Frames += 1
+        self.TotalBytes += self.BytesEmitted
+        if self.FrameTimes is not None:
+            self.FrameTimes.append(frametime)
+
+
 class Canvas:
 
-    def __init__(self, width: int, height: int, bordertype=BorderTypes.BlockBorder):
+    def __init__(self, width: int, height: int, bordertype=BorderTypes.BlockBorder, outputmode=OutputModes.Full,
+                 backend=FrameBufferBackends.Python):
 
         # Dictionary to store all component
         self.__elem = {}
+        # z-positions of __elem, sorted. Components are painted from the lowest z-pos up. See SpatialIndex.py
+        self.__zorder = ZOrder()
 
         # OPTIONS
         self.Width = int(width)
@@ -138,36 +347,303 @@ class Canvas:
 
         self.Border = bordertype
 
+        self.OutputMode = outputmode
+        # Shell position (column, row), 1-based, of the canvas's top-left corner when using positioned output.
+        self.Origin = (1, 1)
+        # Output backend for OutputModes.Diff, which also counts the bytes written per frame.
+        self.Writer = FrameDiffWriter()
+
+        # Color depth used for component styles (one of Color.ColorDepths). None detects the depth of sys.stdout.
+        self.ColorDepth = None
+
+        # INSTRUMENTATION
+        # Measurements of the last frame drawn. Use Stats.setwindow() to keep a rolling window of frame times.
+        self.Stats = RenderStats()
+        # Events raised at the start and at the end of draw(), with Stats as argument
+        self.PreFrame = PreFrameEventListener()
+        self.PostFrame = PostFrameEventListener()
+
+        # Cell grid in which frames are composed. See FrameBuffer.py
+        # FrameBufferBackends.NumPy falls back to FrameBufferBackends.Python if NumPy is not installed.
+        self.__framebuffer = createframebuffer(self.Width, self.Height, backend)
+        # (width, height, border) the frame buffer was laid out for
+        self.__bufferlayout = None
+
+        # Damage tracking, for OutputModes.Incremental:
+        # z-pos of each component, by component id
+        self.__zof = {}
+        # Area (x, y, width, height) each component covered in the last frame, by z-pos. See SpatialIndex.py
+        self.__rects = GridIndex()
+        # Components invalidated since the last frame, by component id
+        self.__dirty = {}
+        # Areas uncovered by removed or reordered components since the last frame
+        self.__damage = []
+        # Settings the last frame was drawn with. Any change forces a full redraw.
+        self.__framesettings = None
+        self.__fullredraw = True
+
 
     def add(self, component, z_pos: int=-1):
         # We must first check if 'component' passes a subclass of class 'Component'
         if not issubclass(type(component), Component):
             raise TypeError("Argument 'component' is not an implementation of class 'Component'.")
         if z_pos == -1:
-            self.__elem[len(self.__elem)] = component
-        else:
-            self.__elem[z_pos] = component
+            # Place the component above every other one
+            z_pos = 0 if self.__zorder.top() is None else self.__zorder.top() + 1
+        if z_pos in self.__elem.keys():
+            self.remove(z_pos)
+
+        self.__elem[z_pos] = component
+        self.__zorder.add(z_pos)
+        self.__zof[id(component)] = z_pos
+        component._canvas = self
+        self._invalidate(component)
 
 
     def setzpos(self, z_pos, new_z_pos):
-        if z_pos in self.__elem.keys():
-            self.__elem[new_z_pos] = self.__elem[z_pos]
+        if z_pos in self.__elem.keys() and z_pos != new_z_pos:
+            if new_z_pos in self.__elem.keys():
+                self.remove(new_z_pos)
+
+            component = self.__elem[z_pos]
+            self.__elem[new_z_pos] = component
             del self.__elem[z_pos]
+            self.__zorder.move(z_pos, new_z_pos)
+            self.__zof[id(component)] = new_z_pos
+
+            # The component now overlaps its neighbours differently: its area needs to be recomposed.
+            if z_pos in self.__rects:
+                rect = self.__rects.pop(z_pos)
+                self.__rects.insert(new_z_pos, rect)
+                self.__damage.append(rect)
+
+
+    def reorder(self, mapping: dict):
+        """
+        Changes the z-pos of many components at once, without removing and adding them back.
+
+        Args:
+            mapping: A dictionary of {current z-pos: new z-pos}. Components not in 'mapping' keep their z-pos.
+
+        Raises:
+            KeyError: A z-pos of 'mapping' holds no component.
+            ValueError: Two components would end up with the same z-pos.
+        """
+
+        for z_pos in mapping.keys():
+            if z_pos not in self.__elem.keys():
+                raise KeyError(z_pos)
+        targets = [mapping.get(z_pos, z_pos) for z_pos in self.__elem.keys()]
+        if len(set(targets)) != len(targets):
+            raise ValueError("Argument 'mapping' gives the same z-pos to more than one component.")
+
+        moved = {mapping[z_pos]: self.__elem.pop(z_pos) for z_pos in mapping.keys()}
+        rects = {z_pos: self.__rects.pop(z_pos) for z_pos in mapping.keys() if z_pos in self.__rects}
+        for new_z_pos, component in moved.items():
+            self.__elem[new_z_pos] = component
+            self.__zof[id(component)] = new_z_pos
+        for z_pos, rect in rects.items():
+            self.__rects.insert(mapping[z_pos], rect)
+            # The component now overlaps its neighbours differently: its area needs to be recomposed.
+            self.__damage.append(rect)
+
+        self.__zorder.renumber(mapping)
+
+
+    def bringforward(self, z_pos):
+        """
+        Swaps a component with the component directly above it.
+
+        Returns:
+            the new z-pos of the component
+        """
+        above = self.__zorder.above(z_pos)
+        if z_pos not in self.__elem.keys() or above is None:
+            return z_pos
+        self.reorder({z_pos: above, above: z_pos})
+        return above
+
+
+    def sendbackward(self, z_pos):
+        """
+        Swaps a component with the component directly below it.
+
+        Returns:
+            the new z-pos of the component
+        """
+        below = self.__zorder.below(z_pos)
+        if z_pos not in self.__elem.keys() or below is None:
+            return z_pos
+        self.reorder({z_pos: below, below: z_pos})
+        return below
+
+
+    def bringtofront(self, z_pos):
+        """
+        Moves a component above every other component.
+
+        Returns:
+            the new z-pos of the component
+        """
+        top = self.__zorder.top()
+        if z_pos not in self.__elem.keys() or z_pos == top:
+            return z_pos
+        self.setzpos(z_pos, top + 1)
+        return top + 1
+
+
+    def sendtoback(self, z_pos):
+        """
+        Moves a component below every other component.
+        Z-positions stay positive: if the bottom component is at z-pos 0, the components below 'z_pos' are shifted up
+        by one instead.
+
+        Returns:
+            the new z-pos of the component
+        """
+        bottom = self.__zorder.bottom()
+        if z_pos not in self.__elem.keys() or z_pos == bottom:
+            return z_pos
+        if bottom > 0:
+            self.setzpos(z_pos, bottom - 1)
+            return bottom - 1
+        mapping = {below: below + 1 for below in self.__zorder if below < z_pos}
+        mapping[z_pos] = bottom
+        self.reorder(mapping)
+        return bottom
+
+
+    def component(self, z_pos):
+        """
+        Returns:
+            the component at 'z_pos', or None if there is none
+        """
+        return self.__elem.get(z_pos)
+
+
+    def componentrect(self, component):
+        """
+        Returns:
+            the (x, y, width, height) area 'component' covered in the last frame drawn, excluding the canvas border,
+            or None if it was not drawn
+        """
+        z_pos = self.__zof.get(id(component))
+        return None if z_pos is None else self.__rects.get(z_pos)
+
+
+    def components(self):
+        """
+        Returns:
+            a list of (z-pos, component) tuples, from the lowest z-pos to the highest
+        """
+        return [(z_pos, self.__elem[z_pos]) for z_pos in self.__zorder]
+
+
+    def zpos(self, component):
+        """
+        Returns:
+            the z-pos of 'component', or None if it is not on this canvas
+        """
+        return self.__zof.get(id(component))
 
 
     def remove(self, z_pos: int):
         if z_pos in self.__elem.keys():
+            component = self.__elem[z_pos]
             del self.__elem[z_pos]
+            self.__zorder.remove(z_pos)
+            del self.__zof[id(component)]
+            self.__dirty.pop(id(component), None)
+            component._canvas = None
+
+            # Whatever was under the component needs to be recomposed.
+            if z_pos in self.__rects:
+                self.__damage.append(self.__rects.pop(z_pos))
+
+
+    @property
+    def dirty(self):
+        """
+        Whether anything changed on the canvas since the last frame was drawn.
+
+        Returns:
+            a boolean indicating whether the next call to draw() has anything to repaint
+        """
+        return self.__fullredraw or bool(self.__dirty) or bool(self.__damage)
+
+
+    def invalidate(self):
+        """
+        Forces the next call to draw() to repaint the whole canvas.
+        """
+        self.__fullredraw = True
+
+
+    def cachestats(self):
+        """
+        Sums the render cache counters of every component on this canvas.
+
+        Returns:
+            a (hits, misses) tuple
+        """
+        hits = 0
+        misses = 0
+        for comp in self.__elem.values():
+            hits += comp.CacheHits
+            misses += comp.CacheMisses
+        return (hits, misses)
+
+
+    def componentat(self, x: int, y: int):
+        """
+        Hit-tests the canvas, as of the last frame drawn.
+
+        Args:
+            x, y: A position on the canvas, excluding its border.
+
+        Returns:
+            the topmost component covering (x, y), or None if there is none
+        """
+        indexes = self.__rects.querypoint(x, y)
+        if not indexes:
+            return None
+        return self.__elem[max(indexes)]
+
+
+    def componentsin(self, x: int, y: int, width: int, height: int):
+        """
+        Looks up the components covering a region of the canvas, as of the last frame drawn.
+
+        Args:
+            x, y, width, height: The region of the canvas, excluding its border.
+
+        Returns:
+            a list of the components overlapping the region, from the lowest z-pos to the highest
+        """
+        return [self.__elem[index] for index in sorted(self.__rects.query((x, y, width, height)))]
+
+
+    def _invalidate(self, component):
+        """
+        Marks a component of this canvas as changed. Called by Component.invalidate().
+
+        Args:
+            component: the component whose appearance or location has changed
+        """
+        self.__dirty[id(component)] = component
 
 
     def draw(self, delay: float=0, hideoverflown: bool=False, color: str='default'):
         """
         Draws/renders the current canvas with its components.
+        With OutputModes.Incremental, only the regions covered by changed components before and after the change are
+        recomposed and rewritten.
 
         Args:
             delay: A float indicating the delay, in seconds, before rendering starts.
             hideoverflown: Boolean indicating whether to omit rendering any component that is partially out of bounds.
             color: The color of the canvas. WILL OVERRIDE ANY CUSTOM COMPONENT COLOR (if not set to 'default')!
+                Component styles (see Component.style) are only written with the 'default' color.
 
         """
 
@@ -178,89 +654,564 @@ class Canvas:
         if delay > 0:
             time.sleep(delay)
 
-        # This is the current ASCII frame to render.
-        frame = (" "*self.Width + "\n")*(self.Height-1) + (" "*self.Width)
-        # This buffer serves to write to individual lines
-        framebuffer = frame.split(sep="\n")
+        stats = self.Stats
+        stats.reset()
+        self.PreFrame.notify(self, stats)
+        framestart = time.perf_counter()
+
+        # The frame is composed, border included, inside a cell grid that is reused from one frame to the next.
+        framebuffer = self.__getframebuffer()
+        # Evicted composited styles may have had their ids reused: cells still holding them must be composited again.
+        framesettings = (self.Width, self.Height, self.Border, hideoverflown, color, Style.Evictions)
+        composestart = time.perf_counter()
+
+        if self.OutputMode == OutputModes.Full or self.__fullredraw or framesettings != self.__framesettings:
+            # Component areas only need to be determined again if the settings affecting them changed.
+            relayout = self.__framesettings is None or \
+                (self.Width, self.Height, hideoverflown) != (self.__framesettings[0], self.__framesettings[1], self.__framesettings[3])
+            self.__composeall(framebuffer, hideoverflown, relayout)
+            damage = None
+        else:
+            damage = self.__composedamage(framebuffer, hideoverflown)
+        if Style.Evictions != framesettings[-1]:
+            # Styles composited earlier in this frame were evicted while composing it.
+            self.__composeall(framebuffer, hideoverflown, False)
+            damage = None
+            framesettings = framesettings[:-1] + (Style.Evictions,)
+
+        self.__dirty.clear()
+        self.__damage = []
+        self.__fullredraw = False
+        self.__framesettings = framesettings
+
+        outputstart = time.perf_counter()
+        stats.ComposeTime = outputstart - composestart
+
+        # Styles are written with escapes only when the frame holds styled cells and no color overrides them.
+        styled = color == 'default' and framebuffer.isstyled()
+        if self.OutputMode == OutputModes.Full:
+            out = framebuffer.tostyledstring(self.__colordepth()) if styled else framebuffer.tostring()
+            stats.BytesEmitted = WriteShell(out, end="\n", Color=color)
+        elif self.OutputMode == OutputModes.Diff:
+            if damage is None:
+                # Settings such as the color may have changed: the whole frame is rewritten.
+                self.Writer.reset()
+            if styled:
+                stats.BytesEmitted = self.Writer.write(framebuffer.lines(), self.Origin, Color=color,
+                                                       styles=framebuffer.stylerows(), sgr=self.__sgr)
+            else:
+                stats.BytesEmitted = self.Writer.write(framebuffer.lines(), self.Origin, Color=color)
+        elif damage is None:
+            stats.BytesEmitted = self.__emitframe(framebuffer, color, styled)
+        elif damage:
+            stats.BytesEmitted = self.__emitdamage(framebuffer, damage, color, styled)
+
+        end = time.perf_counter()
+        stats.OutputTime = end - outputstart
+        stats._endframe(end - framestart)
+        self.PostFrame.notify(self, stats)
+
+
+    def __composeall(self, framebuffer, hideoverflown: bool, relayout: bool):
+        """
+        Clears the content area of 'framebuffer' and writes every visible component into it.
 
-        # Below for block writes individual component to 'framebuffer'
-        # We need to write components from the smallest z-pos to the largest, hence the usage of range()
-        for index in self.__elem.keys():
-            comp: Component = self.__elem[index]
+        Args:
+            relayout: Whether the area of every component needs to be determined again,
+                instead of only the area of components that changed.
+        """
+
+        left, top, right, bottom = borderinsets(self.Border)
+        framebuffer.fillrect(left, top, self.Width, self.Height)
+
+        if relayout:
+            self.__rects.clear()
+            pending = list(self.__elem.items())
+        else:
+            pending = [(self.__zof[key], comp) for key, comp in self.__dirty.items()]
+
+        valuetimes = self.Stats.ValueTimes
+        for index, comp in pending:
             # To write a component onto the frame, we need to separate each line and store the result in a list.
-            compbuffer: list = comp.value().split(sep="\n")
-
-            # Testing if the component overflows for optional parameter 'hideoverflown'
-            if hideoverflown:
-                if len(LongestFromList(compbuffer)) > (self.Width - comp.X):
-                    # Object overflows in the x-axis, discard.
-                    # Note: using Utils.py's LongestFromList() will rule out any inconsistent 'Component' class's value() implementation.
-                    continue
-                if len(compbuffer) > (self.Height - comp.Y):
-                    # Object overflows in the y-axis, discard.
-                    continue
-
-            # Testing if the current component is outside of canvas area:
-            if comp.X >= self.Width and comp.Y >= self.Height:
-                # Object entirely outside of canvas, discard.
-                continue
+            start = time.perf_counter()
+            compbuffer: list = comp.renderlines()
+            valuetimes[index] = time.perf_counter() - start
+            rect = self.__layout(comp, compbuffer, hideoverflown)
+            if rect is None:
+                self.__rects.remove(index)
+            else:
+                self.__rects.insert(index, rect)
+
+        # Below for block writes individual component to 'framebuffer', from the lowest z-pos up.
+        # Components entirely outside of the canvas area are culled by the spatial index.
+        content = (left, top, self.Width, self.Height)
+        visible = sorted(self.__rects.query((0, 0, self.Width, self.Height)))
+        for index in visible:
+            comp: Component = self.__elem[index]
+            # Drawing 'comp' inside 'framebuffer'. Lines are clipped to the content area by the frame buffer.
+            framebuffer.blit(comp.renderlines(), left + comp.X, top + comp.Y, comp._styleid, clip=content,
+                             transparent=comp._transparent)
+
+        self.Stats.ComponentsDrawn = len(visible)
+        self.Stats.ComponentsCulled = len(self.__elem) - len(visible)
+
+
+    def __composedamage(self, framebuffer, hideoverflown: bool):
+        """
+        Recomposes, inside 'framebuffer', the regions damaged since the last frame.
+
+        Returns:
+            A list of damaged (x, y, width, height) rectangles, clipped to the canvas area.
+        """
+
+        damage = self.__damage
+        valuetimes = self.Stats.ValueTimes
+
+        # A changed component damages both the area it covered before and the area it covers now.
+        for key, comp in self.__dirty.items():
+            index = self.__zof[key]
+            if index in self.__rects:
+                damage.append(self.__rects.pop(index))
+
+            start = time.perf_counter()
+            compbuffer: list = comp.renderlines()
+            valuetimes[index] = time.perf_counter() - start
+            rect = self.__layout(comp, compbuffer, hideoverflown)
+            if rect is not None:
+                self.__rects.insert(index, rect)
+                damage.append(rect)
+
+        canvasrect = (0, 0, self.Width, self.Height)
+        damage = [clipped for clipped in (cliprect(rect, canvasrect) for rect in damage) if clipped is not None]
+
+        left, top, right, bottom = borderinsets(self.Border)
+        repainted = set()
+        for rect in damage:
+            x, y, width, height = rect
+            framebuffer.fillrect(left + x, top + y, width, height)
+            # Repaint, clipped to the damaged rectangle, every component overlapping it, from the lowest z-pos up.
+            overlapping = sorted(self.__rects.query(rect))
+            for index in overlapping:
+                comp: Component = self.__elem[index]
+                framebuffer.blit(comp.renderlines(), left + comp.X, top + comp.Y, comp._styleid,
+                                 clip=(left + x, top + y, width, height), transparent=comp._transparent)
+            repainted.update(overlapping)
+
+        self.Stats.ComponentsDrawn = len(repainted)
+        self.Stats.ComponentsCulled = len(self.__elem) - len(repainted)
+        return damage
+
+
+    def __layout(self, comp, compbuffer: list, hideoverflown: bool):
+        """
+        Determines the area a component covers on the canvas.
+
+        Returns:
+            The component's (x, y, width, height) rectangle, or None if the component is not drawn.
+        """
+
+        width = len(LongestFromList(compbuffer))
+
+        # Testing if the component overflows for optional parameter 'hideoverflown'
+        if hideoverflown:
+            if width > (self.Width - comp.X):
+                # Object overflows in the x-axis, discard.
+                # Note: using Utils.py's LongestFromList() will rule out any inconsistent 'Component' class's value() implementation.
+                return None
+            if len(compbuffer) > (self.Height - comp.Y):
+                # Object overflows in the y-axis, discard.
+                return None
+
+        return (comp.X, comp.Y, width, len(compbuffer))
+
+
+    def __emitframe(self, framebuffer, color: str, styled: bool):
+        """
+        Writes the whole bordered frame at the canvas's Origin, one positioned row at a time.
+
+        Args:
+            styled: Whether to write the style escapes of the frame's cells.
+
+        Returns:
+            The number of bytes written.
+        """
+
+        column, row = self.Origin
+        if styled:
+            depth = self.__colordepth()
+            out = []
+            current = 0
+            for i in range(0, framebuffer.Height):
+                text, current = framebuffer.styledrow(i, current=current, depth=depth)
+                out.append(AnsiCursorPosition(row + i, column) + text)
+            if current != 0:
+                out.append(Style.Default.sgr(depth))
+            out = "".join(out)
+        else:
+            frame = framebuffer.lines()
+            out = "".join([AnsiCursorPosition(row + i, column) + frame[i] for i in range(0, len(frame))])
+        return WriteShell(out, end="", Color=color, flush=True)
+
+
+    def __emitdamage(self, framebuffer, damage: list, color: str, styled: bool):
+        """
+        Rewrites only the damaged regions of the frame. Overlapping regions are merged row by row.
+
+        Args:
+            styled: Whether to write the style escapes of the frame's cells.
+
+        Returns:
+            The number of bytes written.
+        """
+
+        # Damaged column intervals, by row
+        spans = {}
+        for x, y, width, height in damage:
+            for row in range(y, y + height):
+                spans.setdefault(row, []).append((x, x + width))
+
+        left, top, right, bottom = borderinsets(self.Border)
+        column, row = self.Origin
+        depth = self.__colordepth() if styled else None
+        current = 0
+        out = []
+        for y in sorted(spans.keys()):
+            intervals = sorted(spans[y])
+            start, end = intervals[0]
+            for nextstart, nextend in intervals[1:] + [(self.Width + 1, self.Width + 1)]:
+                if nextstart > end:
+                    out.append(AnsiCursorPosition(row + top + y, column + left + start))
+                    if styled:
+                        text, current = framebuffer.styledrow(top + y, left + start, end - start, current, depth)
+                        out.append(text)
+                    else:
+                        out.append(framebuffer.row(top + y, left + start, end - start))
+                    start, end = nextstart, nextend
+                else:
+                    end = max(end, nextend)
+        if current != 0:
+            out.append(Style.Default.sgr(depth))
+
+        return WriteShell("".join(out), end="", Color=color, flush=True)
+
+
+    def __colordepth(self):
+        """
+        Returns the color depth styles are written with: ColorDepth, or the depth detected for sys.stdout.
+        """
+        if self.ColorDepth is None:
+            self.ColorDepth = detectColorDepth(sys.stdout)
+        return self.ColorDepth
+
+
+    def __sgr(self, styleid: int):
+        """
+        Returns the escape sequence selecting a style id. Used by Writer.
+        """
+        return Style.fromId(styleid).sgr(self.__colordepth())
+
+
+    def __getframebuffer(self):
+        """
+        Returns the frame buffer of this canvas, reallocating it and drawing the border only if the canvas has been
+        resized or its border changed.
+        """
+
+        if (self.Width, self.Height, self.Border) != self.__bufferlayout:
+            left, top, right, bottom = borderinsets(self.Border)
+            self.__framebuffer.resize(left + self.Width + right, top + self.Height + bottom)
+            start = time.perf_counter()
+            drawborder(self.__framebuffer, 0, 0, self.Width, self.Height, self.Border)
+            self.Stats.BorderTime = time.perf_counter() - start
+            self.__bufferlayout = (self.Width, self.Height, self.Border)
+            self.__fullredraw = True
+        return self.__framebuffer
+
+
+
+
+# ========================Focus ring========================
+
+class FocusRing:
+    """
+    The focusable components of a GUI, in tab order, linked in a ring, with the component currently receiving focus.
+    Adding, removing and moving the focus to the next or previous component take constant time.
+    """
+
+    def __init__(self):
+        # Components by id, and the ids of their next and previous components in tab order
+        self.__components = {}
+        self.__next = {}
+        self.__previous = {}
+        # Id of the first component in tab order, or None if the ring is empty
+        self.__first = None
+        # Component currently receiving focus, or None
+        self.__current = None
+
+
+    def __contains__(self, component):
+        return id(component) in self.__components
+
+
+    def __iter__(self):
+        """
+        Iterates over the components in tab order.
+        """
+        key = self.__first
+        for i in range(0, len(self.__components)):
+            yield self.__components[key]
+            key = self.__next[key]
+
+
+    def __len__(self):
+        return len(self.__components)
+
+
+    @property
+    def current(self):
+        """
+        Returns:
+            the component currently receiving focus, or None
+        """
+        return self.__current
+
+
+    def add(self, component, after=None):
+        """
+        Inserts a component in tab order. Does nothing if the component is already in the ring.
+
+        Args:
+            component: The component to insert.
+            after: The component after which to insert 'component'. By default, 'component' comes last in tab order.
+        """
 
-            # Drawing 'comp' inside 'framebuffer'
-            for lineindex in range(0, len(compbuffer)):
-                if comp.Y + lineindex >= len(framebuffer) or comp.Y + lineindex < 0:
-                    # This line is out of bounds. Do not draw.
-                    continue
-                # Convert target 'framebuffer' line into a list of characters with list(str)
-                linebuffer: list = list(framebuffer[comp.Y + lineindex])
-                # Convert target 'compbuffer' line into a list of characters
-                complinebuffer: list = list(compbuffer[lineindex])
-                # This will replace the line with the current component's content without overflowing.
-                #linebuffer[comp.X :] = complinebuffer[0 : len(linebuffer)-comp.X]      - produces undesirable result
-                linebuffer[comp.X :] = complinebuffer
-                # Update the target 'framebuffer' line with the new one
-                framebuffer[comp.Y + lineindex]: str = "".join(linebuffer)
+        key = id(component)
+        if key in self.__components:
+            return
+        self.__components[key] = component
+        if self.__first is None:
+            self.__first = key
+            self.__next[key] = key
+            self.__previous[key] = key
+            return
+
+        previous = id(after) if after is not None and id(after) in self.__components else self.__previous[self.__first]
+        following = self.__next[previous]
+        self.__next[previous] = key
+        self.__previous[key] = previous
+        self.__next[key] = following
+        self.__previous[following] = key
+
+
+    def focus(self, component):
+        """
+        Moves the focus to a component of the ring, or removes the focus if 'component' is None.
+        Only the components losing and receiving focus are notified, once each.
+
+        Raises:
+            KeyError: 'component' is not in the ring.
+        """
+
+        if component is not None and id(component) not in self.__components:
+            raise KeyError(component)
+        if component is self.__current:
+            return
 
-            for i in range(0, len(framebuffer)):
-                # Adds space for lines that do not match canvas's width
-                if len(framebuffer[i]) < self.Width:
-                    framebuffer[i] += " " * (self.Width - len(framebuffer[i]))
-                # Cuts overflown lines that do not match canvas's width
-                if len(framebuffer[i]) > self.Width:
-                    framebuffer[i] = framebuffer[i][0:self.Width]
+        previous = self.__current
+        self.__current = component
+        if previous is not None:
+            previous.focused = False
+        if component is not None:
+            component.focused = True
 
-        # Reassemble from from framebuffer
-        frame = "\n".join(framebuffer)
 
-        # Adding borders to current frame string
-        frame = addborder(frame, self.Border)
+    def next(self):
+        """
+        Moves the focus to the next component in tab order, or to the first component if none has focus.
+
+        Returns:
+            the component receiving focus, or None if the ring is empty
+        """
+        if self.__first is None:
+            return None
+        key = self.__first if self.__current is None else self.__next[id(self.__current)]
+        self.focus(self.__components[key])
+        return self.__current
+
+
+    def previous(self):
+        """
+        Moves the focus to the previous component in tab order, or to the last component if none has focus.
+
+        Returns:
+            the component receiving focus, or None if the ring is empty
+        """
+        if self.__first is None:
+            return None
+        key = self.__previous[self.__first] if self.__current is None else self.__previous[id(self.__current)]
+        self.focus(self.__components[key])
+        return self.__current
+
 
-        WriteShell(frame, end="\n", Color=color)
+    def remove(self, component):
+        """
+        Removes a component from the ring. If it had focus, the focus moves to the next component in tab order.
+        Does nothing if the component is not in the ring.
+        """
 
-    def ColorPrinter(self, , delay: float=0, hideoverflown: bool=False, color: str='default'):
+        key = id(component)
+        if key not in self.__components:
+            return
+        if component is self.__current:
+            self.focus(None if len(self.__components) == 1 else self.__components[self.__next[key]])
 
+        previous = self.__previous.pop(key)
+        following = self.__next.pop(key)
+        del self.__components[key]
+        if not self.__components:
+            self.__first = None
+            return
+        self.__next[previous] = following
+        self.__previous[following] = previous
+        if self.__first == key:
+            self.__first = following
 
 
 
 # ========================GUI class========================
 
+class RenderScheduler:
+    """
+    Paces the frames of a canvas to a target frame rate.
+    Changes made to the canvas between two ticks are coalesced into a single frame, and ticks are skipped while the
+    canvas has nothing to repaint.
+    """
+
+    def __init__(self, canvas: Canvas, fps: float=30, clock=time.perf_counter, **drawoptions):
+        """
+        Args:
+            canvas: The canvas to draw.
+            fps: The maximum number of frames drawn per second.
+            clock: A function returning the current time, in seconds.
+            **drawoptions: Keyword arguments passed to Canvas.draw() (e.g. hideoverflown, color).
+        """
+
+        self.Canvas = canvas
+        self.FPS = fps
+        self.DrawOptions = drawoptions
+
+        # Number of frames drawn
+        self.Frames = 0
+        # Number of ticks without a frame, because nothing on the canvas changed
+        self.SkippedFrames = 0
+        # Number of ticks missed while the canvas had changes to draw, because the previous frame or the caller
+        # overran its time
+        self.DroppedFrames = 0
+        # Number of frames that took longer to draw than the interval between two ticks
+        self.LateFrames = 0
+
+        self.__clock = clock
+        # Time of the next tick, or None before the first tick
+        self.__nextframe = None
+        self.__requested = False
+
+
+    @property
+    def interval(self):
+        """
+        Returns:
+            the time, in seconds, between two ticks
+        """
+        return 1 / self.FPS
+
+
+    def request(self):
+        """
+        Makes the next tick draw a frame, even if nothing on the canvas changed.
+        """
+        self.__requested = True
+
+
+    def tick(self):
+        """
+        Draws a frame if a tick is due and the canvas has anything to repaint.
+
+        Returns:
+            True if a frame was drawn
+        """
+
+        now = self.__clock()
+        interval = self.interval
+        if self.__nextframe is None:
+            self.__nextframe = now
+        if now < self.__nextframe:
+            return False
+
+        # Stay aligned on the tick grid: ticks missed while running late are dropped, not drawn in a burst.
+        missed = int((now - self.__nextframe) // interval)
+        self.__nextframe += (missed + 1) * interval
+
+        if not (self.__requested or self.Canvas.dirty):
+            self.SkippedFrames += 1 + missed
+            return False
+
+        self.DroppedFrames += missed
+        self.__requested = False
+        self.Canvas.draw(**self.DrawOptions)
+        self.Frames += 1
+        if self.__clock() - now > interval:
+            self.LateFrames += 1
+        return True
+
+
+    def timeout(self):
+        """
+        Returns:
+            the time, in seconds, until the next tick is due
+        """
+        if self.__nextframe is None:
+            return 0.0
+        return max(self.__nextframe - self.__clock(), 0.0)
+
+
+
 class GUI:
     """
     Class responsible for the creation and maintenance of a canvas and its components.
     """
 
+    # Seconds between two polls of the console by runasync(), where stdin cannot be watched by the event loop (Windows)
+    InputPollInterval = 0.01
+
     #====================Magic methods====================
 
-    def __init__(self, width: int = 100, height = 25, bordertype = BorderTypes.NoBorder):
+    def __init__(self, width: int = 100, height = 25, bordertype = BorderTypes.NoBorder, fps: float = 30):
+        # Rendering: the canvas holding the GUI's components, drawn at most 'fps' times per second
+        self.Canvas = Canvas(width, height, bordertype)
+        self.Scheduler = RenderScheduler(self.Canvas, fps)
+
         self.width = width
         self.height = height
         self.bordertype = bordertype
 
-        self.Focus = 0 # focuses on first component
+        self._active = False
+        # Focusable components, in tab order, and the component receiving focus
+        self.FocusRing = FocusRing()
 
         # UX interactions
         self._inputkey = KeyCodes.Null
         self._inputkeystr = KeyCodes.tostring(KeyCodes.Null)
-        self._userinput = KeyPressEventHandler(self._keypressdetector)
+        # Keys read at once are delivered in one batch. See the 'coalesce' property to merge repeated navigation keys.
+        self._userinput = KeyPressEventHandler()
+        self._userinput.BracketedPaste = True
+        # Subscribed weakly: the handler does not keep the GUI alive.
+        self._userinput.BatchListener.subscribe(self._keypressdetector, weak=True)
+        self._userinput.PasteListener.subscribe(self._pastedetector, weak=True)
+
+        # Global shortcuts, matched before key presses are routed to the focused component. See KeyPress.KeyBindings
+        self.KeyBindings = KeyBindings()
+        self.KeyBindings.bind(KeyCodes.Tab, lambda sender, args: self.focusnext())
+        self.KeyBindings.bind((KeyCodes.Null, KeyCodes.ShiftTab), lambda sender, args: self.focusprevious())
 
     #====================Properties====================
 
@@ -285,26 +1236,64 @@ class GUI:
         if bool(value):
             self._run()
 
+    @property
+    def coalesce(self):
+        """
+        Whether repeated presses of a navigation or function key read at once (e.g. a held arrow key) are routed as a
+        single key press, with a repeat count. Off by default: only turn it on if every KeyPress subscriber honours
+        KeyPressEventArgs.Repeat. Characters are never merged.
+
+        Returns:
+            a boolean
+        """
+        return self._userinput.Coalesce
+    @coalesce.setter
+    def coalesce(self, value: bool):
+        """
+        Specifies whether repeated presses of a navigation or function key read at once are merged.
+
+        Args:
+            value: a boolean
+        """
+        self._userinput.Coalesce = bool(value)
+
     @property
     def focus(self):
         """
-        Returns the index of the child component curently receiving focus.
+        Returns the z-pos of the child component curently receiving focus.
 
         Returns:
-            the index of the component to focus in integer
+            the z-pos of the focused component in integer, or None if no component has focus
         """
-        return self._focusindex
+        return self.Canvas.zpos(self.FocusRing.current)
     @focus.setter
     def focus(self, value: int):
         """
-        Focuses on a child component by its index.
+        Focuses on a child component by its z-pos.
 
         Args:
-            value: the index of the component to focus in integer
+            value: the z-pos of the component to focus in integer, or None to remove the focus
+
+        Raises:
+            KeyError: no focusable component has this z-pos.
         """
-        if int(value) != self._focusindex:
+        if value is None:
+            self.FocusRing.focus(None)
+            return
+        component = self.Canvas.component(int(value))
+        if component is None:
+            raise KeyError(value)
+        self.FocusRing.focus(component)
 
-            self._focusindex = int(value)
+    @property
+    def focusedcomponent(self):
+        """
+        Returns the child component currently receiving focus, which receives key presses first.
+
+        Returns:
+            the focused component, or None
+        """
+        return self.FocusRing.current
 
     @property
     def height(self):
@@ -324,6 +1313,7 @@ class GUI:
             value: an integer specifying the height of the GUI
         """
         self._height = value
+        self.Canvas.Height = int(value)
 
     @property
     def width(self):
@@ -343,19 +1333,168 @@ class GUI:
             value: an integer specifying the width of the GUI
         """
         self._width = value
+        self.Canvas.Width = int(value)
+
+    #====================Components====================
+
+    def add(self, component, z_pos: int = -1, focusable: bool = None):
+        """
+        Adds a component to the GUI's canvas.
+
+        Args:
+            component: the component to add
+            z_pos: the z-pos of the component. See Canvas.add()
+            focusable: whether the component can receive focus, coming last in tab order.
+                By default, components accepting input (see Component.handledinput) are focusable.
+        """
+        self.Canvas.add(component, z_pos)
+        if component.handledinput if focusable is None else focusable:
+            self.FocusRing.add(component)
+
+    def remove(self, z_pos: int):
+        """
+        Removes a component from the GUI's canvas and from the tab order.
+        """
+        component = self.Canvas.component(z_pos)
+        if component is not None:
+            self.FocusRing.remove(component)
+            self.Canvas.remove(z_pos)
+
+    #====================Focus====================
+
+    def focusnext(self):
+        """
+        Moves the focus to the next component in tab order.
+
+        Returns:
+            the component receiving focus, or None if no component is focusable
+        """
+        return self.FocusRing.next()
+
+    def focusprevious(self):
+        """
+        Moves the focus to the previous component in tab order.
+
+        Returns:
+            the component receiving focus, or None if no component is focusable
+        """
+        return self.FocusRing.previous()
+
+    def focusdirection(self, dx: int, dy: int):
+        """
+        Moves the focus to the nearest focusable component in a direction, as laid out in the last frame drawn.
+        Only the area of the canvas lying in that direction is looked up, through the canvas's spatial index.
+
+        Args:
+            dx, dy: the direction, e.g. (1, 0) for right or (0, -1) for up
+
+        Returns:
+            the component receiving focus, or None if there is no component in that direction
+        """
+
+        current = self.FocusRing.current
+        rect = None if current is None else self.Canvas.componentrect(current)
+        if rect is None:
+            return self.FocusRing.next()
+
+        x, y, width, height = rect
+        canvaswidth, canvasheight = self.Canvas.Width, self.Canvas.Height
+        if dx > 0:
+            region = (x + width, 0, canvaswidth - x - width, canvasheight)
+        elif dx < 0:
+            region = (0, 0, x, canvasheight)
+        elif dy > 0:
+            region = (0, y + height, canvaswidth, canvasheight - y - height)
+        elif dy < 0:
+            region = (0, 0, canvaswidth, y)
+        else:
+            return current
+
+        best = None
+        bestdistance = None
+        for component in self.Canvas.componentsin(*region):
+            if component is current or component not in self.FocusRing:
+                continue
+            cx, cy, cwidth, cheight = self.Canvas.componentrect(component)
+            # Gap along the direction, then offset between centres across it, counted twice
+            if dx != 0:
+                gap = cx - (x + width) if dx > 0 else x - (cx + cwidth)
+                offset = abs((2 * cy + cheight) - (2 * y + height)) // 2
+            else:
+                gap = cy - (y + height) if dy > 0 else y - (cy + cheight)
+                offset = abs((2 * cx + cwidth) - (2 * x + width)) // 2
+            distance = max(gap, 0) + 2 * offset
+            if bestdistance is None or distance < bestdistance:
+                best = component
+                bestdistance = distance
+
+        if best is not None:
+            self.FocusRing.focus(best)
+        return best
 
     #====================UX====================
 
-    def _keypressdetector(self, args: KeyPressEventArgs):
+    def _keypressdetector(self, sender, args: KeyPressBatchEventArgs):
         """
         Function delegate used to detect user key press input
 
         Args:
             sender:
-            args:
+            args: the keys read at once
+        """
+        for keyargs in args.Keys:
+            self._routekey(keyargs)
+
+        last: KeyPressEventArgs = args.Keys[-1]
+        self._inputkey = last.Key
+        self._inputkeystr = KeyCodes.tostring(last.Key, last.Key2)
+
+    def _pastedetector(self, sender, args: PasteEventArgs):
+        """
+        Function delegate routing pasted text to the focused component, then up through its parents until handled.
+        Pastes no component handled are routed again as key presses, one per byte, as shells without bracketed paste
+        would have sent them.
+        """
+        component = self.focusedcomponent
+        while component is not None and not args.Handled:
+            if component.handledinput and len(component.Paste) > 0:
+                EventListener.notify(component.Paste, component, args)
+            component = component.parent
+
+        if not args.Handled:
+            # Line breaks were normalized by the key press handler: shells send them as carriage returns.
+            data = args.Text.replace('\n', '\r').encode('utf-8')
+            for i in range(0, len(data)):
+                self._routekey(KeyPressEventArgs(data[i:i + 1], KeyCodes.Null))
+
+    def _routekey(self, args: KeyPressEventArgs):
         """
-        self._inputkey = args.Key
-        self._inputkeystr = KeyCodes.tostring(args.Key, args.Key2)
+        Routes a key press: global shortcuts (see KeyBindings) are matched first; any other key press is notified to
+        the focused component's KeyPress listener, then bubbles up through its parents until a subscriber sets
+        args.Handled. Only components accepting input (see Component.handledinput) are notified.
+
+        Args:
+            args: the key press to route
+        """
+
+        # Each press of a coalesced key is matched on its own: a held Tab moves the focus once per press.
+        remaining = args.Repeat
+        while remaining > 0:
+            result, action = self.KeyBindings.match(args.Key, args.Key2)
+            if result == KeyBindings.NoMatch:
+                break
+            remaining -= 1
+            if result == KeyBindings.Complete:
+                action(self, args)
+        if remaining == 0:
+            return
+        args.Repeat = remaining
+
+        component = self.focusedcomponent
+        while component is not None and not args.Handled:
+            if component.handledinput and len(component.KeyPress) > 0:
+                EventListener.notify(component.KeyPress, component, args)
+            component = component.parent
 
     def _run(self):
         """
@@ -363,6 +1502,102 @@ class GUI:
         Controlled internally by the GUI class.
         """
 
+        # Frames are drawn by the scheduler, which coalesces every change made between two ticks.
+        # Key presses are read while waiting for the next tick.
+        inputopen = True
+        try:
+            while self._active:
+                self.Scheduler.tick()
+                if inputopen:
+                    try:
+                        self._userinput.readkeys(self.Scheduler.timeout())
+                    except EOFError:
+                        inputopen = False
+                else:
+                    time.sleep(self.Scheduler.timeout())
+        finally:
+            self._userinput.close()
+
+    #====================asyncio====================
+
+    async def runasync(self):
+        """
+        Runs the GUI inside the running asyncio event loop, until the 'active' property is set to False.
+        Key presses are read from stdin as they arrive, without blocking the loop, and frames are drawn by a coroutine
+        paced by the scheduler. Components and the canvas can therefore be changed by any other coroutine of the loop
+        without locking.
+        """
+
+        loop = asyncio.get_running_loop()
+        self._active = True
+        stopinput = self.__startinput(loop)
+        try:
+            await self._renderasync()
+        finally:
+            stopinput()
+            self._active = False
+
+    async def _renderasync(self):
+        """
+        Coroutine drawing frames through the scheduler while the GUI is active.
+        """
+        while self._active:
+            self.Scheduler.tick()
+            await asyncio.sleep(self.Scheduler.timeout())
+
+    def __startinput(self, loop):
+        """
+        Starts notifying the GUI's key press subscribers from the event loop.
+        On POSIX shells, stdin is switched to raw mode and watched with loop.add_reader(); incomplete escape sequences
+        are flushed once the key press handler's timeout elapsed. Elsewhere, the console is polled every
+        InputPollInterval seconds. Either way, keys go through the same batch listener as GUI._run().
+
+        Returns:
+            a function stopping the input and restoring the shell
+        """
+
+        userinput = self._userinput
+        if os.name != 'nt':
+            userinput.open()
+            fd = userinput.fileno()
+            pendingflush = [None]
+
+            def flushinput():
+                pendingflush[0] = None
+                userinput.flush()
+                checkpending()
+
+            def checkpending():
+                remaining = userinput.Parser.remaining()
+                if remaining is not None and pendingflush[0] is None:
+                    pendingflush[0] = loop.call_later(remaining, flushinput)
+
+            def readinput():
+                try:
+                    userinput.readkeys(0)
+                except EOFError:
+                    loop.remove_reader(fd)
+                checkpending()
+
+            def stopinput():
+                loop.remove_reader(fd)
+                if pendingflush[0] is not None:
+                    pendingflush[0].cancel()
+                userinput.close()
+
+            loop.add_reader(fd, readinput)
+            return stopinput
+
+        async def readinput():
+            # Polled with kbhit(): a blocking getch() in a worker thread could not be stopped, and would keep the loop
+            # from shutting down until the next key press.
+            while self._active:
+                if userinput.readkeys(0) == 0:
+                    await asyncio.sleep(GUI.InputPollInterval)
+
+        task = loop.create_task(readinput())
+        return task.cancel
+
 
 
 #========================Component class========================
@@ -372,6 +1607,13 @@ class Component:
     #====================Magic methods====================
 
     def __init__(self, location, width: int = 0, height: int = 0):
+        self._canvas = None             # The canvas this component is drawn on. Set by Canvas.add()
+
+        # Render cache: (render key, value(), value() split into lines). See render()
+        self._rendercache = None
+        self.CacheHits = 0
+        self.CacheMisses = 0
+
         self.width = width
         self.height = height
         self.location = location
@@ -381,9 +1623,16 @@ class Component:
 
         self.handledinput = False       # This variable determines whether the GUI should transmit input to the component
 
+        self._parent = None             # The container of this component, to which unhandled input bubbles up
+
+        self._style = None              # The Color.Style of this component's cells, None for the shell's style
+        self._styleid = 0
+        self._transparent = False       # Whether blank cells of this component show the components underneath
+
         self.FocusLost = FocusLostEventListener()
         self.KeyPress = KeyPressEventListener()
         self.OnFocus = OnFocusEventListener()
+        self.Paste = PasteEventListener()
 
     def __eq__(self, other):
         return str(self) == str(other)
@@ -402,6 +1651,50 @@ class Component:
         """
         return ""
 
+    def invalidate(self):
+        """
+        Discards the render cache and notifies the canvas holding this component that it needs to be redrawn.
+        Property setters call this method; subclasses should call it whenever a change affects value().
+        """
+        self._rendercache = None
+        if self._canvas is not None:
+            self._canvas._invalidate(self)
+
+    def render(self):
+        """
+        Memoized value(): the component is only rendered again after being invalidated, or when its renderkey() changes.
+
+        Returns:
+            A string representing the component.
+        """
+        self.renderlines()
+        return self._rendercache[1]
+
+    def renderlines(self):
+        """
+        Memoized value(), split into lines. The returned list is shared with the cache and must not be modified.
+
+        Returns:
+            A list containing each line of the string representing the component.
+        """
+        key = self.renderkey()
+        if self._rendercache is not None and self._rendercache[0] == key:
+            self.CacheHits += 1
+        else:
+            self.CacheMisses += 1
+            value = self.value()
+            self._rendercache = (key, value, value.split(sep="\n"))
+        return self._rendercache[2]
+
+    def renderkey(self):
+        """
+        Lists the properties affecting value(). Subclasses should extend this tuple with their own properties.
+
+        Returns:
+            A tuple which changes whenever value() would return something else.
+        """
+        return (self._width, self._height, self._focused)
+
     #====================Properties====================
 
     @property
@@ -416,13 +1709,45 @@ class Component:
         Notifies this component's OnFocus event listener when it receives focus.
         Notifies this component's FocusLost event listener when focus is lost.
         """
+        if bool(value) == self._focused:
+            return
         if value:
             self._focused = True
+            self.invalidate()
             self.OnFocus.notify(sender=self)
         else:
             self._focused = False
+            self.invalidate()
             self.FocusLost.notify(sender=self)
 
+    @property
+    def parent(self):
+        """
+        Returns the component containing this component.
+
+        Returns:
+            the parent component, or None for a top-level component
+        """
+        return self._parent
+    @parent.setter
+    def parent(self, value):
+        """
+        Specifies the component containing this component. Key presses and pastes not handled by this component are
+        routed to its parent.
+
+        Args:
+            value: the parent component, or None
+
+        Raises:
+            ValueError: the component would become its own ancestor.
+        """
+        ancestor = value
+        while ancestor is not None:
+            if ancestor is self:
+                raise ValueError("A component cannot be its own ancestor.")
+            ancestor = ancestor.parent
+        self._parent = value
+
     @property
     def height(self):
         """
@@ -441,6 +1766,7 @@ class Component:
             value: an integer specifying the height of the UI
         """
         self._height = int(value)
+        self.invalidate()
 
     @property
     def location(self):
@@ -460,6 +1786,58 @@ class Component:
             value: a tuple specifying the component's (x, y) location inside the UI
         """
         self._location = (value[0], value[1])
+        # Moving the component does not change its value(): keep the render cache.
+        if self._canvas is not None:
+            self._canvas._invalidate(self)
+
+    @property
+    def style(self):
+        """
+        The style (colors, bold, underline, reverse) of the cells this component covers.
+
+        Returns:
+            a Color.Style, or None for the shell's own style
+        """
+        return self._style
+    @style.setter
+    def style(self, value):
+        """
+        Sets the style of the cells this component covers.
+
+        Args:
+            value: a Color.Style, or None for the shell's own style
+        """
+        if value is self._style:
+            return
+        self._style = value
+        self._styleid = 0 if value is None else value.Id
+        # Restyling the component does not change its value(): keep the render cache.
+        if self._canvas is not None:
+            self._canvas._invalidate(self)
+
+    @property
+    def transparent(self):
+        """
+        Whether the blank (space) cells of this component let the components underneath show through.
+
+        Returns:
+            a boolean
+        """
+        return self._transparent
+    @transparent.setter
+    def transparent(self, value: bool):
+        """
+        Specifies whether the blank (space) cells of this component let the components underneath show through.
+        A translucent style (see Color.Style) tints them; characters of lower components stay visible.
+
+        Args:
+            value: a boolean
+        """
+        if bool(value) == self._transparent:
+            return
+        self._transparent = bool(value)
+        if self._canvas is not None:
+            self._canvas._invalidate(self)
 
     @property
     def width(self):
@@ -480,6 +1858,45 @@ class Component:
             value: an integer specifying the width of the UI
         """
         self._width = int(value)
+        self.invalidate()
+
+    @property
+    def X(self):
+        """
+        The horizontal position of the component inside the UI.
+
+        Returns:
+            an integer representing the component's x location
+        """
+        return self._location[0]
+    @X.setter
+    def X(self, value: int):
+        """
+        Sets the horizontal position of the component inside the UI.
+
+        Args:
+            value: an integer specifying the component's x location
+        """
+        self.location = (value, self._location[1])
+
+    @property
+    def Y(self):
+        """
+        The vertical position of the component inside the UI.
+
+        Returns:
+            an integer representing the component's y location
+        """
+        return self._location[1]
+    @Y.setter
+    def Y(self, value: int):
+        """
+        Sets the vertical position of the component inside the UI.
+
+        Args:
+            value: an integer specifying the component's y location
+        """
+        self.location = (self._location[0], value)
 
 
 
@@ -565,3 +1982,84 @@ class Component:
     ---------
         -
 """
+
+# 2.1
+"""
+    Rendering performance
+
+    Additions
+    ---------
+        -Component.X and Component.Y properties, mirroring Component.location
+        -OutputModes class; Canvas.__init__(self, width: int, height: int, bordertype=BorderTypes.BlockBorder, outputmode=OutputModes.Full)
+            -OutputModes.Incremental only rewrites the regions damaged since the last frame, using cursor positioning
+            -Canvas.Origin sets where positioned frames are written
+            -OutputModes.Diff writes only the cells that changed since the last frame, through Canvas.Writer
+             (Utils.FrameDiffWriter), which also counts the bytes written per frame
+        -Canvas.dirty, Canvas.invalidate(), Component.invalidate()
+            -Component property setters notify the canvas holding the component
+        -borderinsets(bordertype), rectsoverlap(rect1, rect2)
+        -Component.render(), Component.renderlines() and Component.renderkey(): memoized value()
+            -Component.CacheHits and Component.CacheMisses counters; Canvas.cachestats() sums them
+            -Canvas.draw() only calls value() on components that changed
+        -Canvas keeps a spatial index of component areas (see SpatialIndex.py)
+            -Damaged regions only repaint the components the index finds overlapping them
+            -Full redraws only lay out changed components and cull those outside of the canvas through the index
+            -Canvas.componentat(x, y) and Canvas.componentsin(x, y, width, height) for hit-testing
+        -Canvas keeps its z-positions sorted (see SpatialIndex.ZOrder)
+            -Canvas.bringforward(), sendbackward(), bringtofront() and sendtoback() restack a component
+            -Canvas.reorder(mapping: dict) changes many z-positions at once
+            -Canvas.components() lists components in painting order
+        -Canvas.__init__() 'backend' parameter, to compose frames with NumPy (see FrameBuffer.NumpyFrameBuffer)
+        -borderedges(bordertype, width: int): cached top and bottom border edges
+        -drawborder(framebuffer, x, y, width, height, bordertype, style): draws a border inside a frame buffer
+        -cliprect(rect1, rect2)
+        -RenderStats class; Canvas.Stats records the compose, border, output and per-component value() times, the
+         bytes emitted and the components drawn or culled by the last frame, plus an optional rolling window of
+         frame times (RenderStats.setwindow())
+        -RenderScheduler class: draws a canvas at most FPS times per second, skipping ticks while the canvas is
+         unchanged and counting skipped, dropped and late frames
+        -GUI.Canvas and GUI.Scheduler; GUI.__init__() 'fps' parameter. GUI._run() draws through the scheduler while the
+         GUI is active
+        -GUI.runasync(): runs the GUI as a coroutine of an asyncio event loop, reading keys with loop.add_reader()
+        -GUI._run() reads key presses while waiting for the next frame
+        -GUI receives key presses in batches, one per read; GUI.coalesce merges repeated navigation and function keys
+        -GUI subscribes weakly to its key press handler
+        -Key routing: GUI.KeyBindings global shortcuts (see KeyPress.KeyBindings), then the focused component's
+         KeyPress listener, bubbling up through Component.parent until KeyPressEventArgs.Handled is set
+            -Pastes are routed the same way to Component.Paste listeners (see EventSystem/Paste.py); unhandled pastes
+             are then routed key by key
+            -GUI.focusedcomponent; Canvas.component(z_pos)
+        -FocusRing class: focusable components in tab order, with constant-time next/previous moves
+            -GUI.FocusRing; GUI.add() and GUI.remove() maintain the tab order
+            -GUI.focusnext(), GUI.focusprevious() (bound to Tab and Shift+Tab), GUI.focusdirection(dx, dy)
+            -Canvas.componentrect(component), Canvas.zpos(component)
+        -Canvas.PreFrame and Canvas.PostFrame events, raised around every draw() (see EventSystem/PreFrame.py and
+         EventSystem/PostFrame.py)
+        -Component.style: per-component Color.Style, stored in the frame buffer's per-cell style ids
+            -Every output mode writes an SGR escape only where the style changes along the output, and ends frames
+             with the default style
+            -Canvas.ColorDepth: the color depth styles are written with, detected for sys.stdout by default
+        -Alpha compositing: translucent style colors are blended over the components underneath, and
+         Component.transparent lets them show through blank cells (see FrameBuffer.blit())
+            -Frames are composited again in full whenever composited styles were evicted (see Color.Style.Evictions)
+
+    Changes
+    -------
+        -Canvas.draw() composes frames inside a reusable FrameBuffer (see FrameBuffer.py) instead of splitting and
+         re-joining the frame string for every line of every component
+        -Canvas.add() and Canvas.setzpos() replace (rather than orphan) a component already at the target z-pos
+        -Components are blitted as rectangles: a component line no longer erases the rest of the frame line
+        -addborder() pads lines with str.ljust() and reuses cached edges instead of rebuilding them
+        -The canvas border is drawn into the canvas's frame buffer once, when the canvas is resized or its border
+         changes, instead of bordering the whole frame string on every draw()
+        -borderinsets() returns (left, top, right, bottom)
+
+    Bug Fixes
+    ---------
+        -Removed the unfinished Canvas.ColorPrinter() stub, which prevented the module from compiling
+        -Canvas.draw() culled components entirely outside of the canvas only when outside on both axes
+        -Canvas.add() without a z-pos could collide with an existing z-pos after a removal
+        -GUI.__init__() set an unused 'Focus' attribute instead of initialising the 'focus' and 'active' properties
+        -GUI._keypressdetector() lacked the 'sender' parameter every event subscriber receives
+        -Component.focused notified OnFocus/FocusLost again when set to its current value
+"""
@@ -51,15 +51,76 @@ class Label(Component):
         buffer = self.Text
         # If self.Length property is set to a positive integer, truncate.
         if self.OverflowIndicator and -1 < self.Length < len(buffer):
-            buffer[self.Length - 2 :] = self.OverflowIndicator
+            buffer = buffer[0 : max(self.Length - len(self.OverflowIndicator), 0)] + self.OverflowIndicator
         elif -1 < self.Length < len(buffer):
-            buffer[self.Length - 1 :] = ""
+            buffer = buffer[0 : self.Length]
         # Adds a hard-coded border around the text if property is set.
         if self.ShowBorder:
             buffer = addborder(buffer, self.BorderType)
 
         return buffer
 
+    def renderkey(self):
+        return Component.renderkey(self) + \
+            (self._text, self._showborder, self._bordertype, self._length, self._overflowindicator)
+
+    #====================Properties====================
+
+    @property
+    def BorderType(self):
+        """
+        The border drawn around the label when ShowBorder is set.
+        """
+        return self._bordertype
+    @BorderType.setter
+    def BorderType(self, value):
+        self._bordertype = value
+        self.invalidate()
+
+    @property
+    def Length(self):
+        """
+        The maximum length of the label's text. -1 for no limit.
+        """
+        return self._length
+    @Length.setter
+    def Length(self, value: int):
+        self._length = int(value)
+        self.invalidate()
+
+    @property
+    def OverflowIndicator(self):
+        """
+        The string ending a text truncated by Length.
+        """
+        return self._overflowindicator
+    @OverflowIndicator.setter
+    def OverflowIndicator(self, value: str):
+        self._overflowindicator = str(value)
+        self.invalidate()
+
+    @property
+    def ShowBorder(self):
+        """
+        Whether a border is drawn around the label.
+        """
+        return self._showborder
+    @ShowBorder.setter
+    def ShowBorder(self, value: bool):
+        self._showborder = bool(value)
+        self.invalidate()
+
+    @property
+    def Text(self):
+        """
+        The text displayed by the label.
+        """
+        return self._text
+    @Text.setter
+    def Text(self, value: str):
+        self._text = str(value)
+        self.invalidate()
+
 
 
 #========================Label class========================
@@ -157,3 +218,18 @@ class Illustration(Component):
     ---------
         -
 """
+
+# 1.2
+"""
+    Rendering performance
+
+    Changes
+    -------
+        -Label.Text, ShowBorder, BorderType, Length and OverflowIndicator are properties which invalidate the label,
+         so that a canvas in OutputModes.Incremental only redraws changed labels
+        -Label.renderkey() covers the label's properties, so that Component.render() can memoize Label.value()
+
+    Bug Fixes
+    ---------
+        -Label.value() no longer raises TypeError when truncating its text to Length
+"""
@@ -0,0 +1,315 @@
+"""
+Spatial indexes used by ShellGUI's Canvas:
+a grid of rectangles, to find the components covering a region of the screen without testing every component,
+and a sorted z-order, to paint and restack components deterministically.
+"""
+
+if __name__ == "__main__":
+    # MAJOR +1 represents an added function.
+    __MAJOR = 1
+    # MINOR +1 represents a change in existing function(s) within the current MAJOR.
+    __MINOR = 1
+
+    __info = """This file contains the module 'SpatialIndex', used by ShellGUI_Core to look up components by area.
+To use this module in another project, include this file inside the project's directory."""
+
+    print("========================================================")
+    print("SpatialIndex.py version ", __MAJOR, ".", __MINOR, sep='', end='\n\n')
+    print(__info)
+    print("========================================================\n")
+    input("Press enter to continue...")
+
+
+
+#========================Imports========================
+
+# Used by: ZOrder
+import bisect
+
+
+
+#========================GridIndex class========================
+
+class GridIndex:
+    """
+    A uniform grid over an unbounded plane. Every rectangle is registered in each grid cell it overlaps, so that
+    a query only looks at the rectangles sharing a grid cell with the queried area.
+    Rectangles are (x, y, width, height) tuples, identified by a hashable key.
+    """
+
+    def __init__(self, cellwidth: int=16, cellheight: int=4):
+        self.CellWidth = max(int(cellwidth), 1)
+        self.CellHeight = max(int(cellheight), 1)
+
+        # Keys registered in each grid cell, by (column, row) of the grid cell
+        self.__cells = {}
+        # Rectangle of each key
+        self.__rects = {}
+
+
+    def __contains__(self, key):
+        return key in self.__rects
+
+
+    def __len__(self):
+        return len(self.__rects)
+
+
+    def __gridcells(self, rect):
+        """
+        Lists the grid cells a rectangle overlaps. Empty rectangles overlap no grid cell.
+        """
+
+        x, y, width, height = rect
+        if width <= 0 or height <= 0:
+            return []
+        return [(column, row)
+                for row in range(y // self.CellHeight, (y + height - 1) // self.CellHeight + 1)
+                for column in range(x // self.CellWidth, (x + width - 1) // self.CellWidth + 1)]
+
+
+    def clear(self):
+        """
+        Removes every rectangle from the index.
+        """
+        self.__cells.clear()
+        self.__rects.clear()
+
+
+    def get(self, key, default=None):
+        """
+        Returns:
+            The rectangle registered under 'key', or 'default' if there is none.
+        """
+        return self.__rects.get(key, default)
+
+
+    def insert(self, key, rect):
+        """
+        Registers a rectangle, replacing any rectangle already registered under the same key.
+
+        Args:
+            key: A hashable identifier for the rectangle.
+            rect: A (x, y, width, height) tuple.
+        """
+
+        if key in self.__rects:
+            if self.__rects[key] == rect:
+                return
+            self.remove(key)
+
+        self.__rects[key] = rect
+        for cell in self.__gridcells(rect):
+            if cell in self.__cells:
+                self.__cells[cell].add(key)
+            else:
+                self.__cells[cell] = {key}
+
+
+    def keys(self):
+        """
+        Returns:
+            The keys of every registered rectangle.
+        """
+        return self.__rects.keys()
+
+
+    def pop(self, key, default=None):
+        """
+        Removes a rectangle from the index.
+
+        Returns:
+            The rectangle that was registered under 'key', or 'default' if there was none.
+        """
+
+        if key not in self.__rects:
+            return default
+        rect = self.__rects[key]
+        self.remove(key)
+        return rect
+
+
+    def query(self, rect):
+        """
+        Finds the rectangles overlapping an area.
+
+        Args:
+            rect: The (x, y, width, height) area to look up.
+
+        Returns:
+            A set with the keys of every rectangle sharing at least one cell with 'rect'.
+        """
+
+        x, y, width, height = rect
+        candidates = set()
+        for cell in self.__gridcells(rect):
+            if cell in self.__cells:
+                candidates.update(self.__cells[cell])
+
+        found = set()
+        for key in candidates:
+            other = self.__rects[key]
+            if other[0] < x + width and x < other[0] + other[2] and other[1] < y + height and y < other[1] + other[3]:
+                found.add(key)
+        return found
+
+
+    def querypoint(self, x: int, y: int):
+        """
+        Finds the rectangles containing a cell.
+
+        Returns:
+            A set with the keys of every rectangle containing the cell (x, y).
+        """
+        return self.query((x, y, 1, 1))
+
+
+    def remove(self, key):
+        """
+        Removes a rectangle from the index. Does nothing if no rectangle is registered under 'key'.
+        """
+
+        if key not in self.__rects:
+            return
+        for cell in self.__gridcells(self.__rects[key]):
+            keys = self.__cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.__cells[cell]
+        del self.__rects[key]
+
+
+
+#========================ZOrder class========================
+
+class ZOrder:
+    """
+    The z-positions in use on a canvas, kept sorted with binary searches.
+    Lookups, neighbour searches and moves locate positions in O(log n); insertions and removals then shift the
+    underlying list with a single memory move.
+    """
+
+    def __init__(self, positions=()):
+        self.__positions = sorted(set(positions))
+
+
+    def __contains__(self, z_pos):
+        index = bisect.bisect_left(self.__positions, z_pos)
+        return index < len(self.__positions) and self.__positions[index] == z_pos
+
+
+    def __iter__(self):
+        return iter(list(self.__positions))
+
+
+    def __len__(self):
+        return len(self.__positions)
+
+
+    def __reversed__(self):
+        return reversed(list(self.__positions))
+
+
+    def add(self, z_pos):
+        """
+        Inserts a z-position. Does nothing if it is already in use.
+        """
+
+        index = bisect.bisect_left(self.__positions, z_pos)
+        if index == len(self.__positions) or self.__positions[index] != z_pos:
+            self.__positions.insert(index, z_pos)
+
+
+    def above(self, z_pos):
+        """
+        Returns:
+            The next z-position in use above 'z_pos', or None if there is none.
+        """
+
+        index = bisect.bisect_right(self.__positions, z_pos)
+        return self.__positions[index] if index < len(self.__positions) else None
+
+
+    def below(self, z_pos):
+        """
+        Returns:
+            The next z-position in use below 'z_pos', or None if there is none.
+        """
+
+        index = bisect.bisect_left(self.__positions, z_pos)
+        return self.__positions[index - 1] if index > 0 else None
+
+
+    def bottom(self):
+        """
+        Returns:
+            The lowest z-position in use, or None if there is none.
+        """
+        return self.__positions[0] if self.__positions else None
+
+
+    def move(self, z_pos, new_z_pos):
+        """
+        Replaces a z-position by another one.
+        """
+
+        self.remove(z_pos)
+        self.add(new_z_pos)
+
+
+    def remove(self, z_pos):
+        """
+        Removes a z-position. Does nothing if it is not in use.
+        """
+
+        index = bisect.bisect_left(self.__positions, z_pos)
+        if index < len(self.__positions) and self.__positions[index] == z_pos:
+            del self.__positions[index]
+
+
+    def renumber(self, mapping: dict):
+        """
+        Replaces many z-positions at once, sorting the result a single time.
+
+        Args:
+            mapping: A dictionary of {old z-position: new z-position}.
+        """
+
+        self.__positions = sorted(set(mapping.get(z_pos, z_pos) for z_pos in self.__positions))
+
+
+    def top(self):
+        """
+        Returns:
+            The highest z-position in use, or None if there is none.
+        """
+        return self.__positions[-1] if self.__positions else None
+
+
+
+#========================Version History========================
+
+# 1.0
+"""
+    Initial Release
+    Uniform grid spatial index, used by Canvas for damage recomposition, hit-testing and culling.
+
+    Additions
+    ---------
+        -class GridIndex
+            -__init__(self, cellwidth: int=16, cellheight: int=4)
+            -insert(self, key, rect), remove(self, key), pop(self, key, default=None), clear(self)
+            -get(self, key, default=None), keys(self)
+            -query(self, rect), querypoint(self, x: int, y: int)
+"""
+
+# 1.1
+"""
+    Sorted z-order
+
+    Additions
+    ---------
+        -class ZOrder
+            -add(self, z_pos), remove(self, z_pos), move(self, z_pos, new_z_pos), renumber(self, mapping: dict)
+            -above(self, z_pos), below(self, z_pos), top(self), bottom(self)
+"""
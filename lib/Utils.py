@@ -28,10 +28,32 @@ import platform
 # Used by WriteShell()
 import sys
 
+# Used by: WriteShell() (Color objects). Optional, so that this file can still be included on its own.
+try:
+    from lib import Color as _colormodule
+except ImportError:
+    _colormodule = None
+
 
 
 #========================Common functions========================
 
+def AnsiCursorPosition(row: int, column: int):
+    """
+    Returns the ANSI escape sequence moving the shell's cursor to a given position.
+    Note: Only shells with ANSI support will interpret the sequence; IDLE will print it as-is.
+
+    Args:
+        row: The 1-based row to move the cursor to.
+        column: The 1-based column to move the cursor to.
+
+    Returns:
+        The escape sequence, in string.
+    """
+
+    return "\033[" + str(row) + ";" + str(column) + "H"
+
+
 #Asks the user to enter a number. Validate if it is not an integer.
 def enterInteger(CustomMessage="Please enter an integer: ",
                  CustomErrorMessage="The input is not an integer, please try again...",
@@ -241,6 +263,7 @@ def WriteShell(*text, sep=' ', end='\n', Color='default', stderr=False, flush=Fa
                 'purple'
                 'brown' - cyan outside IDLE
                 'error' - used for printing stderr, a bright red
+            or a Color.Color object, converted to the closest color the shell can display (see Color.toAnsi()).
             Note:
                 Colors may vary depending on the shell used and/or IDLE's color configuration.
         stderr: Whether to optput into stderr instead of stdout.
@@ -248,6 +271,9 @@ def WriteShell(*text, sep=' ', end='\n', Color='default', stderr=False, flush=Fa
                 Printing to stderr will not automatically change the text color. Best to use Color='error'
                 Consider flushing stderr (param flush=True) to allow error messages to be outputted before any other code is executed.
         flush: Whether to flush the output (True) or let it remain buffered (False).
+
+    Returns:
+        The number of bytes written, in UTF-8, color escapes included.
     """
 
     try:
@@ -269,10 +295,13 @@ def WriteShell(*text, sep=' ', end='\n', Color='default', stderr=False, flush=Fa
                     'error': 'stderr'}
         
         # If 'Color' parameter does not pass a valid value, use default 'stdout'
-        try:
-            coloring = colormap[Color]
-        except:
-            coloring = 'stdout'
+        if _colormodule is not None and isinstance(Color, _colormodule.Color):
+            coloring = _colormodule.toIdle(Color)
+        else:
+            try:
+                coloring = colormap[Color]
+            except:
+                coloring = 'stdout'
         
         # The string to be written to IDLEshell:
         out = ""
@@ -314,10 +343,14 @@ def WriteShell(*text, sep=' ', end='\n', Color='default', stderr=False, flush=Fa
                     'error': '\033[31m'}
         
         # If 'Color' parameter does not pass a valid value, use default 'default'
-        try:
-            coloring = colormap[Color]
-        except:
-            coloring = 'default'
+        if _colormodule is not None and isinstance(Color, _colormodule.Color):
+            # Empty if the shell cannot display colors
+            coloring = _colormodule.toAnsi(Color, _colordepth(sys.stderr if stderr else sys.stdout)) or 'default'
+        else:
+            try:
+                coloring = colormap[Color]
+            except:
+                coloring = 'default'
 
         # The string to be written to output:
         out = ""
@@ -331,24 +364,197 @@ def WriteShell(*text, sep=' ', end='\n', Color='default', stderr=False, flush=Fa
             out += str(text[-1])
 
         out += end
+        if coloring != "default":
+            out = coloring + out + '\033[0m'
 
         if stderr:
-            if coloring == "default":
-                outlen = sys.stderr.write(out)
-            else:
-                outlen = sys.stderr.write(coloring + out + '\033[0m')
+            outlen = sys.stderr.write(out)
 
             if flush:
                 sys.stderr.flush()
         else:
-            if coloring == "default":
-                outlen = sys.stdout.write(out)
-            else:
-                outlen = sys.stdout.write(coloring + out + '\033[0m')
+            outlen = sys.stdout.write(out)
 
             if flush:
                 sys.stdout.flush()
 
+    return len(out.encode('utf-8'))
+
+
+
+# Color depth of each stream written by WriteShell(), by stream
+_colordepths = {}
+
+def _colordepth(stream):
+    """
+    Returns the color depth of a stream, detected once per stream. See Color.detectColorDepth()
+    """
+
+    if stream not in _colordepths:
+        _colordepths[stream] = _colormodule.detectColorDepth(stream)
+    return _colordepths[stream]
+
+
+
+#========================Shell output========================
+
+class FrameDiffWriter:
+    """
+    An output backend for successive full-screen frames, used alongside WriteShell().
+    Keeps the previously written frame and, for each new frame, only writes the runs of cells that changed, each
+    preceded by an ANSI cursor-positioning escape. Nearby runs are coalesced whenever rewriting the unchanged cells
+    between them is cheaper than moving the cursor again.
+    Note: Requires a shell with ANSI support.
+    """
+
+    def __init__(self, stderr=False):
+        # Whether to write into stderr instead of stdout.
+        self.Stderr = bool(stderr)
+
+        # Counters
+        self.Frames = 0             # Number of frames written
+        self.LastFrameBytes = 0     # Bytes written for the last frame
+        self.TotalBytes = 0         # Bytes written since the writer's creation
+
+        self.__previous = None
+        self.__previousstyles = None
+        self.__origin = None
+        # Style id the shell is using while diff() builds its output
+        self.__current = 0
+
+
+    def reset(self):
+        """
+        Forgets the previously written frame: the next frame is written in full.
+        """
+        self.__previous = None
+        self.__previousstyles = None
+
+
+    def diff(self, lines: list, origin=(1, 1), styles: list=None, sgr=None):
+        """
+        Computes the output turning the previously written frame into a new frame, without writing it.
+
+        Args:
+            lines: The rows of the new frame, in string.
+            origin: The 1-based (column, row) shell position of the frame's top-left corner.
+            styles: Optional style ids of every cell, one sequence per row. Cells whose style changed are rewritten too.
+            sgr: With 'styles', a function returning the escape sequence selecting a style id. Escapes are only written
+                where the style changes along the output; style id 0 must be the shell's default style.
+
+        Returns:
+            The string to write to the shell, empty if nothing changed.
+        """
+
+        column, row = origin
+        previous = self.__previous
+        previousstyles = self.__previousstyles
+        out = []
+        self.__current = 0
+
+        if previous is None or origin != self.__origin or len(previous) != len(lines) or \
+                (styles is None) != (previousstyles is None):
+            # No usable previous frame: the rows of the previous frame, if any, are blanked at their own origin, then
+            # the new frame is written in full. The rest of the shell is left untouched.
+            if previous is not None:
+                oldcolumn, oldrow = self.__origin
+                for y in range(0, len(previous)):
+                    if previous[y]:
+                        out.append(AnsiCursorPosition(oldrow + y, oldcolumn))
+                        out.append(" " * len(previous[y]))
+            previous = [""] * len(lines)
+            previousstyles = [None] * len(lines)
+
+        for y in range(0, len(lines)):
+            line = lines[y]
+            old = previous[y]
+            if styles is None:
+                if line == old:
+                    continue
+                stylerow = oldstyles = None
+            else:
+                stylerow = styles[y]
+                oldstyles = previousstyles[y]
+                if line == old and stylerow == oldstyles:
+                    continue
+
+            if len(line) != len(old):
+                # The row was resized: rewrite it whole, clearing what is left of the old row.
+                out.append(AnsiCursorPosition(row + y, column))
+                self.__emit(out, line, stylerow, 0, len(line), sgr)
+                if len(old) > len(line):
+                    if self.__current != 0:
+                        out.append(sgr(0))
+                        self.__current = 0
+                    out.append(" " * (len(old) - len(line)))
+                continue
+
+            # Changed runs, as [start, end) column intervals
+            runs = []
+            for x in range(0, len(line)):
+                if line[x] != old[x] or (stylerow is not None and stylerow[x] != oldstyles[x]):
+                    # Bridging the gap from the last run costs (x - end) characters;
+                    # starting a new run costs a cursor-positioning escape.
+                    if runs and x - runs[-1][1] < len(AnsiCursorPosition(row + y, column + x)):
+                        runs[-1][1] = x + 1
+                    else:
+                        runs.append([x, x + 1])
+
+            for start, end in runs:
+                out.append(AnsiCursorPosition(row + y, column + start))
+                self.__emit(out, line, stylerow, start, end, sgr)
+
+        if self.__current != 0:
+            out.append(sgr(0))
+        return "".join(out)
+
+
+    def __emit(self, out: list, line: str, stylerow, start: int, end: int, sgr):
+        """
+        Appends the cells [start, end) of a row to 'out', preceded by a style escape wherever the style changes.
+        """
+
+        if stylerow is None:
+            out.append(line[start:end])
+            return
+        runstart = start
+        for x in range(start, end):
+            if stylerow[x] != self.__current:
+                if x > runstart:
+                    out.append(line[runstart:x])
+                self.__current = stylerow[x]
+                out.append(sgr(self.__current))
+                runstart = x
+        out.append(line[runstart:end])
+
+
+    def write(self, lines: list, origin=(1, 1), Color='default', flush=True, styles: list=None, sgr=None):
+        """
+        Writes a new frame to the shell, only outputting what changed since the previous frame.
+
+        Args:
+            lines: The rows of the new frame, in string.
+            origin: The 1-based (column, row) shell position of the frame's top-left corner.
+            Color: The foreground color of the written text. See WriteShell().
+            styles, sgr: Optional style ids of every cell, and the escapes selecting them. See diff()
+            flush: Whether to flush the output.
+
+        Returns:
+            The number of bytes written.
+        """
+
+        out = self.diff(lines, origin, styles, sgr)
+        written = WriteShell(out, end="", Color=Color, stderr=self.Stderr, flush=flush) if out else 0
+
+        self.__previous = list(lines)
+        self.__previousstyles = None if styles is None else list(styles)
+        self.__origin = origin
+
+        self.LastFrameBytes = written
+        self.TotalBytes += self.LastFrameBytes
+        self.Frames += 1
+        return self.LastFrameBytes
+
 
 
 #========================CSV========================
@@ -522,3 +728,51 @@ def WriteToCsv(matrix, csvFileName, csvDelimiter=','):
     ---------
         -
 """
+
+# 2.2
+"""
+    Shell output helpers for ShellGUI's positioned rendering
+
+    Additions
+    ---------
+        -AnsiCursorPosition(row: int, column: int)
+        -class FrameDiffWriter
+            -write(self, lines: list, origin=(1, 1), Color='default', flush=True)
+            -diff(self, lines: list, origin=(1, 1))
+            -reset(self)
+            -Frames, LastFrameBytes and TotalBytes counters
+"""
+
+# 2.3
+"""
+    Color objects in WriteShell()
+
+    Changes
+    -------
+        -WriteShell() accepts a Color.Color object as 'Color', rendered with the shell's detected color depth
+"""
+
+# 2.4
+"""
+    Styled frame diffs
+
+    Changes
+    -------
+        -FrameDiffWriter.diff() and FrameDiffWriter.write() accept the style ids of every cell ('styles') and a function
+         building their escapes ('sgr'): cells whose style changed are rewritten, and escapes are only written where
+         the style changes
+"""
+
+# 2.5
+"""
+    Changes
+    -------
+        -WriteShell() returns the number of bytes written, in UTF-8, color escapes included
+
+    Bug Fixes
+    ---------
+        -FrameDiffWriter.LastFrameBytes and TotalBytes left out the color escapes wrapped around each frame by
+         WriteShell()
+        -FrameDiffWriter cleared the whole shell when the origin or the size of the frame changed; it now only blanks
+         the previous frame
+"""
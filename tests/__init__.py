@@ -0,0 +1,7 @@
+"""
+Tests for the ShellGUI library.
+
+Usage (from the repository root):
+    python -m pytest tests
+    python -m unittest discover tests
+"""
@@ -0,0 +1,43 @@
+"""
+Test helpers replaying shell output.
+"""
+
+import re
+
+
+
+class VirtualScreen:
+    """
+    A minimal ANSI terminal: replays cursor positioning, screen clearing and SGR escapes into a grid of
+    (character, SGR escape in effect) cells.
+    """
+
+    Escape = re.compile(r"\033\[(\d+);(\d+)H|\033\[2J|\033\[[0-9;]*m|\n|[^\033\n]")
+
+    def __init__(self, width: int, height: int):
+        self.Width = width
+        self.Height = height
+        self.clear()
+        self.Row = self.Column = 0
+        self.Sgr = ""
+
+
+    def clear(self):
+        self.Cells = [[(" ", "")] * self.Width for y in range(0, self.Height)]
+
+
+    def write(self, text: str):
+        for match in VirtualScreen.Escape.finditer(text):
+            token = match.group(0)
+            if match.group(1):
+                self.Row, self.Column = int(match.group(1)) - 1, int(match.group(2)) - 1
+            elif token == "\033[2J":
+                self.clear()
+            elif token.startswith("\033"):
+                self.Sgr = "" if token in ("\033[0m", "\033[m") else token
+            elif token == "\n":
+                self.Row, self.Column = self.Row + 1, 0
+            else:
+                if 0 <= self.Row < self.Height and 0 <= self.Column < self.Width:
+                    self.Cells[self.Row][self.Column] = (token, self.Sgr)
+                self.Column += 1
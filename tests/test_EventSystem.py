@@ -0,0 +1,140 @@
+import gc
+import unittest
+
+from lib.EventSystem import EventDispatcher, EventListener
+from lib.EventSystem.Paste import PasteEventListener
+from lib.ShellGUI_Forms import Label
+
+
+
+class EventListenerSubscriptionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.listener = EventListener()
+        self.label = Label((0, 0), "label")
+        self.calls = []
+
+
+    def handler(self, sender, args):
+        self.calls.append(args)
+
+
+    def test_component_method_subscribes_strongly(self):
+        # Component defines __eq__ without __hash__: its bound methods must still subscribe
+        self.listener += self.label.value
+        self.assertIn(self.label.value, self.listener)
+        self.listener -= self.label.value
+        self.assertEqual(len(self.listener), 0)
+
+
+    def test_component_method_subscribes_weakly(self):
+        self.listener.subscribe(self.label.value, weak=True)
+        self.assertIn(self.label.value, self.listener)
+        self.assertEqual(self.listener.Subscribers, (self.label.value,))
+        self.listener.unsubscribe(self.label.value)
+        self.assertEqual(len(self.listener), 0)
+
+
+    def test_weak_subscriber_is_pruned_when_collected(self):
+        self.listener.subscribe(self.label.value, weak=True)
+        self.label = None
+        gc.collect()
+        self.assertEqual(len(self.listener), 0)
+        self.assertEqual(self.listener.Subscribers, ())
+
+
+    def test_subscribing_twice_is_a_no_op(self):
+        self.listener += self.handler
+        self.listener.subscribe(self.handler, weak=True)
+        self.listener.notify(None, 1)
+        self.assertEqual(self.calls, [1])
+
+
+    def test_weak_subscription_of_unreferenceable_subscriber_raises(self):
+        with self.assertRaises(TypeError):
+            self.listener.subscribe(str.upper, weak=True)
+
+
+
+
+class ReuseArgsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.listener = PasteEventListener()
+        self.args = []
+        self.listener += lambda sender, args: self.args.append((args, args.Text))
+
+
+    def test_reused_args_are_updated(self):
+        self.listener.ReuseArgs = True
+        self.listener.notify(None, "a")
+        self.listener.notify(None, "b")
+        (first, firsttext), (second, secondtext) = self.args
+        self.assertIs(first, second)
+        self.assertEqual((firsttext, secondtext), ("a", "b"))
+
+
+    def test_args_are_not_reused_by_default(self):
+        self.listener.notify(None, "a")
+        self.listener.notify(None, "b")
+        self.assertIsNot(self.args[0][0], self.args[1][0])
+
+
+
+class EventDispatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dispatcher = EventDispatcher(maxworkers=2, maxpending=4)
+        self.listener = EventListener()
+        self.listener.Dispatcher = self.dispatcher
+        self.calls = []
+
+
+    def tearDown(self):
+        self.dispatcher.shutdown()
+
+
+    def failing(self, sender, args):
+        raise ValueError(args)
+
+
+    def handler(self, sender, args):
+        self.calls.append(args)
+
+
+    def onerror(self, listener, subscriber, exception):
+        raise RuntimeError("OnError failed")
+
+
+    def test_wait_returns_after_onerror_raises(self):
+        self.dispatcher.OnError = self.onerror
+        self.listener += self.failing
+        self.listener += self.handler
+        for i in range(10):
+            self.listener.notify(None, i)
+
+        self.assertTrue(self.dispatcher.wait(timeout=5))
+        self.assertEqual(self.dispatcher.pending, 0)
+        self.assertEqual(self.calls, list(range(10)))
+        self.assertEqual(len(self.dispatcher.Errors), 20)
+        listener, subscriber, exception = self.dispatcher.Errors[1]
+        self.assertEqual(subscriber, self.onerror)
+        self.assertIsInstance(exception, RuntimeError)
+
+
+    def test_base_exception_does_not_stop_the_worker(self):
+        def exiting(sender, args):
+            raise SystemExit(args)
+        self.listener += exiting
+        self.listener += self.handler
+        for i in range(3):
+            self.listener.notify(None, i)
+
+        self.assertTrue(self.dispatcher.wait(timeout=5))
+        self.assertEqual(self.calls, [0, 1, 2])
+        self.assertEqual([type(e) for _, _, e in self.dispatcher.Errors], [SystemExit] * 3)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from lib.Color import Color, Style
+from lib.FrameBuffer import FrameBuffer, NumpyFrameBuffer, numpy
+
+
+
+@unittest.skipIf(numpy is None, "NumpyFrameBuffer requires NumPy")
+class BackendEquivalenceTests(unittest.TestCase):
+    """
+    Applies the same operations to a FrameBuffer and a NumpyFrameBuffer, and compares their cells and styles.
+    """
+
+    def setUp(self):
+        self.buffers = (FrameBuffer(17, 9), NumpyFrameBuffer(17, 9))
+        self.styles = [0,
+                       Style(Color(200, 30, 30)).Id,
+                       Style(Color(10, 10, 10), Color(0, 0, 255), bold=True).Id,
+                       Style(background=Color(0, 255, 0, 0.5)).Id]
+
+
+    def assertEquivalent(self):
+        python, vectorized = self.buffers
+        self.assertEqual(python.lines(), vectorized.lines())
+        self.assertEqual([list(row) for row in python.stylerows()], vectorized.stylerows())
+        self.assertEqual(python.tostyledstring(), vectorized.tostyledstring())
+
+
+    def test_blit_keeps_the_cells_past_each_line(self):
+        for buffer in self.buffers:
+            buffer.fillrect(0, 0, 17, 9, "#")
+            buffer.blit(["abc", "", "a\0b", "longer than the buffer is wide"], 3, 2, style=self.styles[1])
+        self.assertEquivalent()
+        self.assertEqual(self.buffers[1].row(4, 3, 3), "a\0b")
+
+
+    def test_clipped_blits(self):
+        for buffer in self.buffers:
+            buffer.blit(["0123456789"] * 4, -3, -1, style=self.styles[2], clip=(1, 1, 6, 5))
+            buffer.blit(["xyz"] * 3, 15, 7)
+        self.assertEquivalent()
+
+
+    def test_transparent_and_translucent_blits(self):
+        for buffer in self.buffers:
+            buffer.fillrect(2, 2, 10, 4, ".", self.styles[2])
+            buffer.blit(["a b c", " d e "], 1, 3, style=self.styles[3], transparent=True)
+            buffer.blit(["tr", "an"], 6, 4, style=self.styles[3])
+        self.assertEquivalent()
+
+
+    def test_random_operations(self):
+        rng = random.Random(7)
+        alphabet = " ab\0é█"
+        for i in range(200):
+            x, y = rng.randint(-4, 18), rng.randint(-3, 10)
+            style = rng.choice(self.styles)
+            if rng.random() < 0.25:
+                width, height, fill = rng.randint(0, 8), rng.randint(0, 5), rng.choice(alphabet)
+                for buffer in self.buffers:
+                    buffer.fillrect(x, y, width, height, fill, style)
+                continue
+            lines = ["".join(rng.choice(alphabet) for j in range(rng.randint(0, 9))) for k in range(rng.randint(1, 5))]
+            clip = rng.choice((None, (rng.randint(0, 8), rng.randint(0, 4), rng.randint(1, 12), rng.randint(1, 8))))
+            transparent = rng.random() < 0.3
+            for buffer in self.buffers:
+                buffer.blit(lines, x, y, style=style, clip=clip, transparent=transparent)
+        self.assertEquivalent()
+
+
+    def test_resize_and_clear(self):
+        for buffer in self.buffers:
+            buffer.blit(["abc"], 0, 0, style=self.styles[1])
+            buffer.resize(5, 3)
+            buffer.blit(["de"], 4, 2)
+        self.assertEquivalent()
+        for buffer in self.buffers:
+            buffer.clear()
+        self.assertEquivalent()
+
+
+
+if __name__ == "__main__":
+    unittest.main()
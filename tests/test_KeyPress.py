@@ -0,0 +1,72 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+from lib.EventSystem.KeyPress import KeyPressEventHandler
+
+
+
+@unittest.skipIf(os.name == 'nt', "pastes are only read on POSIX shells")
+class ReadKeyPasteTests(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = KeyPressEventHandler()
+        self.handler.BracketedPaste = True
+        # A paste, as returned by the POSIX key reader
+        self.handler._getch = lambda: (None, b"ab\r")
+        self.keys = []
+        self.pastes = []
+        self.handler.Listener += lambda sender, args: self.keys.append(args.Key)
+
+
+    def test_readkey_notifies_pastes_to_paste_listener(self):
+        self.handler.PasteListener += lambda sender, args: self.pastes.append(args.Text)
+        for decode in (False, True):
+            self.handler.readkey(decode)
+        self.assertEqual(self.pastes, ["ab\n", "ab\n"])
+        self.assertEqual(self.keys, [])
+
+
+    def test_readkey_notifies_pastes_as_keys_without_paste_subscribers(self):
+        self.handler.readkey(decode=True)
+        self.assertEqual(self.keys, [b"a", b"b", b"\r"])
+
+
+    def test_readkeycodes_returns_pastes(self):
+        self.assertEqual(self.handler.readkeycodes(), (None, b"ab\r"))
+
+
+
+@unittest.skipIf(os.name == 'nt', "raw mode is only set on POSIX shells")
+class RawModeTests(unittest.TestCase):
+
+    def setUp(self):
+        import pty
+        self.master, self.slave = pty.openpty()
+        self.stdin = sys.stdin
+        sys.stdin = open(self.slave, closefd=False)
+        self.handler = KeyPressEventHandler()
+
+
+    def tearDown(self):
+        self.handler.close()
+        sys.stdin.close()
+        sys.stdin = self.stdin
+        os.close(self.master)
+        os.close(self.slave)
+
+
+    def test_reopening_registers_close_at_exit_once(self):
+        registered = []
+        with mock.patch("atexit.register", registered.append), mock.patch("atexit.unregister", registered.remove):
+            for i in range(3):
+                self.handler.open()
+                self.assertEqual(len(registered), 1)
+                self.handler.close()
+                self.assertEqual(registered, [])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import contextlib
+import io
+import unittest
+
+from lib.Color import Color, ColorDepths, Style
+from lib.FrameBuffer import FrameBufferBackends
+from lib.ShellGUI_Core import BorderTypes, Canvas, OutputModes
+from lib.ShellGUI_Forms import Label
+from tests.screen import VirtualScreen
+
+
+
+class OutputModeReplayTests(unittest.TestCase):
+    """
+    Draws a sequence of frames with the positioned output modes, and checks after every frame that the screen they
+    produced matches a Full render of the same canvas.
+    """
+
+    def setUp(self):
+        self.styles = [Style(Color(250, 20, 20)), Style(Color(20, 20, 20), Color(20, 200, 20), bold=True),
+                       Style(background=Color(0, 0, 255, 0.5))]
+
+
+    def render(self, canvas, mode):
+        canvas.OutputMode = mode
+        sink = io.StringIO()
+        with contextlib.redirect_stdout(sink):
+            canvas.draw()
+        return sink.getvalue()
+
+
+    def steps(self, canvas):
+        labels = [Label((2, 1), "hello"), Label((5, 2), "world", showborder=True), Label((20, 4), "ab")]
+        for label in labels:
+            canvas.add(label)
+        yield
+        labels[0].Text = "hi"
+        yield
+        labels[1].style = self.styles[1]
+        labels[2].Text = "abcdef"
+        yield
+        labels[0].location = (10, 6)
+        labels[2].style = self.styles[0]
+        yield
+        overlay = Label((4, 2), "see through")
+        overlay.style = self.styles[2]
+        overlay.transparent = True
+        canvas.add(overlay)
+        yield
+        canvas.sendtoback(canvas.zpos(overlay))
+        yield
+        canvas.remove(canvas.zpos(labels[1]))
+        yield
+        yield
+
+
+    def replay(self, mode, backend):
+        canvas = Canvas(30, 10, BorderTypes.ThinBorder, mode, backend)
+        canvas.ColorDepth = ColorDepths.TrueColor
+        screen = VirtualScreen(30, 10)
+        for frame, step in enumerate(self.steps(canvas)):
+            screen.write(self.render(canvas, mode))
+            full = VirtualScreen(30, 10)
+            full.write(self.render(canvas, OutputModes.Full))
+            self.assertEqual(screen.Cells, full.Cells, "%s output differs from Full at frame %d" % (mode, frame))
+
+
+    def test_diff_matches_full(self):
+        for backend in (FrameBufferBackends.Python, FrameBufferBackends.NumPy):
+            self.replay(OutputModes.Diff, backend)
+
+
+    def test_incremental_matches_full(self):
+        for backend in (FrameBufferBackends.Python, FrameBufferBackends.NumPy):
+            self.replay(OutputModes.Incremental, backend)
+
+
+
+class BytesEmittedTests(unittest.TestCase):
+
+    def test_bytes_emitted_counts_every_byte_written(self):
+        for mode in (OutputModes.Full, OutputModes.Diff, OutputModes.Incremental):
+            canvas = Canvas(12, 4, BorderTypes.ThinBorder, mode)
+            canvas.add(Label((1, 1), "é█ text"))
+            for color in ('default', 'red'):
+                sink = io.StringIO()
+                with contextlib.redirect_stdout(sink):
+                    canvas.draw(color=color)
+                self.assertEqual(canvas.Stats.BytesEmitted, len(sink.getvalue().encode('utf-8')), (mode, color))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
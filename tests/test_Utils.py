@@ -0,0 +1,61 @@
+import contextlib
+import io
+import unittest
+
+from lib.Utils import FrameDiffWriter
+from tests.screen import VirtualScreen
+
+
+
+class FrameDiffWriterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.writer = FrameDiffWriter()
+        self.screen = VirtualScreen(20, 8)
+        # Shell content around the frames, which the writer must leave untouched
+        self.screen.write("".join(["\033[%d;1H" % (y + 1) + "." * 20 for y in range(0, 8)]))
+
+
+    def write(self, lines, origin):
+        sink = io.StringIO()
+        with contextlib.redirect_stdout(sink):
+            self.writer.write(lines, origin)
+        self.screen.write(sink.getvalue())
+        return sink.getvalue()
+
+
+    def rows(self):
+        return ["".join([cell[0] for cell in row]) for row in self.screen.Cells]
+
+
+    def test_moved_frame_blanks_only_the_previous_frame(self):
+        self.write(["abc", "defg"], (2, 2))
+        out = self.write(["xy", "zw", "uv"], (6, 4))
+        self.assertNotIn("\033[2J", out)
+        self.assertEqual(self.rows(), ["....................",
+                                       ".   ................",
+                                       ".    ...............",
+                                       ".....xy.............",
+                                       ".....zw.............",
+                                       ".....uv.............",
+                                       "....................",
+                                       "...................."])
+
+
+    def test_resized_frame_blanks_the_rows_it_no_longer_covers(self):
+        self.write(["abc", "def", "ghi"], (1, 1))
+        self.write(["jk"], (1, 1))
+        self.assertEqual(self.rows()[0:4], ["jk .................",
+                                            "   .................",
+                                            "   .................",
+                                            "...................."])
+
+
+    def test_unchanged_origin_and_size_writes_only_the_changes(self):
+        self.write(["abc", "def"], (3, 3))
+        self.assertEqual(self.write(["abc", "dXf"], (3, 3)), "\033[4;4HX")
+
+
+
+if __name__ == "__main__":
+    unittest.main()